@@ -1,10 +1,11 @@
-import requests
+import asyncio
 from bs4 import BeautifulSoup
 import csv
-import time
 import os
 from datetime import datetime
 
+from http_fetch import AsyncFetcher, DiskHTTPCache
+
 # Base URL
 BASE_URL = "https://fileinfo.com/filetypes/"
 
@@ -14,107 +15,136 @@ HEADERS = {
 }
 
 # File storage path
-SAVE_DIR = r"C:\Users\dvalladares\Repos\repo_ai\backend\raw"
-os.makedirs(SAVE_DIR, exist_ok=True)  # Ensure directory exists
+SAVE_DIR = os.environ.get("FILES_INFO_SAVE_DIR", r"C:\Users\dvalladares\Repos\repo_ai\backend\raw")
+
+# Politeness limits for fileinfo.com: ~1 request/second, at most 4 in flight
+RATE_LIMIT = 1.0
+CONCURRENCY = 4
+
+CATEGORIES = [
+    "common", "text", "audio", "video", "compressed", "spreadsheet", "ebook", "executable",
+    "raster_image", "camera_raw", "vector_image", "3d_image",
+    "page_layout", "developer", "database", "game", "web", "cad", "gis",
+    "plugin", "font", "system", "settings", "encoded", "disk_image",
+    "backup", "data", "misc"
+]
+ALPHABETS = ["1"] + [chr(i) for i in range(ord('a'), ord('z') + 1)]  # ['1', 'a', 'b', ..., 'z']
 
 # Generate filename timestamp
 timestamp = datetime.now().strftime("%m%d%y")
 
 
-def get_file_info_cat():
+def make_fetcher(cache_dir=None, **options):
     """
-    Scrapes file extensions and descriptions from FileInfo.com by category,
-    including popularity score, and saves them to a timestamped CSV file.
+    Returns an `AsyncFetcher` with the fileinfo.com headers and limits and an on-disk
+    HTTP cache (`http_fetch.DEFAULT_CACHE_DIR` unless `cache_dir` is given).
     """
-    categories = [
-        "common", "text", "audio", "video", "compressed", "spreadsheet", "ebook", "executable",
-        "raster_image", "camera_raw", "vector_image", "3d_image",
-        "page_layout", "developer", "database", "game", "web", "cad", "gis",
-        "plugin", "font", "system", "settings", "encoded", "disk_image",
-        "backup", "data", "misc"
-    ]
-
-    csv_filename = os.path.join(SAVE_DIR, f"files_info_{timestamp}_category.csv")
+    options.setdefault("rate", RATE_LIMIT)
+    options.setdefault("concurrency", CONCURRENCY)
+    cache = DiskHTTPCache(cache_dir) if cache_dir else DiskHTTPCache()
+    return AsyncFetcher(cache=cache, headers=HEADERS, **options)
+
+
+def parse_file_rows(html, label):
+    """
+    Returns `[extension, description, label, popularity]` for every table row of a
+    fileinfo.com listing page (popularity is "N/A" when the page has none).
+    """
+    soup = BeautifulSoup(html, "html.parser")
     file_formats = []
 
-    for category in categories:
-        url = f"{BASE_URL}{category}"
-        print(f"Scraping: {url}")
+    for row in soup.find_all("tr"):
+        cols = row.find_all("td")
+        if len(cols) > 2:
+            file_extension = cols[0].get_text(strip=True)
+            file_description = cols[1].get_text(strip=True)
+            popularity = cols[2].find("span", class_="hidden")
 
-        response = requests.get(url, headers=HEADERS)
-        if response.status_code != 200:
-            print(f"Failed to fetch {url}")
-            continue
+            popularity_score = popularity.get_text(strip=True) if popularity else "N/A"
 
-        soup = BeautifulSoup(response.text, "html.parser")
+            file_formats.append([file_extension, file_description, label, popularity_score])
 
-        for row in soup.find_all("tr"):
-            cols = row.find_all("td")
-            if len(cols) > 2:
-                file_extension = cols[0].get_text(strip=True)
-                file_description = cols[1].get_text(strip=True)
-                popularity = cols[2].find("span", class_="hidden")
+    return file_formats
 
-                popularity_score = popularity.get_text(strip=True) if popularity else "N/A"
 
-                file_formats.append([file_extension, file_description, category, popularity_score])
+async def scrape_pages(pages, base_url=BASE_URL, fetcher=None):
+    """
+    Fetches `{base_url}{page}` for every `(page, label)` pair concurrently and returns the
+    parsed rows in the order of `pages`. Failed pages are reported and skipped; as every
+    fetched page is cached, re-running resumes without downloading them again.
+    """
+    if fetcher is None:
+        async with make_fetcher() as fetcher:
+            return await scrape_pages(pages, base_url, fetcher)
+
+    urls = [f"{base_url}{page}" for page, _ in pages]
+    results = await fetcher.fetch_all(urls)
+
+    file_formats = []
+    for (_, label), result in zip(pages, results):
+        if not result.ok:
+            print(f"Failed to fetch {result.url} ({result.error})")
+            continue
+        print(f"Scraped: {result.url} ({result.source})")
+        file_formats.extend(parse_file_rows(result.text, label))
 
-        time.sleep(2)  # Prevent rate limiting
+    return file_formats
 
-    # Save results
+
+def save_file_formats(file_formats, csv_filename, label_column):
+    os.makedirs(os.path.dirname(csv_filename) or ".", exist_ok=True)  # Ensure directory exists
     with open(csv_filename, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerow(["Extension", "Description", "Category", "Popularity"])
+        writer.writerow(["Extension", "Description", label_column, "Popularity"])
         writer.writerows(file_formats)
 
-    print(f"File format dictionary (category-based) saved as {csv_filename}")
 
+async def scrape_file_info_cat(base_url=BASE_URL, save_dir=None, fetcher=None):
+    csv_filename = os.path.join(save_dir or SAVE_DIR, f"files_info_{timestamp}_category.csv")
+    file_formats = await scrape_pages([(category, category) for category in CATEGORIES], base_url, fetcher)
+    save_file_formats(file_formats, csv_filename, "Category")
 
-def get_files_info_alph():
-    """
-    Scrapes file extensions and descriptions from FileInfo.com by alphabet
-    (A-Z, plus '1' for numerical file extensions), including popularity score,
-    and saves to a CSV.
-    """
-    alphabets = ["1"] + [chr(i) for i in range(ord('a'), ord('z') + 1)]  # ['1', 'a', 'b', ..., 'z']
-
-    csv_filename = os.path.join(SAVE_DIR, f"files_info_{timestamp}_alphabet.csv")
-    file_formats = []
+    print(f"File format dictionary (category-based) saved as {csv_filename}")
+    return csv_filename
 
-    for letter in alphabets:
-        url = f"{BASE_URL}{letter}"
-        print(f"Scraping: {url}")
 
-        response = requests.get(url, headers=HEADERS)
-        if response.status_code != 200:
-            print(f"Failed to fetch {url}")
-            continue
+async def scrape_files_info_alph(base_url=BASE_URL, save_dir=None, fetcher=None):
+    csv_filename = os.path.join(save_dir or SAVE_DIR, f"files_info_{timestamp}_alphabet.csv")
+    file_formats = await scrape_pages([(letter, letter.upper()) for letter in ALPHABETS], base_url, fetcher)
+    save_file_formats(file_formats, csv_filename, "Alphabet")
 
-        soup = BeautifulSoup(response.text, "html.parser")
+    print(f"File format dictionary (alphabet-based) saved as {csv_filename}")
+    return csv_filename
 
-        for row in soup.find_all("tr"):
-            cols = row.find_all("td")
-            if len(cols) > 2:
-                file_extension = cols[0].get_text(strip=True)
-                file_description = cols[1].get_text(strip=True)
-                popularity = cols[2].find("span", class_="hidden")
 
-                popularity_score = popularity.get_text(strip=True) if popularity else "N/A"
+async def scrape_all(base_url=BASE_URL, save_dir=None, fetcher=None):
+    """Runs both scrapes over one fetcher, so they share its connection pool and rate limit."""
+    if fetcher is None:
+        async with make_fetcher() as fetcher:
+            return await scrape_all(base_url, save_dir, fetcher)
+    return await asyncio.gather(
+        scrape_file_info_cat(base_url, save_dir, fetcher),
+        scrape_files_info_alph(base_url, save_dir, fetcher),
+    )
 
-                file_formats.append([file_extension, file_description, letter.upper(), popularity_score])
 
-        time.sleep(2)  # Prevent rate limiting
+def get_file_info_cat(base_url=BASE_URL, save_dir=None):
+    """
+    Scrapes file extensions and descriptions from FileInfo.com by category,
+    including popularity score, and saves them to a timestamped CSV file.
+    """
+    return asyncio.run(scrape_file_info_cat(base_url, save_dir))
 
-    # Save results
-    with open(csv_filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Extension", "Description", "Alphabet", "Popularity"])
-        writer.writerows(file_formats)
 
-    print(f"File format dictionary (alphabet-based) saved as {csv_filename}")
+def get_files_info_alph(base_url=BASE_URL, save_dir=None):
+    """
+    Scrapes file extensions and descriptions from FileInfo.com by alphabet
+    (A-Z, plus '1' for numerical file extensions), including popularity score,
+    and saves to a CSV.
+    """
+    return asyncio.run(scrape_files_info_alph(base_url, save_dir))
 
 
 # Example usage
 if __name__ == "__main__":
-    get_file_info_cat()   # Scrape file types by category
-    get_files_info_alph() # Scrape file types by alphabet
+    asyncio.run(scrape_all())  # Scrape file types by category and by alphabet
@@ -1,129 +1,205 @@
-import requests
+import asyncio
 import json
 import csv
 import logging
 from datetime import datetime
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer, Tag
 import csv
-import unicodedata
-import re
 import os 
 
+from format_cleaning import VALID_EXTENSION_REGEX, FormatCleaner  # noqa: F401  (re-exported)
+from http_fetch import AsyncFetcher, DiskHTTPCache
 
-# Setup logging
+try:
+    import lxml  # noqa: F401  Optional: a much faster tree builder for BeautifulSoup
+    DEFAULT_PARSER = "lxml"
+except ImportError:
+    DEFAULT_PARSER = "html.parser"
+
+
+# Setup logging (the log file is attached when the script runs, see `__main__`)
 current_date = datetime.now().strftime('%m%d%y')
 log_filename = f"C:\\Users\\dvalladares\\Repos\\repo_ai\\backend\\raw\\file_format_parser_wikipedia_{current_date}.log"
-logging.basicConfig(filename=log_filename, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger()
 
+WIKI_URL = "https://en.wikipedia.org/wiki/List_of_file_formats"
+
+
+def _is_content_class(value):
+    # The strainer sees the raw attribute ("mw-content-ltr mw-parser-output"), not the split classes
+    classes = value.split() if isinstance(value, str) else value or ()
+    return 'mw-parser-output' in classes
+
+
+# Only the main content div is turned into a tree; the page chrome around it is skipped
+CONTENT_STRAINER = SoupStrainer('div', {'class': _is_content_class})
+
+# String types `get_text()` reads: comments, scripts and styles are skipped
+TEXT_TYPES = (NavigableString, CData)
 
 
-# Regex pattern: Initial period, all uppercase, 2-15 characters, no spaces
-VALID_EXTENSION_REGEX = r"^\.[A-Z]{2,15}$"
+async def _fetch(url, cache_dir, max_age):
+    cache = DiskHTTPCache(cache_dir) if cache_dir else DiskHTTPCache()
+    async with AsyncFetcher(cache=cache, max_age=max_age) as fetcher:
+        return await fetcher.fetch(url)
 
 
-def fetch_and_prettify_soup():
+def fetch_wiki_html(url=WIKI_URL, cache_dir=None, max_age=0):
     """
-    Fetch the Wikipedia page and return a prettified BeautifulSoup object
+    Fetch the Wikipedia page through the on-disk HTTP cache and return its HTML (None on failure).
+    With the default `max_age=0` every run revalidates the cached copy with
+    If-None-Match / If-Modified-Since, so an unchanged page is not downloaded again.
+    """
+    result = asyncio.run(_fetch(url, cache_dir, max_age))
+    if not result.ok:
+        logger.error(f"Failed to fetch Wikipedia page: {result.error}")
+        return None
+    logger.info(f"Fetched Wikipedia page ({result.source})")
+    return result.text
+
+
+def parse_content(html, parser=None):
+    """
+    Parse the main content div of a Wikipedia page, once, with `parser`
+    ("lxml" when installed, otherwise "html.parser"). Returns None if the div is missing.
+    """
+    soup = BeautifulSoup(html, parser or DEFAULT_PARSER, parse_only=CONTENT_STRAINER)
+    content = soup.find('div', {'class': 'mw-parser-output'})
+    if not content:
+        logger.error("Could not find main content div")
+    return content
+
+
+def fetch_content_soup(url=WIKI_URL, parser=None, cache_dir=None):
+    """
+    Fetch the Wikipedia page and return its parsed main content div
     """
     try:
-        url = "https://en.wikipedia.org/wiki/List_of_file_formats"
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Create BeautifulSoup object
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find the main content div
-        content = soup.find('div', {'class': 'mw-parser-output'})
-        if not content:
-            logger.error("Could not find main content div")
+        html = fetch_wiki_html(url, cache_dir)
+        if html is None:
             return None
-            
-        # Prettify the content
-        pretty_html = content.prettify()
-        
-        # Create new soup from prettified HTML
-        pretty_soup = BeautifulSoup(pretty_html, 'html.parser')
-        
-        logger.info("Successfully fetched and prettified Wikipedia content")
-        return pretty_soup
-        
-    except requests.RequestException as e:
-        logger.error(f"Failed to fetch Wikipedia page: {e}")
-        return None
+
+        content = parse_content(html, parser)
+        if content:
+            logger.info("Successfully fetched and parsed Wikipedia content")
+        return content
+
     except Exception as e:
         logger.error(f"Error processing HTML content: {e}")
         return None
 
+
+def _heading_text(element):
+    # Try first with span
+    heading_span = element.find('span', {'class': 'mw-headline'})
+    if heading_span:
+        return heading_span.get_text(strip=True)
+    # If no span, get text directly from heading
+    return element.get_text(strip=True)
+
+
+def _list_item_entries(category, full_text, notes):
+    """Entries for one list item: one per comma-separated extension before the dash."""
+    logger.debug(f"Processing item under {category}: {full_text[:50]}...")
+
+    # Extract extension and description
+    parts = full_text.split(' – ', 1)  # Try en dash first
+    if len(parts) < 2:
+        parts = full_text.split(' - ', 1)  # Try regular hyphen
+
+    if len(parts) >= 2:
+        extensions = parts[0].strip()
+        description = parts[1].strip()
+    else:
+        extensions = parts[0].strip()
+        description = ""
+
+    # Split multiple extensions (comma-separated)
+    extension_list = [ext.strip() for ext in extensions.split(',')]
+
+    # Add each extension as a separate entry
+    entries = []
+    for ext in extension_list:
+        ext = ext.strip('.').strip()
+        if ext:
+            entry = {
+                'category': category,
+                'extension': ext,
+                'description': description,
+                'notes': '; '.join(notes) if notes else ''
+            }
+            entries.append(entry)
+            logger.debug(f"Added entry: {entry}")
+    return entries
+
+
 def parse_file_formats(soup):
     """
     Parse file formats from Wikipedia page content.
     Handles both cases where headings have spans and where they don't.
+
+    Headings and lists are read in one pass over the tree: the text and link notes of
+    every open list item are collected as its strings stream by, instead of re-walking
+    each item. Entries are returned list by list, in the order the lists start.
     """
-    file_formats = []
+    lists = []  # Entries of each categorized <ul>
     current_category = ""
-    
-    # Find all headings and lists in the content
-    content = soup.find_all(['h2', 'h3', 'ul'])
-    
-    for element in content:
-        if element.name in ['h2', 'h3']:
-            # Try first with span
-            heading_span = element.find('span', {'class': 'mw-headline'})
-            if heading_span:
-                current_category = heading_span.get_text(strip=True)
+    open_texts = []  # Stripped strings of every open list item (nested items feed their parents too)
+    open_notes = []
+
+    def walk(tag, entries):
+        # `entries` collects the items of `tag` when it is a categorized <ul>
+        nonlocal current_category
+        for child in tag.contents:
+            if not isinstance(child, Tag):
+                if type(child) in TEXT_TYPES and open_texts:
+                    text = child.strip()
+                    if text:
+                        for texts in open_texts:
+                            texts.append(text)
+                continue
+
+            name = child.name
+            if name in ('h2', 'h3'):
+                current_category = _heading_text(child)
+                logger.info(f"Found category: {current_category}")
+                walk(child, None)
+
+            elif name == 'ul':
+                list_entries = None
+                if current_category:
+                    list_entries = []
+                    lists.append((current_category, list_entries))
+                walk(child, list_entries)
+
+            elif name == 'li' and entries is not None:
+                texts, notes = [], []
+                open_texts.append(texts)
+                open_notes.append(notes)
+                walk(child, None)
+                open_texts.pop()
+                open_notes.pop()
+                entries.append(("".join(texts), notes))
+
             else:
-                # If no span, get text directly from heading
-                current_category = element.get_text(strip=True)
-            
-            logger.info(f"Found category: {current_category}")
-                
-        elif element.name == 'ul' and current_category:
-            for li in element.find_all('li', recursive=False):
-                try:
-                    # Get the full text content
-                    full_text = li.get_text(strip=True)
-                    logger.debug(f"Processing item under {current_category}: {full_text[:50]}...")
-                    
-                    # Extract extension and description
-                    parts = full_text.split(' – ', 1)  # Try en dash first
-                    if len(parts) < 2:
-                        parts = full_text.split(' - ', 1)  # Try regular hyphen
-                    
-                    if len(parts) >= 2:
-                        extensions = parts[0].strip()
-                        description = parts[1].strip()
-                    else:
-                        extensions = parts[0].strip()
-                        description = ""
-                    
-                    # Split multiple extensions (comma-separated)
-                    extension_list = [ext.strip() for ext in extensions.split(',')]
-                    
-                    # Extract notes from links
-                    notes = []
-                    for a in li.find_all('a'):
-                        if a.get('href') and a.get('title'):
-                            notes.append(f"{a.get_text()} ({a['title']})")
-                    
-                    # Add each extension as a separate entry
-                    for ext in extension_list:
-                        ext = ext.strip('.').strip()
-                        if ext:
-                            entry = {
-                                'category': current_category,
-                                'extension': ext,
-                                'description': description,
-                                'notes': '; '.join(notes) if notes else ''
-                            }
-                            file_formats.append(entry)
-                            logger.debug(f"Added entry: {entry}")
-                            
-                except Exception as e:
-                    logger.error(f"Error processing list item: {e}")
-                    continue
-    
+                # Extract notes from links
+                if name == 'a' and open_notes and child.get('href') and child.get('title'):
+                    note = f"{child.get_text()} ({child['title']})"
+                    for notes in open_notes:
+                        notes.append(note)
+                walk(child, None)
+
+    walk(soup, None)
+
+    file_formats = []
+    for category, items in lists:
+        for full_text, notes in items:
+            try:
+                file_formats.extend(_list_item_entries(category, full_text, notes))
+            except Exception as e:
+                logger.error(f"Error processing list item: {e}")
+                continue
+
     return file_formats
 
 def save_file_formats(file_formats, output_file):
@@ -171,7 +247,10 @@ def clean_file_formats(file_formats):
     - Filtering extensions that don't match the regex pattern
     - Moving invalid extensions to a 'dirty_data' list
     - Trimming spaces from all columns
-    
+
+    The work is done by `format_cleaning.FormatCleaner`, in one pass that also runs the
+    data quality checks (logged as a summary).
+
     Args:
         file_formats (list of dict): List containing dictionaries with "extension" and "description".
         
@@ -180,73 +259,36 @@ def clean_file_formats(file_formats):
     """
     logger.info("Cleaning file formats data")
 
-    cleaned_file_formats = []
-    dirty_data = []
-
-    for entry in file_formats:
-        if "extension" in entry and isinstance(entry["extension"], str):
-            # Normalize encoding to avoid unexpected characters
-            normalized_extension = unicodedata.normalize("NFKD", entry["extension"]).strip()
-
-            # Replace en dash (U+2013) with a comma + space
-            normalized_extension = normalized_extension.replace("–", ", ")
-
-            # Split extension into parts if applicable (e.g., "ABC – Another Format" → "ABC" + description)
-            parts = normalized_extension.split(", ", 1)
-            normalized_extension = parts[0].strip()  # Keep first part as the extension
-
-            # Append second part to description if it exists
-            if len(parts) > 1:
-                entry["description"] = parts[1].strip() + " " + entry.get("description", "").strip()
-
-            # Trim all fields
-            entry["description"] = entry.get("description", "").strip()
-            entry["category"] = entry.get("category", "").strip()  # If category exists, trim it
-            entry["popularity"] = entry.get("popularity", "").strip()  # If popularity exists, trim it
-
-            # Convert to uppercase and prepend a period if missing
-            if not normalized_extension.startswith("."):
-                normalized_extension = "." + normalized_extension
-            normalized_extension = normalized_extension.upper()
-
-            # Remove if extension has spaces or doesn't match the regex
-            if " " in normalized_extension or not re.match(VALID_EXTENSION_REGEX, normalized_extension):
-                dirty_data.append(entry)  # Move invalid entries to dirty data list
-                continue
-
-            # Update the cleaned entry
-            entry["extension"] = normalized_extension
-            cleaned_file_formats.append(entry)
+    cleaner = FormatCleaner()
+    cleaned_file_formats, dirty_data, _ = cleaner.clean_all(file_formats)
+    cleaner.report.log()
 
     logger.info(f"Cleaning complete: {len(cleaned_file_formats)} valid entries, {len(dirty_data)} dirty entries")
 
     return cleaned_file_formats, dirty_data
 
-def main():
+def main(parser=None):
     """
     Main function to orchestrate the file format parsing process
     """
     try:
         logger.info("Starting file format parsing process")
         
-        # Fetch and prettify content
-        pretty_soup = fetch_and_prettify_soup()
-        if not pretty_soup:
-            logger.error("Failed to fetch and prettify content")
+        # Fetch and parse content
+        content = fetch_content_soup(parser=parser)
+        if not content:
+            logger.error("Failed to fetch and parse content")
             return
             
         # Debug: Print first few headings to verify structure
         logger.debug("First few headings found:")
-        for heading in pretty_soup.find_all(['h2', 'h3'])[:3]:
+        for heading in content.find_all(['h2', 'h3'])[:3]:
             logger.debug(heading.prettify())
         
         # Parse file formats
         logger.info("Beginning to parse file formats")
-        file_formats = parse_file_formats(pretty_soup)
+        file_formats = parse_file_formats(content)
 
-        # Clean file formats
-        clean_file_formats_data, dirty_data = clean_file_formats(file_formats)
-        
         # Check if we got any results
         if not file_formats:
             logger.warning("No file formats were parsed")
@@ -254,14 +296,16 @@ def main():
         
         # Generate output filename with timestamp
         output_file = f"C:\\Users\\dvalladares\\Repos\\repo_ai\\backend\\raw\\wikipedia_{current_date}.csv"
+        dirty_file = f"C:\\Users\\dvalladares\\Repos\\repo_ai\\backend\\raw\\wikipedia_{current_date}_dirty.csv"
+        issues_file = f"C:\\Users\\dvalladares\\Repos\\repo_ai\\backend\\raw\\wikipedia_{current_date}_issues.csv"
         processed_file = f"C:\\Users\\dvalladares\\Repos\\repo_ai\\backend\\processed\\wikipedia_{current_date}.csv"
         
-        # Save results to CSV
+        # Save raw results to CSV (before cleaning, which updates the entries in place)
         save_file_formats(file_formats, output_file)
-        save_file_formats(clean_file_formats_data, processed_file)
 
-        #dirty data 
-        save_file_formats(dirty_data, output_file)
+        # Clean file formats: clean data, dirty data and the issue report in one pass
+        report = FormatCleaner().clean_to_files(file_formats, processed_file, dirty_file, issues_file)
+        report.log()
         
         # Log summary statistics
         logger.info(f"Processing complete. Found {len(file_formats)} file formats")
@@ -288,6 +332,8 @@ def main():
 
 if __name__ == "__main__":
     try:
+        logging.basicConfig(filename=log_filename, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
         # Add debug logging for development
         logger.setLevel(logging.DEBUG)
         
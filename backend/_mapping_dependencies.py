@@ -1,51 +1,217 @@
+import os
+import logging
+from typing import Dict, Iterable, Optional
+from xml.sax.saxutils import escape
+
+import duckdb
 import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
-
-# Load language patterns CSV
-language_patterns = pd.read_csv("backend/raw/language_patterns.csv")
-
-# Ensure `file_defined` and `file_used` columns are filled correctly
-language_patterns = language_patterns.dropna(subset=["file_used", "reference_type"])  # Remove incomplete rows
-
-# Dictionary to track where modules/functions are defined
-definition_map = {}
-
-# First pass: Identify definitions
-for _, row in language_patterns.iterrows():
-    if row["reference_type"] == "Function Definition" and pd.notna(row["file_defined"]):
-        definition_map[row["module_name"]] = row["file_defined"]
-
-# Second pass: Map function calls & imports to their definitions
-edges = []
-for _, row in language_patterns.iterrows():
-    file_used = row["file_used"]
-    module_name = row["module_name"]
-    reference_type = row["reference_type"]
-
-    # If it's an import or function call, check if we know where it was defined
-    if reference_type in ["Import", "Function Call"] and module_name in definition_map:
-        file_defined = definition_map[module_name]
-        if file_defined != file_used:  # Avoid self-references
-            edges.append((file_defined, file_used, reference_type, module_name))
-
-# Create directed graph
-G = nx.DiGraph()
-
-# Add edges to the graph
-for file_defined, file_used, reference_type, module_name in edges:
-    G.add_edge(file_defined, file_used, label=f"{reference_type}: {module_name}")
-
-# Check if graph has nodes
-if len(G.nodes) == 0:
-    print("⚠️ No relationships found after enrichment! Check your CSV file.")
-
-# Plot the graph
-plt.figure(figsize=(10, 6))
-pos = nx.spring_layout(G, seed=42)  # Improved layout for better spacing
-nx.draw(G, pos, with_labels=True, node_size=3000, node_color="lightblue", font_size=8, edge_color="gray")
-edge_labels = {(u, v): d["label"] for u, v, d in G.edges(data=True)}
-nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=7)
-
-plt.title("Updated File Dependency Graph (Python Repository)")
-plt.show()
+import call_graph
+import graph_analytics
+import serializers
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+LANGUAGE_PATTERNS_CSV = "backend/raw/language_patterns.csv"
+DEPENDENCY_GRAPH_DIR = "backend/raw/dependency_graph"
+
+EXPORT_FORMATS = ("graphml", "parquet", "json")
+USAGE_TYPES = ("Import", "Function Call")
+EDGE_COLUMNS = ["file_defined", "file_used", "reference_type", "module_name"]
+DEFAULT_MAX_RENDER_EDGES = 300  # Drawing is only readable (and fast) for a small sample
+
+
+def load_language_patterns(patterns_csv: str = LANGUAGE_PATTERNS_CSV) -> pd.DataFrame:
+    """Loads the language patterns CSV written by `classify_python_repos.process_language_patterns`."""
+    return pd.read_csv(patterns_csv, usecols=["module_name", "file_defined", "file_used", "reference_type"], dtype=str)
+
+
+def build_dependency_edges(language_patterns: pd.DataFrame) -> pd.DataFrame:
+    """Maps imports and function calls to the files defining the referenced name.
+
+    Usages that already carry `file_defined` (calls resolved by `call_graph`) are kept as
+    they are; the others are linked by name with one merge between definitions and usages,
+    so a name defined in several files yields an edge to every definition site.
+    Self-references and duplicate edges are dropped.
+    Returns a DataFrame with `EDGE_COLUMNS` (edges point from `file_defined` to `file_used`).
+    """
+    # Definitions carry no `file_used`, so they are taken before filtering incomplete usage rows
+    definitions = language_patterns.loc[
+        (language_patterns["reference_type"] == "Function Definition")
+        & language_patterns["file_defined"].notna()
+        & language_patterns["module_name"].notna(),
+        ["module_name", "file_defined"],
+    ].drop_duplicates()
+
+    usages = language_patterns.dropna(subset=["file_used", "reference_type", "module_name"])
+    usages = usages.loc[usages["reference_type"].isin(USAGE_TYPES)]
+    resolved = usages.loc[usages["file_defined"].notna(), EDGE_COLUMNS]
+
+    edges = usages.loc[usages["file_defined"].isna(), ["module_name", "file_used", "reference_type"]].merge(definitions, on="module_name", how="inner")
+    edges = pd.concat([resolved, edges[EDGE_COLUMNS]], ignore_index=True)
+    edges = edges.loc[edges["file_defined"] != edges["file_used"]]  # Avoid self-references
+    return edges.drop_duplicates().reset_index(drop=True)
+
+
+def call_graph_edges(graph: call_graph.CallGraph, root: str = "") -> pd.DataFrame:
+    """File dependency edges (`EDGE_COLUMNS`) of the calls a `call_graph.CallGraph` resolved into the repository.
+
+    Graph paths are repository-relative; `root` is prepended to match absolute paths in language patterns.
+    """
+    calls = graph.file_edges()
+    calls = calls[calls["target_path"].notna() & (calls["target_path"] != calls["caller_path"])]
+    to_path = (lambda path: os.path.join(root, path)) if root else (lambda path: path)  # noqa: E731
+    return pd.DataFrame({
+        "file_defined": calls["target_path"].map(to_path).to_numpy(dtype=object),
+        "file_used": calls["caller_path"].map(to_path).to_numpy(dtype=object),
+        "reference_type": "Function Call",
+        "module_name": calls["target"].to_numpy(dtype=object),
+    }, columns=EDGE_COLUMNS).drop_duplicates().reset_index(drop=True)
+
+
+# ============================
+# 📌 Headless Exports
+# ============================
+def export_graphml(edges: pd.DataFrame, path: str):
+    """Writes the edges as a directed GraphML multigraph (files are nodes), streaming rows to disk."""
+    nodes = pd.unique(pd.concat([edges["file_defined"], edges["file_used"]], ignore_index=True))
+    node_ids = {node: f"n{index}" for index, node in enumerate(nodes)}
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+            '  <key id="path" for="node" attr.name="path" attr.type="string"/>\n'
+            '  <key id="reference_type" for="edge" attr.name="reference_type" attr.type="string"/>\n'
+            '  <key id="module_name" for="edge" attr.name="module_name" attr.type="string"/>\n'
+            '  <key id="label" for="edge" attr.name="label" attr.type="string"/>\n'
+            '  <graph id="dependencies" edgedefault="directed">\n'
+        )
+        f.writelines(f'    <node id="{node_ids[node]}"><data key="path">{escape(node)}</data></node>\n' for node in nodes)
+        f.writelines(
+            f'    <edge source="{node_ids[source]}" target="{node_ids[target]}">'
+            f'<data key="reference_type">{escape(reference_type)}</data>'
+            f'<data key="module_name">{escape(module_name)}</data>'
+            f'<data key="label">{escape(f"{reference_type}: {module_name}")}</data></edge>\n'
+            for source, target, reference_type, module_name in edges[EDGE_COLUMNS].itertuples(index=False, name=None)
+        )
+        f.write("  </graph>\n</graphml>\n")
+
+
+def export_edge_parquet(edges: pd.DataFrame, path: str):
+    """Writes the edge list to Parquet through DuckDB (no pyarrow needed)."""
+    conn = duckdb.connect()
+    try:
+        conn.register("edges", edges[EDGE_COLUMNS])
+        conn.execute(f"COPY edges TO '{path.replace(chr(39), chr(39) * 2)}' (FORMAT PARQUET)")
+    finally:
+        conn.close()
+
+
+def export_json(edges: pd.DataFrame, path: str):
+    """Writes the graph in node-link JSON (loadable with `networkx.node_link_graph`)."""
+    nodes = pd.unique(pd.concat([edges["file_defined"], edges["file_used"]], ignore_index=True))
+    graph = {
+        "directed": True,
+        "multigraph": True,
+        "graph": {"name": "dependencies"},
+        "nodes": [{"id": node} for node in nodes],
+        "links": [
+            {"source": source, "target": target, "reference_type": reference_type, "module_name": module_name}
+            for source, target, reference_type, module_name in edges[EDGE_COLUMNS].itertuples(index=False, name=None)
+        ],
+    }
+    serializers.save(graph, path, serializers.DEFAULT_JSON)
+
+
+EXPORTERS = {
+    "graphml": (export_graphml, "dependency_graph.graphml"),
+    "parquet": (export_edge_parquet, "dependency_edges.parquet"),
+    "json": (export_json, "dependency_graph.json"),
+}
+
+
+def render_sample(edges: pd.DataFrame, path: str, max_edges: int = DEFAULT_MAX_RENDER_EDGES, seed: int = 42):
+    """Draws at most `max_edges` randomly sampled edges to an image file, without a display."""
+    import matplotlib
+    matplotlib.use("Agg")  # Headless backend: render to file, never open a window
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
+    sample = edges.sample(n=min(max_edges, len(edges)), random_state=seed) if len(edges) > max_edges else edges
+    G = nx.DiGraph()
+    for file_defined, file_used, reference_type, module_name in sample[EDGE_COLUMNS].itertuples(index=False, name=None):
+        G.add_edge(file_defined, file_used, label=f"{reference_type}: {module_name}")
+
+    plt.figure(figsize=(10, 6))
+    pos = nx.spring_layout(G, seed=seed)
+    nx.draw(G, pos, with_labels=True, node_size=3000, node_color="lightblue", font_size=8, edge_color="gray")
+    edge_labels = {(u, v): d["label"] for u, v, d in G.edges(data=True)}
+    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=7)
+
+    title = "File Dependency Graph (Python Repository)"
+    if len(sample) < len(edges):
+        title += f" - sample of {len(sample)} / {len(edges)} edges"
+    plt.title(title)
+    plt.savefig(path, dpi=150, bbox_inches="tight")
+    plt.close()
+
+
+def map_dependencies(
+    patterns_csv: str = LANGUAGE_PATTERNS_CSV,
+    output_dir: str = DEPENDENCY_GRAPH_DIR,
+    formats: Iterable[str] = EXPORT_FORMATS,
+    render: bool = False,
+    max_render_edges: int = DEFAULT_MAX_RENDER_EDGES,
+    language_patterns: Optional[pd.DataFrame] = None,
+    graph: Optional[call_graph.CallGraph] = None,
+    graph_root: str = "",
+    analytics_repo: Optional[str] = None,
+) -> Dict[str, str]:
+    """Builds the file dependency graph from language patterns and exports it.
+
+    With a resolved `graph`, call edges come from it (paths joined to `graph_root`) and
+    only imports are linked by name. With `analytics_repo`, cycles, build layers and
+    fan-in/fan-out are computed by `graph_analytics` and stored under that name.
+    Returns `{format: output path}`; `render=True` adds a sampled `png` drawing
+    (requires networkx and matplotlib).
+    """
+    if language_patterns is None:
+        language_patterns = load_language_patterns(patterns_csv)
+
+    if graph is not None:
+        imports = language_patterns[language_patterns["reference_type"] != "Function Call"]
+        edges = pd.concat([build_dependency_edges(imports), call_graph_edges(graph, graph_root)], ignore_index=True).drop_duplicates()
+    else:
+        edges = build_dependency_edges(language_patterns)
+    if edges.empty:
+        logging.warning("⚠️ No relationships found after enrichment! Check your CSV file.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = {}
+    for export_format in formats:
+        if export_format not in EXPORTERS:
+            raise ValueError(f"Unsupported export format '{export_format}'. Use one of: {', '.join(EXPORTERS)}")
+        exporter, filename = EXPORTERS[export_format]
+        outputs[export_format] = os.path.join(output_dir, filename)
+        exporter(edges, outputs[export_format])
+
+    if analytics_repo is not None:
+        analytics_store = graph_analytics.AnalyticsStore()
+        try:
+            result = graph_analytics.analyze_and_store(analytics_repo, edges, analytics_store)
+        finally:
+            analytics_store.close()
+        outputs["analytics"] = analytics_store.path
+        logging.info(f"🔁 {len(result.cycles)} import cycles, {result.layer_count} build layers")
+
+    if render and not edges.empty:
+        outputs["png"] = os.path.join(output_dir, "dependency_graph_sample.png")
+        render_sample(edges, outputs["png"], max_render_edges)
+
+    logging.info(f"✅ Dependency graph with {len(edges)} edges exported to {output_dir}")
+    return outputs
+
+
+if __name__ == "__main__":
+    map_dependencies(render=True)
@@ -4,29 +4,48 @@ import csv
 import subprocess
 import logging
 import re
-import pandas as pd
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterator, Tuple
 from collections import defaultdict
+import ast_extractor
+import call_graph
+from extract_records import RecordBatch, RecordType, StringTable
+from extract_sink import DuckDBExtractSink
+from streaming_csv import StreamingCSVWriter
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+CSV_FIELDS = ["type", "module", "function", "file_defined", "file_used"]
+RECORD_FIELDS = CSV_FIELDS[1:]  # Fields of a `RecordBatch` after the enum-coded type
+CALL_RECORD_BATCH = 10_000  # Call records stored per write once calls are resolved
+
 
 class GitHubRepoParser:
-    """Clones and parses a GitHub repository or a local folder for Python function imports, definitions, calls, and class definitions."""
+    """Clones and parses a GitHub repository or a local folder for Python function imports, definitions, calls, and class definitions.
+
+    With `stream=True` (and no `sink`) records are written to the CSV as they are produced and
+    the file is atomically renamed into place at the end, instead of collecting `self.results`.
+    Only each file's definitions and imports are kept in memory until calls are resolved;
+    its calls are spilled to a temporary SQLite file (`call_graph.CallSpill`) as it is parsed.
+    """
 
-    def __init__(self, source: str, clone_dir: str = "cloned_repos"):
+    def __init__(self, source: str, clone_dir: str = "cloned_repos", sink: DuckDBExtractSink = None, stream: bool = False):
         self.source = source  
         self.clone_dir = Path(clone_dir)
         self.is_cloned_repo = source.startswith("http") and source.endswith(".git")  
         self.repo_name = source.rstrip("/").split("/")[-1].replace(".git", "") if self.is_cloned_repo else Path(source).name
         self.local_repo_path = self.clone_dir / self.repo_name if self.is_cloned_repo else Path(source).resolve()
-        self.results = []  
-        self.imported_modules = {}  # Store module imports
-        self.defined_functions = {}  # Store function definitions
-        self.defined_classes = {}  # Store class definitions
+        self.strings = StringTable()  # Interned paths, modules and names shared by every batch
+        self.results = RecordBatch(RECORD_FIELDS, self.strings)
+        self.sink = sink  # When set, records are appended to DuckDB instead of `self.results`
+        self.stream = stream
+        self.writer = None  # `StreamingCSVWriter` while a streaming run is parsing
+        self.record_count = 0
+        self.file_facts = {}  # Repository-relative path -> extracted facts, resolved once every file is parsed
+        self.call_spill = None  # `call_graph.CallSpill` holding the calls of `file_facts` while streaming
+        self.call_graph = None
 
     def clone_repo(self):
         """Clones a GitHub repository to a local directory if it's a remote repo."""
@@ -41,93 +60,65 @@ class GitHubRepoParser:
                 except subprocess.CalledProcessError:
                     logging.error(f"❌ Failed to clone repository: {self.source}")
 
-    def _extract_ast_data(self, tree: ast.AST, file_path: str) -> Tuple[List[Dict], List[Dict], List[Dict], List[Dict]]:
-        """Extracts imports, function definitions, function calls, and class definitions from the AST."""
-        
-        imports, function_defs, function_calls, class_defs, class_calls = [], [], [], [], []
-        
-        for node in ast.walk(tree):
-            # Detect Imports
-            if isinstance(node, ast.Import):
-                for name in node.names:
-                    imports.append({
-                        "type": "Import",
-                        "module": name.name,
-                        "function": "",
-                        "file_defined": "",
-                        "file_used": file_path
-                    })
-                    self.imported_modules[name.name] = name.name
-
-            elif isinstance(node, ast.ImportFrom):
-                module_name = node.module if node.module else ""
-                for name in node.names:
-                    imports.append({
-                        "type": "Import",
-                        "module": module_name,
-                        "function": name.name,
-                        "file_defined": "",
-                        "file_used": file_path
-                    })
-                    self.imported_modules[name.name] = module_name
-
-            # Detect Function Definitions
-            elif isinstance(node, ast.FunctionDef):
-                function_defs.append({
-                    "type": "Definition",
-                    "module": file_path,
-                    "function": node.name,
-                    "file_defined": file_path,
-                    "file_used": ""
-                })
-                self.defined_functions[node.name] = file_path
-
-            # Detect Class Definitions
-            elif isinstance(node, ast.ClassDef):
-                class_defs.append({
-                    "type": "Class Definition",
-                    "module": file_path,
-                    "function": node.name,
-                    "file_defined": file_path,
-                    "file_used": ""
-                })
-                self.defined_classes[node.name] = file_path
-
-            # Detect Function Calls
-            elif isinstance(node, ast.Call):
-                module_name = None
-                function_name = None
-
-                if isinstance(node.func, ast.Name):  # Calls like `sin()`, `custom_func()`
-                    function_name = node.func.id
-                    module_name = self.imported_modules.get(function_name, None)
-
-                elif isinstance(node.func, ast.Attribute):  # Calls like `math.cos()`
-                    if isinstance(node.func.value, ast.Name):
-                        module_name = self.imported_modules.get(node.func.value.id, node.func.value.id)
-                        function_name = node.func.attr
-
-                if function_name:
-                    function_calls.append({
-                        "type": "Call",
-                        "module": module_name,
-                        "function": function_name,
-                        "file_defined": "",
-                        "file_used": file_path
-                    })
-
-            # Detect Class Calls
-            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-                if node.func.id in self.defined_classes:  
-                    class_calls.append({
-                        "type": "Class Call",
-                        "module": self.defined_classes[node.func.id],
-                        "function": f"{node.func.id} (init)",
-                        "file_defined": self.defined_classes[node.func.id],
-                        "file_used": file_path
-                    })
-
-        return imports, function_defs, function_calls, class_defs, class_calls
+    def _extract_ast_data(self, tree: ast.AST, file_path: str, batch: RecordBatch) -> RecordBatch:
+        """Appends the imports, function definitions and class definitions of the AST to `batch`.
+
+        Calls need every file's scope to be resolved, so the facts are kept and the call
+        records are produced afterwards by `_resolve_calls()`.
+        """
+        facts = ast_extractor.extract(tree, file_path)
+        relative_path = Path(file_path).relative_to(self.local_repo_path).as_posix()
+        if self.call_spill is not None:
+            self.call_spill.add(relative_path, facts.calls)
+            facts.calls = []
+        self.file_facts[relative_path] = facts
+
+        # Detect Imports
+        for imp in facts.imports:
+            batch.append(RecordType.IMPORT, imp.module, imp.name, "", file_path)
+
+        # Detect Function Definitions
+        for func in facts.functions:
+            batch.append(RecordType.DEFINITION, file_path, func.name, file_path, "")
+
+        # Detect Class Definitions
+        for cls in facts.classes:
+            batch.append(RecordType.CLASS_DEFINITION, file_path, cls.name, file_path, "")
+
+        return batch
+
+    def _resolve_calls(self, batch_size: int = CALL_RECORD_BATCH) -> Iterator[RecordBatch]:
+        """Resolves every call of the repository to its qualified target and yields the call records in batches.
+
+        Calls to a repository function carry its file as `module` and `file_defined` (like
+        definitions do); external calls carry the target's module, e.g. `os.path` for
+        `os.path.join()`; unresolved calls have no module. Instantiations of repository
+        classes become "Class Call" records. Streaming runs do not keep `self.call_graph`.
+        """
+        if self.stream:
+            edges = call_graph.resolve_calls(self.file_facts, self.call_spill.calls_of if self.call_spill else None)
+        else:
+            self.call_graph = call_graph.CallGraph.build(self.file_facts)
+            edges = self.call_graph.edges
+        absolute = lambda path: str(self.local_repo_path / path)  # noqa: E731
+
+        batch = self._new_batch()
+        for edge in edges:
+            name = edge.call.rsplit(".", 1)[-1]
+            if edge.kind == call_graph.CLASS:
+                target_path = absolute(edge.target_path)
+                batch.append(RecordType.CLASS_CALL, target_path, f"{name} (init)", target_path, absolute(edge.caller_path))
+            elif edge.target_path is not None:
+                target_path = absolute(edge.target_path)
+                batch.append(RecordType.CALL, target_path, name, target_path, absolute(edge.caller_path))
+            else:
+                module = edge.target.rsplit(".", 1)[0] if edge.target and "." in edge.target else None
+                batch.append(RecordType.CALL, module, name, "", absolute(edge.caller_path))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = self._new_batch()
+        if len(batch):
+            yield batch
 
     def _parse_file(self, file_path: Path):
         """Parses a Python file and extracts relevant AST elements."""
@@ -138,29 +129,53 @@ class GitHubRepoParser:
             logging.error(f"❌ Error parsing {file_path}: {e}")
             return
         
-        imports, function_defs, function_calls, class_defs, class_calls = self._extract_ast_data(tree, str(file_path))
+        batch = self._extract_ast_data(tree, str(file_path), self._new_batch())
 
         # Store all results
-        self.results.extend(imports + function_defs + function_calls + class_defs + class_calls)
+        self._store_records(batch)
+
+    def _new_batch(self) -> RecordBatch:
+        """An empty batch; it shares `self.strings` only when records are collected in `self.results`,
+        so a streaming run does not keep every string it has written."""
+        if self.sink is None and not self.stream:
+            return RecordBatch(RECORD_FIELDS, self.strings)
+        return RecordBatch(RECORD_FIELDS)
+
+    def _store_records(self, batch: RecordBatch):
+        self.record_count += len(batch)
+        if self.sink is not None:
+            self.sink.append_batch(batch)
+        elif self.writer is not None:
+            self.writer.writerows(batch.rows())
+        else:
+            self.results.extend(batch)
+
+    def output_file(self) -> str:
+        """Dynamically named CSV path for this repository."""
+        timestamp = datetime.now().strftime("%m%d%y")
+        return f"backend/raw/github_{self.repo_name}_{timestamp}_repoai_extract.csv"
 
     def save_results_to_csv(self) -> str:
         """Saves parsed data to a dynamically named CSV file."""
-        timestamp = datetime.now().strftime("%m%d%y")
-        output_file = f"backend/raw/github_{self.repo_name}_{timestamp}_repoai_extract.csv"
+        output_file = self.output_file()
         output_path = Path(output_file)
 
         logging.info(f"💾 Saving results to {output_path}...")
 
         with open(output_path, "w", newline="", encoding="utf-8") as file:
-            writer = csv.DictWriter(file, fieldnames=["type", "module", "function", "file_defined", "file_used"])
-            writer.writeheader()
-            writer.writerows(self.results)
+            writer = csv.writer(file)
+            writer.writerow(CSV_FIELDS)
+            writer.writerows(self.results.rows())
 
         logging.info(f"✅ Data saved to {output_path}")
         return output_file
     
     def run(self) -> str:
-        """Executes the full pipeline: Clone (if needed), Parse, Save, and return CSV path."""
+        """Executes the full pipeline: Clone (if needed), Parse, Save, and return CSV path.
+
+        With a `sink`, records go straight to DuckDB and the sink's `run_id` is returned instead.
+        With `stream=True`, the CSV is written while parsing and only appears once complete.
+        """
         try:
             self.clone_repo()  
 
@@ -168,11 +183,34 @@ class GitHubRepoParser:
                 logging.error(f"❌ Repository path {self.local_repo_path} does not exist.")
                 return None
 
+            if self.stream and self.sink is None:
+                output_file = self.output_file()
+                logging.info(f"💾 Streaming results to {output_file}...")
+                self.writer = StreamingCSVWriter(output_file, CSV_FIELDS)
+            if self.stream:
+                self.call_spill = call_graph.CallSpill()
+
             logging.info("🔍 Scanning for Python files...")
             for file_path in self.local_repo_path.rglob("*.py"):  
                 logging.info(f"📄 Parsing: {file_path}")
                 self._parse_file(file_path)  
 
+            logging.info(f"🔗 Resolving calls across {len(self.file_facts)} files...")
+            for batch in self._resolve_calls():
+                self._store_records(batch)
+
+            if self.sink is not None:
+                self.sink.flush()
+                return self.sink.run_id
+
+            if self.writer is not None:
+                writer, self.writer = self.writer, None
+                if not self.record_count:
+                    writer.abort()
+                    logging.warning("⚠️ No results found. Skipping CSV save.")
+                    return None
+                return writer.commit()
+
             if not self.results:
                 logging.warning("⚠️ No results found. Skipping CSV save.")
                 return None
@@ -183,15 +221,22 @@ class GitHubRepoParser:
             logging.error(f"❌ Error during pipeline execution: {e}")
             return None
 
+        finally:
+            if self.writer is not None:  # Interrupted streaming run: drop the partial file
+                self.writer.abort()
+                self.writer = None
+            if self.call_spill is not None:
+                self.call_spill.close()
+                self.call_spill = None
+
 
 # Run pipeline
 if __name__ == "__main__":
-    parser = GitHubRepoParser("https://github.com/TheAlgorithms/Python.git")
-    parsed_csv = parser.run()
-
-    if parsed_csv:
-        df = pd.read_csv(parsed_csv)
-        df_patterns = df[df["type"].isin(["Call", "Definition", "Class Definition", "Class Call"])]
-        output_file = "backend/raw/language_patterns.csv"
-        df_patterns.to_csv(output_file, index=False)
-        logging.info(f"✅ Language patterns saved to {output_file}")
+    source = "https://github.com/TheAlgorithms/Python.git"
+    with DuckDBExtractSink(source.rstrip("/").split("/")[-1].replace(".git", ""), source) as sink:
+        parser = GitHubRepoParser(source, sink=sink)
+        run_id = parser.run()
+
+        if run_id and parser.record_count:
+            output_file = sink.export_language_patterns("backend/raw/language_patterns.csv")
+            logging.info(f"✅ Language patterns saved to {output_file}")
@@ -0,0 +1,160 @@
+import ast
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional
+
+
+# ============================
+# 📌 Shared Record Schema
+# ============================
+class Definition(NamedTuple):
+    """A function (sync or async) or class definition."""
+    name: str
+    scope: str  # Dotted path of the enclosing classes/functions, "" at module level
+    lineno: int
+
+
+class ImportRecord(NamedTuple):
+    """One imported name. `import a.b as c` -> module="a.b", name=None, alias="c"."""
+    module: str  # "" for `from . import x`
+    name: Optional[str]  # Imported name for `from ... import`, None for plain `import`
+    alias: Optional[str]
+    level: int  # Number of leading dots in a relative import
+    lineno: int
+
+
+class CallRecord(NamedTuple):
+    """A call through a bare name (`foo()`) or a dotted name (`os.path.join()`)."""
+    name: str  # Called name: "foo" / "join"
+    receiver: Optional[str]  # Dotted receiver: None / "os.path"
+    scope: str  # Dotted path of the calling function/class, "" at module level
+    lineno: int
+
+
+@dataclass
+class FileFacts:
+    """Everything extracted from one source file in a single traversal."""
+    path: str
+    functions: List[Definition] = field(default_factory=list)
+    classes: List[Definition] = field(default_factory=list)
+    imports: List[ImportRecord] = field(default_factory=list)
+    calls: List[CallRecord] = field(default_factory=list)
+
+    def to_record(self) -> Dict[str, list]:
+        """Returns the facts as plain tuples, cheap to pickle across processes and to store as JSON."""
+        return {
+            "functions": [tuple(func) for func in self.functions],
+            "classes": [tuple(cls) for cls in self.classes],
+            "imports": [tuple(imp) for imp in self.imports],
+            "calls": [tuple(call) for call in self.calls],
+        }
+
+    def class_instantiations(self, known_classes=()) -> List[CallRecord]:
+        """Returns the bare-name calls that construct a class defined in this file or in `known_classes`."""
+        class_names = {cls.name for cls in self.classes}.union(known_classes)
+        return [call for call in self.calls if call.receiver is None and call.name in class_names]
+
+
+# ============================
+# 📌 Extraction Engine
+# ============================
+# Nodes that can never contain a definition, import or call; skipped without dispatch
+_LEAF_TYPES = frozenset({
+    ast.Name, ast.Constant, ast.Load, ast.Store, ast.Del, ast.Pass, ast.Break, ast.Continue,
+    *ast.operator.__subclasses__(), *ast.unaryop.__subclasses__(),
+    *ast.boolop.__subclasses__(), *ast.cmpop.__subclasses__(),
+})
+
+
+def dotted_name(node: ast.AST) -> Optional[str]:
+    """Returns `a.b.c` for a Name/Attribute chain, or None for any other expression."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+class FactCollector:
+    """Single-pass collector that fills a `FileFacts` with definitions, imports and calls.
+
+    Nodes are visited breadth-first, in the order of `ast.walk`, so facts come out in the
+    order the per-purpose walkers it replaced produced them. Each queued node carries its
+    dotted scope, and a handler returns the scope of the node's children. Handlers are
+    looked up once per node type and cached on the class, so dispatch is a dict lookup.
+    """
+
+    _handlers = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._handlers = {}  # Subclasses may override handlers, so each class keeps its own cache
+
+    def __init__(self, path: str = ""):
+        self.facts = FileFacts(path)
+
+    def visit(self, tree: ast.AST):
+        handlers = self._handlers
+        queue = deque([(tree, "")])
+        while queue:
+            node, scope = queue.popleft()
+            node_type = type(node)
+            handler = handlers.get(node_type)
+            if handler is None:
+                handler = getattr(type(self), "visit_" + node_type.__name__, type(self).generic_visit)
+                handlers[node_type] = handler
+            child_scope = handler(self, node, scope)
+            for child in ast.iter_child_nodes(node):
+                if type(child) not in _LEAF_TYPES:
+                    queue.append((child, child_scope))
+
+    def generic_visit(self, node, scope: str) -> str:
+        return scope
+
+    def visit_FunctionDef(self, node, scope):
+        self.facts.functions.append(Definition(node.name, scope, node.lineno))
+        return f"{scope}.{node.name}" if scope else node.name
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node, scope):
+        self.facts.classes.append(Definition(node.name, scope, node.lineno))
+        return f"{scope}.{node.name}" if scope else node.name
+
+    def visit_Import(self, node, scope):
+        for alias in node.names:
+            self.facts.imports.append(ImportRecord(alias.name, None, alias.asname, 0, node.lineno))
+        return scope
+
+    def visit_ImportFrom(self, node, scope):
+        module_name = node.module or ""
+        for alias in node.names:
+            self.facts.imports.append(ImportRecord(module_name, alias.name, alias.asname, node.level, node.lineno))
+        return scope
+
+    def visit_Call(self, node, scope):
+        func = node.func
+        if isinstance(func, ast.Name):
+            self.facts.calls.append(CallRecord(func.id, None, scope, node.lineno))
+        elif isinstance(func, ast.Attribute):
+            receiver = dotted_name(func.value)
+            if receiver is not None:
+                self.facts.calls.append(CallRecord(func.attr, receiver, scope, node.lineno))
+        return scope
+
+
+def extract(tree: ast.AST, path: str = "") -> FileFacts:
+    """Collects the facts of an already-parsed module in one traversal."""
+    collector = FactCollector(path)
+    collector.visit(tree)
+    return collector.facts
+
+
+def extract_file(path: str) -> FileFacts:
+    """Reads, parses and extracts a Python file. Raises on unreadable or invalid source."""
+    with open(path, "r", encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename=str(path))
+    return extract(tree, str(path))
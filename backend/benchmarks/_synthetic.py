@@ -0,0 +1,89 @@
+import os
+import random
+
+# Template for a synthetic module; sized to look like an average library file
+MODULE_TEMPLATE = '''import os
+import json
+from collections import defaultdict
+from pkg_{i}.helpers import helper_{i}
+
+
+class Model{i}:
+    """Synthetic class {i}."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def compute_{i}(self, other):
+        total = helper_{i}(self.value) + other
+        return json.dumps({{"total": total}})
+
+
+def function_{i}(items):
+    buckets = defaultdict(list)
+    for item in items:
+        buckets[len(item)].append(os.path.basename(item))
+    return Model{i}(len(buckets)).compute_{i}(1)
+
+
+def other_function_{i}():
+    return function_{i}(["a", "bb", "ccc"])
+'''
+
+
+def make_synthetic_repo(root, n_files, files_per_dir=50, seed=42):
+    """Writes `n_files` small Python modules under `root`, spread across nested packages."""
+    rng = random.Random(seed)
+    for i in range(n_files):
+        package_dir = os.path.join(root, f"pkg_{i // files_per_dir}", f"sub_{rng.randint(0, 3)}")
+        os.makedirs(package_dir, exist_ok=True)
+        with open(os.path.join(package_dir, f"module_{i}.py"), "w", encoding="utf-8") as f:
+            f.write(MODULE_TEMPLATE.format(i=i))
+    return root
+
+
+# Building blocks of a page shaped like Wikipedia's "List of file formats"
+WIKI_CHROME_LINK = '<li class="mw-list-item"><a href="/wiki/Special:Page_{i}" title="Page {i}"><span>Navigation link {i}</span></a></li>'
+WIKI_ITEMS = [
+    '<li><a href="/wiki/{ext}_(file_format)" title="{ext} (file format)">{ext}</a> – {ext} file used by <a href="/wiki/App_{i}" title="App {i}">App {i}</a></li>',
+    '<li>{ext}, {ext}X, .{ext}Z – Plain description of format {i}</li>',
+    '<li>.{ext} - Hyphenated description {i}<sup class="reference"><a href="#cite_note-{i}">[{i}]</a></sup></li>',
+    '<li>{ext} – Container format {i}<ul><li>{ext}A – Variant A of {i}</li><li><a href="/wiki/{ext}B" title="{ext}B">{ext}B</a> – Variant B</li></ul></li>',
+    '<li><b>{ext}</b> <!-- editor note --> – Bold entry {i} <style>.x{{color:red}}</style>with a style block</li>',
+]
+
+
+def make_wiki_page(n_sections=40, subsections=4, items_per_list=12, chrome_links=600, seed=42):
+    """Returns the HTML of a Wikipedia-like "List of file formats" page: page chrome, then
+    a `mw-parser-output` div of headings (old `mw-headline` and new `mw-heading` markup)
+    with lists of extensions, nested lists, references and a navbox."""
+    rng = random.Random(seed)
+    chrome = "".join(WIKI_CHROME_LINK.format(i=i) for i in range(chrome_links))
+    parts = [
+        "<!DOCTYPE html><html><head><title>List of file formats - Wikipedia</title>",
+        "".join(f'<script>var config_{i} = {{"wgPage": {i}}};</script>' for i in range(50)),
+        f'</head><body><div id="mw-navigation"><ul>{chrome}</ul></div>',
+        '<div id="content"><div id="mw-content-text"><div class="mw-content-ltr mw-parser-output" lang="en">',
+        "<p>This is a list of computer file formats, categorized by domain.</p>",
+    ]
+    counter = 0
+    for s in range(n_sections):
+        if s % 2:
+            parts.append(f'<div class="mw-heading mw-heading2"><h2 id="Section_{s}">Section {s}</h2>'
+                         '<span class="mw-editsection">[<a href="#" title="Edit section">edit</a>]</span></div>')
+        else:
+            parts.append(f'<h2><span class="mw-headline" id="Section_{s}">Section {s}</span>'
+                         '<span class="mw-editsection">[<a href="#" title="Edit section">edit</a>]</span></h2>')
+        for sub in range(subsections):
+            parts.append(f'<div class="mw-heading mw-heading3"><h3 id="Sub_{s}_{sub}">Subsection {s}.{sub}</h3></div><ul>')
+            for _ in range(items_per_list):
+                ext = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(2, 5)))
+                parts.append(rng.choice(WIKI_ITEMS).format(ext=ext, i=counter))
+                counter += 1
+            parts.append("</ul>")
+    parts.append('<div class="mw-heading mw-heading2"><h2 id="References">References</h2></div><ol class="references">')
+    parts.extend(f'<li id="cite_note-{i}"><span class="reference-text">Reference {i}</span></li>' for i in range(counter // 4))
+    parts.append('</ol><table class="navbox"><tr><td><ul>')
+    parts.extend(f'<li><a href="/wiki/Format_{i}" title="Format {i}">Format {i}</a></li>' for i in range(200))
+    parts.append(f'</ul></td></tr></table></div></div></div><div id="footer"><ul>{chrome}</ul></div></body></html>')
+    return "".join(parts)
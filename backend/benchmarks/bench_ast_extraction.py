@@ -0,0 +1,128 @@
+"""Benchmark: the unified `ast_extractor` pass vs. the three legacy `ast.walk` extractors.
+
+The legacy walkers below are verbatim copies of the isinstance chains that used to live in
+`parser.parse_file`, `parse_python_repos._extract_ast_data` and
+`_parse_and_classify_python._extract_ast_data` (record building trimmed to the traversal).
+
+Usage (from the `backend/` directory):
+    python benchmarks/bench_ast_extraction.py --files 2000
+    python benchmarks/bench_ast_extraction.py --path /some/checkout
+"""
+import os
+import sys
+import ast
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import ast_extractor  # noqa: E402
+from _synthetic import make_synthetic_repo  # noqa: E402
+
+
+def legacy_parser_walk(tree):
+    functions, classes, imports = [], [], []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            functions.append(node.name)
+        elif isinstance(node, ast.ClassDef):
+            classes.append(node.name)
+        elif isinstance(node, ast.Import) or isinstance(node, ast.ImportFrom):
+            for name in node.names:
+                imports.append(name.name)
+    return functions, classes, imports
+
+
+def legacy_repo_parser_walk(tree):
+    imports, functions, calls = [], [], []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for name in node.names:
+                imports.append({"module": name.name, "alias": name.asname})
+        elif isinstance(node, ast.ImportFrom):
+            module_name = node.module if node.module else ""
+            for name in node.names:
+                imports.append({"module": module_name, "alias": name.name})
+        elif isinstance(node, ast.FunctionDef):
+            functions.append(node.name)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            calls.append(node.func.id)
+    return imports, functions, calls
+
+
+def legacy_classify_walk(tree):
+    imported_modules, records = {}, []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for name in node.names:
+                records.append(("Import", name.name))
+                imported_modules[name.name] = name.name
+        elif isinstance(node, ast.ImportFrom):
+            for name in node.names:
+                records.append(("Import", node.module or ""))
+                imported_modules[name.name] = node.module or ""
+        elif isinstance(node, ast.FunctionDef):
+            records.append(("Definition", node.name))
+        elif isinstance(node, ast.ClassDef):
+            records.append(("Class Definition", node.name))
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name):
+                records.append(("Call", node.func.id))
+            elif isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name):
+                records.append(("Call", node.func.attr))
+    return records
+
+
+def time_over(trees, func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for tree in trees:
+            func(tree)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def load_trees(root):
+    trees = []
+    for dirpath, _, files in os.walk(root):
+        for file_name in files:
+            if file_name.endswith(".py"):
+                try:
+                    with open(os.path.join(dirpath, file_name), "r", encoding="utf-8") as f:
+                        trees.append(ast.parse(f.read()))
+                except (SyntaxError, UnicodeDecodeError, ValueError):
+                    continue
+    return trees
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--files", type=int, default=2000, help="Number of synthetic Python files")
+    arg_parser.add_argument("--path", help="Benchmark a real checkout instead of a synthetic repo")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    if args.path:
+        trees = load_trees(args.path)
+    else:
+        with tempfile.TemporaryDirectory() as repo_path:
+            trees = load_trees(make_synthetic_repo(repo_path, args.files))
+    print(f"🌳 {len(trees)} parsed modules, best of {args.repeat}")
+
+    legacy = {
+        "parser.parse_file walk": legacy_parser_walk,
+        "parse_python_repos walk": legacy_repo_parser_walk,
+        "_parse_and_classify walk": legacy_classify_walk,
+    }
+    # Each caller ran one of these walkers per file, so extract is compared with each of them
+    legacy_times = {label: time_over(trees, func, args.repeat) for label, func in legacy.items()}
+    unified = time_over(trees, ast_extractor.extract, args.repeat)
+    for label, elapsed in legacy_times.items():
+        print(f"{label:<28} {elapsed:>8.3f}s")
+    print(f"{'ast_extractor.extract':<28} {unified:>8.3f}s  "
+          f"({min(legacy_times.values()) / unified:.2f}x-{max(legacy_times.values()) / unified:.2f}x faster than one walker)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Benchmark: vectorized `classify_python_repos` against the row-by-row version on a synthetic extract.
+
+Usage (from the `backend/` directory):
+    python benchmarks/bench_classify.py --rows 5000000 --legacy-rows 200000
+
+The legacy `iterrows()` version takes hours on millions of rows, so it runs on the
+first `--legacy-rows` rows only; the vectorized version runs on the same slice (and
+the outputs are compared byte for byte) and then on the full extract.
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import filecmp
+import tempfile
+import tracemalloc
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import classify_python_repos  # noqa: E402
+
+
+# ============================
+# 📌 Row-by-row baseline (the previous implementation)
+# ============================
+def legacy_classify_import_patterns(parsed_csv_path, output_file):
+    df = pd.read_csv(parsed_csv_path)
+    df_imports = df[df["Type"] == "Import"]
+    import_patterns = defaultdict(set)
+    for _, row in df_imports.iterrows():
+        module_name = row["Module"]
+        if not isinstance(module_name, str) or module_name.strip() == "":
+            continue
+        if re.match(r"^[a-zA-Z0-9_]+$", module_name):
+            pattern_type, regex_pattern = "Standard Import", r"^import (\w+)"
+        elif re.match(r"^[a-zA-Z0-9_]+\.[a-zA-Z0-9_]+$", module_name):
+            pattern_type, regex_pattern = "Selective Import", r"^from (\w+) import (\w+)"
+        elif re.match(r"^[a-zA-Z0-9_]+ as [a-zA-Z0-9_]+$", module_name):
+            pattern_type, regex_pattern = "Aliased Import", r"^import (\w+) as (\w+)"
+        else:
+            pattern_type, regex_pattern = "Unknown Pattern", "N/A"
+        import_patterns[(pattern_type, regex_pattern)].add(module_name)
+    import_rules_list = [
+        {"language": "Python", "pattern": pattern, "regex": regex, "reference_type": ref_type}
+        for (ref_type, regex), modules in import_patterns.items()
+        for pattern in modules
+    ]
+    pd.DataFrame(import_rules_list).to_csv(output_file, index=False)
+
+
+def legacy_process_language_patterns(parsed_csv_path, output_file):
+    df = pd.read_csv(parsed_csv_path)
+    language_patterns = []
+    for _, row in df.iterrows():
+        record_type = row["Type"]
+        module_name = row["Module"] if pd.notna(row["Module"]) else ""
+        file_path = row["File"]
+        reference_type = None
+        if record_type == "Import":
+            reference_type = "Import"
+        elif record_type == "Definition":
+            reference_type = "Function Definition"
+        elif record_type == "Call":
+            reference_type = "Function Call"
+        language_patterns.append([
+            "Python",
+            module_name,
+            file_path if reference_type == "Function Definition" else "",
+            file_path if reference_type in ["Function Call", "Import"] else "",
+            reference_type,
+        ])
+    pd.DataFrame(language_patterns, columns=[
+        "language", "module_name", "file_defined", "file_used", "reference_type"
+    ]).to_csv(output_file, index=False)
+
+
+# ============================
+# 📌 Synthetic extract
+# ============================
+def make_synthetic_extract(path, n_rows, seed=42):
+    """Writes a parsed-extract CSV (`Type, Module, Function, File`) with a realistic mix of modules."""
+    rng = np.random.default_rng(seed)
+    n_modules = max(1, n_rows // 50)
+    module_ids = rng.integers(0, n_modules, n_rows)
+    shapes = module_ids % 10
+    modules = np.where(shapes < 5, np.char.add("mod_", module_ids.astype(str)), "")
+    modules = np.where((shapes >= 5) & (shapes < 8), np.char.add(np.char.add("pkg_", module_ids.astype(str)), ".sub"), modules)
+    modules = np.where(shapes == 8, np.char.add("np as alias_", module_ids.astype(str)), modules)
+    modules = np.where(shapes == 9, np.char.add("a.b.c_", module_ids.astype(str)), modules)
+
+    types = rng.choice(np.array(["Import", "Definition", "Call", "Class Definition", "Class Call"]), n_rows, p=[0.3, 0.2, 0.4, 0.05, 0.05])
+    files = np.char.add(np.char.add("repo/pkg_", (module_ids % 997).astype(str)), "/module.py")
+    frame = pd.DataFrame({
+        "Type": types,
+        "Module": pd.Series(modules).mask(rng.random(n_rows) < 0.02),  # Some missing modules
+        "Function": np.char.add("func_", (module_ids % 5000).astype(str)),
+        "File": files,
+    })
+    frame.to_csv(path, index=False)
+    return path
+
+
+def measure(label, func, trace_memory=False):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    if not trace_memory:
+        print(f"{label:<46} {elapsed:>9.2f}s")
+        return
+
+    # Traced separately: tracemalloc slows allocation-heavy code down several times
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<46} {elapsed:>9.2f}s  peak {peak / 2**20:>8.1f} MiB")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=5_000_000, help="Rows in the synthetic extract")
+    arg_parser.add_argument("--legacy-rows", type=int, default=200_000, help="Rows the row-by-row baseline runs on")
+    arg_parser.add_argument("--chunk-rows", type=int, default=classify_python_repos.DEFAULT_CHUNK_ROWS)
+    arg_parser.add_argument("--trace-memory", action="store_true", help="Also report peak traced memory (runs each step twice)")
+    args = arg_parser.parse_args()
+    timed = lambda label, func: measure(label, func, args.trace_memory)  # noqa: E731
+
+    with tempfile.TemporaryDirectory() as workdir:
+        out = lambda name: os.path.join(workdir, name)  # noqa: E731
+        full_csv = make_synthetic_extract(out("extract.csv"), args.rows)
+        pd.read_csv(full_csv, nrows=args.legacy_rows).to_csv(out("extract_slice.csv"), index=False)
+        print(f"📦 Synthetic extract: {args.rows:,} rows ({os.path.getsize(full_csv) / 2**20:.0f} MiB)")
+
+        slice_label = f"{args.legacy_rows:,} rows"
+        timed(f"legacy import rules, {slice_label}", lambda: legacy_classify_import_patterns(out("extract_slice.csv"), out("rules_legacy.csv")))
+        timed(f"legacy language patterns, {slice_label}", lambda: legacy_process_language_patterns(out("extract_slice.csv"), out("patterns_legacy.csv")))
+        timed(f"vectorized import rules, {slice_label}", lambda: classify_python_repos.classify_import_patterns(out("extract_slice.csv"), out("rules_new.csv"), args.chunk_rows))
+        timed(f"vectorized language patterns, {slice_label}", lambda: classify_python_repos.process_language_patterns(out("extract_slice.csv"), out("patterns_new.csv"), args.chunk_rows))
+
+        assert filecmp.cmp(out("rules_legacy.csv"), out("rules_new.csv"), shallow=False), "Import rules differ"
+        assert filecmp.cmp(out("patterns_legacy.csv"), out("patterns_new.csv"), shallow=False), "Language patterns differ"
+        print("✅ Outputs are byte-identical")
+
+        full_label = f"{args.rows:,} rows"
+        timed(f"vectorized import rules, {full_label}", lambda: classify_python_repos.classify_import_patterns(full_csv, out("rules_full.csv"), args.chunk_rows))
+        timed(f"vectorized language patterns, {full_label}", lambda: classify_python_repos.process_language_patterns(full_csv, out("patterns_full.csv"), args.chunk_rows))
+
+
+if __name__ == "__main__":
+    main()
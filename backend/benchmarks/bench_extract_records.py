@@ -0,0 +1,124 @@
+"""Benchmark: memory of `_parse_and_classify_python` records as columnar batches vs five-key dicts.
+
+Usage (from the `backend/` directory):
+    python benchmarks/bench_extract_records.py --files 20000
+
+Parses a synthetic repository twice with `tracemalloc` running: once with the current
+`RecordBatch` storage and once with the previous dict-per-record storage (embedded
+below), then reports the memory held by the results and the peak, and checks that both
+produce the same CSV. Timings include tracemalloc's overhead.
+"""
+import os
+import sys
+import time
+import argparse
+import filecmp
+import logging
+import tempfile
+import tracemalloc
+import csv
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import ast_extractor  # noqa: E402
+import call_graph  # noqa: E402
+from _parse_and_classify_python import CSV_FIELDS, GitHubRepoParser  # noqa: E402
+from _synthetic import make_synthetic_repo  # noqa: E402
+
+
+# ============================
+# 📌 Dict-per-record baseline (the previous storage)
+# ============================
+class DictRecordParser(GitHubRepoParser):
+    def __init__(self, source):
+        super().__init__(source)
+        self.results = []
+
+    def _extract_ast_data(self, tree, file_path, batch=None):
+        facts = ast_extractor.extract(tree, file_path)
+        self.file_facts[Path(file_path).relative_to(self.local_repo_path).as_posix()] = facts
+        records = [{"type": "Import", "module": imp.module, "function": "" if imp.name is None else imp.name,
+                    "file_defined": "", "file_used": file_path} for imp in facts.imports]
+        records += [{"type": "Definition", "module": file_path, "function": func.name,
+                     "file_defined": file_path, "file_used": ""} for func in facts.functions]
+        records += [{"type": "Class Definition", "module": file_path, "function": cls.name,
+                     "file_defined": file_path, "file_used": ""} for cls in facts.classes]
+        return records
+
+    def _resolve_calls(self, batch_size=None):
+        self.call_graph = call_graph.CallGraph.build(self.file_facts)
+        absolute = lambda path: str(self.local_repo_path / path)  # noqa: E731
+        records = []
+        for edge in self.call_graph.edges:
+            name = edge.call.rsplit(".", 1)[-1]
+            if edge.kind == call_graph.CLASS:
+                records.append({"type": "Class Call", "module": absolute(edge.target_path), "function": f"{name} (init)",
+                                "file_defined": absolute(edge.target_path), "file_used": absolute(edge.caller_path)})
+            elif edge.target_path is not None:
+                records.append({"type": "Call", "module": absolute(edge.target_path), "function": name,
+                                "file_defined": absolute(edge.target_path), "file_used": absolute(edge.caller_path)})
+            else:
+                module = edge.target.rsplit(".", 1)[0] if edge.target and "." in edge.target else None
+                records.append({"type": "Call", "module": module, "function": name,
+                                "file_defined": "", "file_used": absolute(edge.caller_path)})
+        yield records
+
+    def _store_records(self, records):
+        self.record_count += len(records)
+        self.results.extend(records)
+
+    def write_csv(self, path):
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.results)
+
+
+def parse_traced(parser):
+    """Parses every file and resolves calls (the buffered part of `run()`) under tracemalloc."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for file_path in parser.local_repo_path.rglob("*.py"):
+        parser._parse_file(file_path)
+    for records in parser._resolve_calls():
+        parser._store_records(records)
+    elapsed = time.perf_counter() - start
+
+    # What the results themselves hold: drop the facts and call graph kept for resolution
+    parser.file_facts, parser.call_graph = {}, None
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, held - baseline, peak - baseline
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--files", type=int, default=20_000, help="Python files in the synthetic repository")
+    args = arg_parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        repo = os.path.join(workdir, "repo")
+        make_synthetic_repo(repo, args.files)
+
+        columnar, legacy = GitHubRepoParser(repo), DictRecordParser(repo)
+        results = {}
+        for label, parser in (("five-key dicts", legacy), ("RecordBatch", columnar)):
+            results[label] = parse_traced(parser)
+            elapsed, held, peak = results[label]
+            print(f"{label:<16} {parser.record_count:>10,} records  {elapsed:>6.2f}s  "
+                  f"held {held / 2**20:>8.1f} MiB  peak {peak / 2**20:>8.1f} MiB")
+
+        legacy.write_csv(os.path.join(workdir, "legacy.csv"))
+        with open(os.path.join(workdir, "columnar.csv"), "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_FIELDS)
+            writer.writerows(columnar.results.rows())
+        assert filecmp.cmp(os.path.join(workdir, "legacy.csv"), os.path.join(workdir, "columnar.csv"), shallow=False), "CSV differs"
+        print(f"✅ Same CSV; results hold {results['five-key dicts'][1] / results['RecordBatch'][1]:.1f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark: classifying a repository's files with `file_classifier.ExtensionIndex` vs a query per file.
+
+Usage (from the `backend/` directory):
+    python benchmarks/bench_file_classifier.py --files 200000 --formats 10000
+
+Builds a synthetic `prod.file_formats` table in a temporary DuckDB file and a list of
+relative file paths (including multi-part extensions like `.tar.gz`, dotfiles and files
+without an extension). Classifies them with the in-memory index loaded once, and a
+sample of them the way a per-file lookup would (one DuckDB query per file, tried from
+the longest suffix down); checks that both agree on the sample.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import logging
+import tempfile
+
+import duckdb
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import file_classifier  # noqa: E402
+
+COMMON = [(".PY", "Developer"), (".JS", "Web"), (".JSON", "Data"), (".MD", "Text"), (".GZ", "Compressed"),
+          (".TAR.GZ", "Compressed"), (".PNG", "Raster Image"), (".GITIGNORE", "Settings")]
+NAME_SHAPES = ["f{i}.py", "f{i}.min.js", "f{i}.json", "README{i}.md", "dist-{i}.tar.gz", "f{i}.gz", "icon{i}.png",
+               ".gitignore", "Makefile", "f{i}.unknown", "v1.{i}.tar.gz", "f{i}.{ext}"]
+
+
+def make_formats_db(path, n_formats, seed=42):
+    rng = random.Random(seed)
+    rows = [(extension, f"{extension} file", category, 5.0) for extension, category in COMMON]
+    rows += [(f".X{i}", f"Format {i}", f"Category {i % 30}", rng.random()) for i in range(n_formats)]
+    con = duckdb.connect(path)
+    con.execute("CREATE SCHEMA prod")
+    con.execute("CREATE TABLE prod.file_formats (extension TEXT PRIMARY KEY, description TEXT, category TEXT, popularity FLOAT)")
+    con.executemany("INSERT INTO prod.file_formats VALUES (?, ?, ?, ?)", rows)
+    con.close()
+
+
+def make_paths(n_files, n_formats, seed=42):
+    rng = random.Random(seed)
+    return [
+        f"src/pkg_{i % 400}/" + rng.choice(NAME_SHAPES).format(i=i, ext=f"x{rng.randrange(n_formats)}")
+        for i in range(n_files)
+    ]
+
+
+# ============================
+# 📌 Per-file query baseline
+# ============================
+def query_per_file(con, name):
+    parts = file_classifier._file_tail(name).split(".")
+    for start in range(len(parts)):
+        row = con.execute(
+            "SELECT category FROM prod.file_formats WHERE lower(extension) = ?", ["." + ".".join(parts[start:])]
+        ).fetchone()
+        if row:
+            return row[0]
+    return None
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--files", type=int, default=200_000, help="Files in the synthetic repository")
+    arg_parser.add_argument("--formats", type=int, default=10_000, help="Rows in the synthetic format table")
+    arg_parser.add_argument("--sample", type=int, default=2_000, help="Files classified with a query each")
+    args = arg_parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, "formats.duckdb")
+        make_formats_db(db_path, args.formats)
+        paths = make_paths(args.files, args.formats)
+        print(f"📦 {args.files:,} files, {args.formats + len(COMMON):,} formats")
+
+        start = time.perf_counter()
+        index = file_classifier.load_index(db_path)
+        print(f"{'load index (once, at startup)':<34} {time.perf_counter() - start:>8.3f}s")
+
+        start = time.perf_counter()
+        classification = index.classify(paths)
+        summary = classification.summary()
+        elapsed = time.perf_counter() - start
+        print(f"{'ExtensionIndex.classify + summary':<34} {elapsed:>8.3f}s  "
+              f"{summary['classified']:,} classified, {summary['unclassified']:,} unclassified")
+
+        sample = paths[:args.sample]
+        con = duckdb.connect(db_path, read_only=True)
+        start = time.perf_counter()
+        expected = [query_per_file(con, path.rsplit("/", 1)[-1]) for path in sample]
+        per_file = (time.perf_counter() - start) / len(sample)
+        con.close()
+        print(f"{'one query per file':<34} {per_file * args.files:>8.3f}s  (extrapolated from {len(sample):,} files)")
+
+        assert [index.category_of(code) for code in classification.codes[:len(sample)]] == expected, "Categories differ"
+        print(f"✅ Same categories on the sample, {per_file * args.files / elapsed:,.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Benchmark: `format_cleaning.FormatCleaner` single pass vs the previous clean + four check passes.
+
+Usage (from the `backend/` directory):
+    python benchmarks/bench_format_cleaning.py --rows 1000000
+
+Writes a synthetic merged file format dictionary (two CSV sources) and cleans it twice:
+with the previous implementation (embedded below: load every row, clean with an
+uncompiled `re.match` per row, then four full check passes over the list) and with
+`FormatCleaner.clean_to_files`, which streams the rows into clean, dirty and issue CSVs.
+Both write an issue report (one row per issue); checks that they keep the same clean and
+dirty rows and find the same number of issues of each kind.
+"""
+import os
+import re
+import csv
+import sys
+import time
+import random
+import argparse
+import logging
+import tempfile
+import tracemalloc
+import unicodedata
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import format_cleaning  # noqa: E402
+
+HEADERS = ("category", "extension", "description", "notes")
+EXTENSION_SHAPES = [
+    "{ext}", ".{ext}", "{low}", " {ext} ", "{ext} – {desc}", "{ext}, {ext}X", "{ext} {ext}",
+    "ＦＷ{ext}", "{ext}9", "X", "{ext}{ext}{ext}{ext}{ext}",
+]
+DESCRIPTIONS = ["", "Plain description", "  Padded  description ", "Mojibake â€“ dash", "Dash – left over"]
+
+
+def write_sources(workdir, n_rows, seed=42):
+    """Writes `n_rows` file format rows split across two CSV sources; returns their paths."""
+    rng = random.Random(seed)
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    paths = [os.path.join(workdir, f"source_{i}.csv") for i in range(2)]
+    files = [open(path, "w", newline="", encoding="utf-8") for path in paths]
+    writers = [csv.writer(file) for file in files]
+    for writer in writers:
+        writer.writerow(HEADERS)
+    for i in range(n_rows):
+        ext = "".join(rng.choice(letters) for _ in range(rng.randint(2, 4)))
+        shape = rng.choice(EXTENSION_SHAPES)
+        extension = shape.format(ext=ext, low=ext.lower(), desc=f"Format {i}")
+        notes = "" if i % 7 == 0 else f"Link {i} (Page {i})"
+        writers[i % 2].writerow([f" Category {i % 40} ", extension, rng.choice(DESCRIPTIONS), notes])
+    for file in files:
+        file.close()
+    return paths
+
+
+# ============================
+# 📌 Previous implementation (load, clean, four check passes)
+# ============================
+def legacy_clean(file_formats):
+    cleaned, dirty = [], []
+    for entry in file_formats:
+        if "extension" in entry and isinstance(entry["extension"], str):
+            extension = unicodedata.normalize("NFKD", entry["extension"]).strip().replace("–", ", ")
+            parts = extension.split(", ", 1)
+            extension = parts[0].strip()
+            if len(parts) > 1:
+                entry["description"] = parts[1].strip() + " " + entry.get("description", "").strip()
+            entry["description"] = entry.get("description", "").strip()
+            entry["category"] = entry.get("category", "").strip()
+            entry["popularity"] = entry.get("popularity", "").strip()
+            if not extension.startswith("."):
+                extension = "." + extension
+            extension = extension.upper()
+            if " " in extension or not re.match(format_cleaning.VALID_EXTENSION_REGEX, extension):
+                dirty.append(entry)
+                continue
+            entry["extension"] = extension
+            cleaned.append(entry)
+    return cleaned, dirty
+
+
+def legacy_checks(file_formats, dirty):
+    """Runs the four check passes (characters and missing fields over the dirty rows too); returns the issues of each kind."""
+    every_row = file_formats + dirty
+    unexpected = set()
+    for i, entry in enumerate(every_row):
+        for char in ["–", "â€“", "  "]:
+            if char in entry["extension"]:
+                unexpected.add((i, "extension"))
+            if char in entry["description"]:
+                unexpected.add((i, "description"))
+    missing = [(i, field) for i, entry in enumerate(every_row) for field in HEADERS
+               if entry[field] == "" or entry[field] is None]
+    seen, duplicates = {}, []
+    for i, entry in enumerate(file_formats):
+        ext = entry["extension"].lower()
+        if ext in seen:
+            duplicates.append((i, ext))
+        else:
+            seen[ext] = i
+    no_description = [(i, entry["extension"]) for i, entry in enumerate(file_formats) if entry["description"] == ""]
+    return {
+        format_cleaning.UNEXPECTED_CHARACTER: sorted(unexpected),
+        format_cleaning.MISSING_VALUE: missing,
+        format_cleaning.DUPLICATE_EXTENSION: duplicates,
+        format_cleaning.MISSING_DESCRIPTION: no_description,
+    }
+
+
+def legacy_pipeline(paths, workdir):
+    file_formats = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as file:
+            file_formats.extend(csv.DictReader(file))
+    cleaned, dirty = legacy_clean(file_formats)
+    issues = legacy_checks(cleaned, dirty)
+    for name, rows in (("legacy_clean.csv", cleaned), ("legacy_dirty.csv", dirty)):
+        with open(os.path.join(workdir, name), "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(HEADERS)
+            writer.writerows([entry.get(field, "") for field in HEADERS] for entry in rows)
+    # The same report the new pipeline writes, kind by kind
+    with open(os.path.join(workdir, "legacy_issues.csv"), "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(format_cleaning.ISSUE_FIELDS)
+        writer.writerows((i, "extension", format_cleaning.INVALID_EXTENSION, entry["extension"]) for i, entry in enumerate(dirty))
+        for kind, found in issues.items():
+            writer.writerows((issue[0], "", kind, issue[1]) for issue in found)
+    counts = {kind: len(found) for kind, found in issues.items()}
+    counts[format_cleaning.INVALID_EXTENSION] = len(dirty)
+    return counts
+
+
+def measured(label, func, trace_memory):
+    start = time.perf_counter()
+    result = func()
+    line = f"{label:<30} {time.perf_counter() - start:>8.2f}s"
+    if trace_memory:  # A second, traced run (tracemalloc slows allocation-heavy code down a lot)
+        tracemalloc.start()
+        func()
+        line += f"  peak {tracemalloc.get_traced_memory()[1] / 2**20:>8.1f} MiB"
+        tracemalloc.stop()
+    print(line)
+    return result
+
+
+def same_file(a, b):
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        return fa.read() == fb.read()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=1_000_000, help="Rows across the merged sources")
+    arg_parser.add_argument("--memory", action="store_true", help="Also measure peak memory (slow)")
+    args = arg_parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = write_sources(workdir, args.rows)
+        print(f"📦 {args.rows:,} rows in {len(paths)} sources")
+
+        legacy_counts = measured("load + clean + 4 checks", lambda: legacy_pipeline(paths, workdir), args.memory)
+        out = lambda name: os.path.join(workdir, name)  # noqa: E731
+        report = measured("FormatCleaner.clean_to_files", lambda: format_cleaning.FormatCleaner(HEADERS).clean_to_files(
+            format_cleaning.iter_csv_entries(*paths), out("clean.csv"), out("dirty.csv"), out("issues.csv"), HEADERS),
+            args.memory)
+
+        assert same_file(out("legacy_clean.csv"), out("clean.csv")), "Clean rows differ"
+        assert same_file(out("legacy_dirty.csv"), out("dirty.csv")), "Dirty rows differ"
+        assert report.issue_counts == Counter(legacy_counts), \
+            f"Issues differ: {legacy_counts} vs {dict(report.issue_counts)}"
+        print(f"✅ Same {report.clean:,} clean / {report.dirty:,} dirty rows and issues: {dict(report.issue_counts)}")
+
+
+if __name__ == "__main__":
+    main()
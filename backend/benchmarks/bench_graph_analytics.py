@@ -0,0 +1,75 @@
+"""Benchmark: `graph_analytics.analyze` on a synthetic file dependency graph.
+
+Usage (from the `backend/` directory):
+    python benchmarks/bench_graph_analytics.py --nodes 100000 --edges 500000
+
+Most edges point "down" to lower-numbered files (a layered codebase) and the rest are
+random, which creates a few large import cycles. With networkx installed, its SCC,
+condensation layering and degree centrality run on the same graph for comparison.
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import graph_analytics  # noqa: E402
+
+
+def make_synthetic_edges(n_nodes, n_edges, back_edge_ratio=0.1, seed=42):
+    """Returns a `file_used -> file_defined` edge DataFrame over `n_nodes` files."""
+    rng = np.random.default_rng(seed)
+    dependents = rng.integers(1, n_nodes, n_edges)
+    dependencies = (rng.random(n_edges) * dependents).astype(np.int64)
+    back = rng.random(n_edges) < back_edge_ratio
+    dependencies[back] = rng.integers(0, n_nodes, back.sum())
+    to_path = lambda ids: np.char.add(np.char.add("pkg/module_", ids.astype(str)), ".py")  # noqa: E731
+    return pd.DataFrame({"file_used": to_path(dependents), "file_defined": to_path(dependencies)})
+
+
+def time_networkx(edges):
+    import networkx as nx
+
+    start = time.perf_counter()
+    G = nx.DiGraph()
+    G.add_edges_from(zip(edges["file_used"], edges["file_defined"]))
+    components = list(nx.strongly_connected_components(G))
+    condensed = nx.condensation(G, components)
+    layers = list(nx.topological_generations(condensed.reverse(copy=False)))
+    nx.in_degree_centrality(G), nx.out_degree_centrality(G)
+    return time.perf_counter() - start, len(components), len(layers)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--nodes", type=int, default=100_000)
+    arg_parser.add_argument("--edges", type=int, default=500_000)
+    arg_parser.add_argument("--back-edge-ratio", type=float, default=0.1, help="Share of random (cycle-forming) edges")
+    args = arg_parser.parse_args()
+
+    edges = make_synthetic_edges(args.nodes, args.edges, args.back_edge_ratio)
+    scc_backend = "scipy" if graph_analytics.connected_components is not None else "iterative Tarjan"
+    print(f"📦 {args.nodes:,} files, {len(edges):,} edges (SCC backend: {scc_backend})")
+
+    start = time.perf_counter()
+    result = graph_analytics.analyze(edges)
+    elapsed = time.perf_counter() - start
+    cycles = result.cycles
+    print(f"{'graph_analytics.analyze':<28} {elapsed:>8.2f}s  {result.component_count:,} components, "
+          f"{len(cycles)} cycles (largest {len(cycles[0]) if cycles else 0:,} files), {result.layer_count} layers")
+
+    try:
+        nx_elapsed, nx_components, nx_layers = time_networkx(edges)
+    except ImportError:
+        print("networkx is not installed; skipping the comparison")
+        return
+    print(f"{'networkx':<28} {nx_elapsed:>8.2f}s  {nx_components:,} components, {nx_layers} layers")
+    assert (nx_components, nx_layers) == (result.component_count, result.layer_count), "Results differ"
+
+
+if __name__ == "__main__":
+    main()
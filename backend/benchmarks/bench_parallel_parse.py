@@ -0,0 +1,49 @@
+"""Benchmark: throughput of `parser.parse_repository` as the worker count grows.
+
+Usage (from the `backend/` directory):
+    python benchmarks/bench_parallel_parse.py --files 5000 --workers 1 2 4 8
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import parser  # noqa: E402
+from _synthetic import make_synthetic_repo  # noqa: E402
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--files", type=int, default=5000, help="Number of synthetic Python files")
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as repo_path:
+        make_synthetic_repo(repo_path, args.files)
+        print(f"📦 Synthetic repo: {args.files} files")
+        print(f"{'workers':>8} {'seconds':>10} {'files/s':>10} {'speedup':>8}")
+
+        baseline = None
+        reference = None
+        for workers in sorted(set(args.workers)):
+            start = time.perf_counter()
+            result = parser.parse_repository(repo_path, workers=workers, use_cache=False)
+            elapsed = time.perf_counter() - start
+
+            # Every worker count must produce exactly the serial result
+            if reference is None:
+                reference = result
+            assert result == reference, f"Result for {workers} workers differs from serial parse"
+
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>10.3f} {args.files / elapsed:>10.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark: cold vs. warm `parser.parse_repository` with the on-disk parse cache.
+
+Usage (from the `backend/` directory):
+    python benchmarks/bench_parse_cache.py --files 5000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import parser  # noqa: E402
+from _synthetic import make_synthetic_repo  # noqa: E402
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--files", type=int, default=5000, help="Number of synthetic Python files")
+    arg_parser.add_argument("--workers", type=int, default=1, help="Process pool size for cache misses")
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        repo_path = make_synthetic_repo(os.path.join(workdir, "repo"), args.files)
+        cache_path = os.path.join(workdir, "parse_cache.sqlite3")
+        print(f"📦 Synthetic repo: {args.files} files")
+
+        uncached = timed("no cache", lambda: parser.parse_repository(repo_path, workers=args.workers, use_cache=False))
+        cold = timed("cold cache", lambda: parser.parse_repository(repo_path, workers=args.workers, cache_path=cache_path))
+        warm = timed("warm cache", lambda: parser.parse_repository(repo_path, workers=args.workers, cache_path=cache_path))
+
+        # Touch 1% of the files and re-parse
+        for filepath in uncached["files"][::100]:
+            with open(filepath, "a", encoding="utf-8") as f:
+                f.write("\n\ndef touched():\n    pass\n")
+        timed("warm cache, 1% changed", lambda: parser.parse_repository(repo_path, workers=args.workers, cache_path=cache_path))
+
+        assert uncached == cold == warm, "Cached parse differs from uncached parse"
+
+
+if __name__ == "__main__":
+    main()
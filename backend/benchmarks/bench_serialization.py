@@ -0,0 +1,57 @@
+"""Benchmark: encode/decode time and size of a parse result in every available format.
+
+Usage (from the `backend/` directory):
+    python benchmarks/bench_serialization.py --files 20000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import parser  # noqa: E402
+import serializers  # noqa: E402
+from _synthetic import make_synthetic_repo  # noqa: E402
+
+
+def best_of(repeat, func):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--files", type=int, default=20000, help="Number of synthetic Python files")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        repo_path = make_synthetic_repo(os.path.join(workdir, "cloned_repos", "repo"), args.files)
+        parsed_data = parser.parse_repository(repo_path, use_cache=False)
+        print(f"📦 Synthetic parse: {args.files} files")
+        print(f"{'format':<24} {'size':>12} {'encode':>10} {'decode':>10}")
+
+        for name, serializer in serializers.SERIALIZERS.items():
+            for interned in (False, True):
+                # Interning is part of the encode cost, expanding part of the decode cost
+                encode, payload = best_of(
+                    args.repeat, lambda: serializer.dumps(serializers.intern_paths(parsed_data) if interned else parsed_data)
+                )
+                decode, decoded = best_of(args.repeat, lambda: serializers.expand_paths(serializer.loads(payload)))
+                assert decoded == parsed_data, f"{name} did not round-trip"
+
+                label = name + (" + interned" if interned else "")
+                print(f"{label:<24} {len(payload):>10,} B {encode:>9.3f}s {decode:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark: `_getting_wiki_data` single-parse path vs the previous prettify round-trip.
+
+Usage (from the `backend/` directory):
+    python benchmarks/bench_wiki_parse.py                 # saved fixture, synthesized if missing
+    python benchmarks/bench_wiki_parse.py --download      # save the live Wikipedia page as the fixture
+
+Parses the saved "List of file formats" page with the previous implementation (embedded
+below: parse, prettify, re-parse, `find_all` + per-item `get_text`) and with the current
+one (content div only, one streaming pass), using html.parser and, when installed, lxml.
+No copy of the live page is committed: without `--download`, the fixture is a synthetic
+page (`_synthetic.make_wiki_page`) with the same markup, so timings are only indicative.
+The entries must match; link notes are compared with whitespace collapsed, since the
+prettify round-trip padded link text with indentation.
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import _getting_wiki_data as wiki  # noqa: E402
+from _synthetic import make_wiki_page  # noqa: E402
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "List_of_file_formats.html")
+
+
+# ============================
+# 📌 Prettify round-trip baseline (the previous implementation)
+# ============================
+def legacy_prettify_soup(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    content = soup.find('div', {'class': 'mw-parser-output'})
+    return BeautifulSoup(content.prettify(), 'html.parser')
+
+
+def legacy_parse_file_formats(soup):
+    file_formats = []
+    current_category = ""
+    for element in soup.find_all(['h2', 'h3', 'ul']):
+        if element.name in ['h2', 'h3']:
+            heading_span = element.find('span', {'class': 'mw-headline'})
+            current_category = heading_span.get_text(strip=True) if heading_span else element.get_text(strip=True)
+        elif element.name == 'ul' and current_category:
+            for li in element.find_all('li', recursive=False):
+                full_text = li.get_text(strip=True)
+                parts = full_text.split(' – ', 1)
+                if len(parts) < 2:
+                    parts = full_text.split(' - ', 1)
+                extensions = parts[0].strip()
+                description = parts[1].strip() if len(parts) >= 2 else ""
+                notes = [f"{a.get_text()} ({a['title']})" for a in li.find_all('a') if a.get('href') and a.get('title')]
+                for ext in (ext.strip() for ext in extensions.split(',')):
+                    ext = ext.strip('.').strip()
+                    if ext:
+                        file_formats.append({'category': current_category, 'extension': ext, 'description': description,
+                                             'notes': '; '.join(notes) if notes else ''})
+    return file_formats
+
+
+def comparable(file_formats):
+    return [(f['category'], f['extension'], f['description'], " ".join(f['notes'].split())) for f in file_formats]
+
+
+def timed(label, func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<34} {best:>8.3f}s  {len(result):,} entries")
+    return best, result
+
+
+def load_fixture(path, download, sections):
+    if download:
+        html = wiki.fetch_wiki_html()
+        if html is None:
+            sys.exit("Could not fetch the Wikipedia page")
+    elif os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    else:
+        html = make_wiki_page(n_sections=sections)
+        print(f"No fixture at {path}; saving a synthetic page there (use --download for the live page)")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return html
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="Saved HTML of the page")
+    arg_parser.add_argument("--download", action="store_true", help="Fetch the live page and save it as the fixture")
+    arg_parser.add_argument("--sections", type=int, default=40, help="Sections of a synthesized fixture")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per variant (the best is reported)")
+    args = arg_parser.parse_args()
+    logging.disable(logging.INFO)
+
+    html = load_fixture(args.fixture, args.download, args.sections)
+    print(f"📦 {os.path.basename(args.fixture)}: {len(html) / 2**10:,.0f} KiB")
+
+    legacy_time, legacy = timed("prettify round-trip (html.parser)",
+                                lambda: legacy_parse_file_formats(legacy_prettify_soup(html)), args.repeat)
+    expected = comparable(legacy)
+
+    parsers = ["html.parser"] + (["lxml"] if wiki.DEFAULT_PARSER == "lxml" else [])
+    for parser in parsers:
+        elapsed, result = timed(f"single parse ({parser})",
+                                lambda: wiki.parse_file_formats(wiki.parse_content(html, parser)), args.repeat)
+        assert comparable(result) == expected, f"Entries differ with {parser}"
+        print(f"  ✅ same entries, {legacy_time / elapsed:.1f}x faster")
+    if "lxml" not in parsers:
+        print("lxml is not installed; skipping the lxml parser")
+
+
+if __name__ == "__main__":
+    main()
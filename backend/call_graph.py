@@ -0,0 +1,384 @@
+import os
+import json
+import sqlite3
+import builtins
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import pandas as pd
+import parsed_views
+from ast_extractor import CallRecord, Definition, FileFacts, ImportRecord
+
+# Kinds of call targets
+FUNCTION, CLASS, EXTERNAL, UNRESOLVED = "function", "class", "external", "unresolved"
+TARGET_KINDS = (FUNCTION, CLASS, EXTERNAL, UNRESOLVED)
+
+DEFAULT_MAX_CACHED_GRAPHS = 8
+_MAX_REEXPORT_HOPS = 16  # Bounds `from a import b` chains (and import cycles) when following re-exports
+_BUILTINS = frozenset(dir(builtins))
+
+
+class CallEdge(NamedTuple):
+    """One call site resolved to a fully-qualified target.
+
+    `target` is e.g. `pkg.utils.helper`, `pkg.models.User.save` or `os.path.join`;
+    `target_path` / `target_lineno` point at the definition when it is in the repository.
+    """
+    caller_path: str
+    caller_scope: str  # Dotted path of the calling function/class, "" at module level
+    lineno: int
+    call: str  # Call expression as written: "helper" / "os.path.join"
+    target: Optional[str]  # None when the receiver is not a known name (e.g. a local variable)
+    target_path: Optional[str]
+    target_lineno: Optional[int]
+    kind: str  # One of `TARGET_KINDS`
+
+
+# ============================
+# 📌 Module Paths
+# ============================
+def module_names(paths: Iterable[str]) -> Dict[str, List[str]]:
+    """Returns the dotted module names each (repository-relative, `/`-separated) path is importable as.
+
+    The first name is relative to the nearest ancestor directory without an `__init__.py`
+    (a source root such as `src/` or a script directory); the second, when different, is
+    relative to the repository root. `pkg/__init__.py` is module `pkg`.
+    """
+    paths = list(paths)
+    packages = {os.path.dirname(path) for path in paths if os.path.basename(path) == "__init__.py"}
+
+    names = {}
+    for path in paths:
+        directories, filename = path.split("/")[:-1], path.split("/")[-1]
+        parts = directories + ([] if filename == "__init__.py" else [filename[:-3] if filename.endswith(".py") else filename])
+
+        # Walk up while the enclosing directory is a package
+        root = len(directories)
+        while root > 0 and "/".join(directories[:root]) in packages:
+            root -= 1
+        candidates = [".".join(parts[root:]), ".".join(parts)]
+        names[path] = [name for index, name in enumerate(candidates) if name and name not in candidates[:index]]
+    return names
+
+
+def resolve_relative(module: str, is_package: bool, level: int, target: str) -> str:
+    """Absolute module of `from <level dots><target> import ...` inside `module`."""
+    if level == 0:
+        return target
+    base = module.split(".") if module else []
+    if not is_package:
+        base = base[:-1]  # A plain module's `.` is its package
+    base = base[:len(base) - (level - 1)] if level > 1 else base
+    return ".".join(part for part in (*base, target) if part)
+
+
+# ============================
+# 📌 Per-File Scope Tables
+# ============================
+@dataclass
+class FileScope:
+    """Names visible in one file: module-level bindings, star imports and local definitions."""
+    path: str
+    module: str
+    is_package: bool
+    bindings: Dict[str, str] = field(default_factory=dict)  # Module-level name -> qualified target
+    star_imports: List[str] = field(default_factory=list)  # Modules of `from m import *`, in order
+    definitions: Dict[str, Definition] = field(default_factory=dict)  # Qualified name -> definition
+    class_scopes: frozenset = frozenset()  # Dotted scopes (within the file) that are class bodies
+    calls: List[CallRecord] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, path: str, module: str, facts: FileFacts) -> "FileScope":
+        scope = cls(path, module, os.path.basename(path) == "__init__.py", calls=facts.calls)
+        qualify = lambda definition: ".".join(part for part in (module, definition.scope, definition.name) if part)  # noqa: E731
+
+        # Module-level names bind in source order, so a later import shadows an earlier def and vice versa
+        bound = []
+        for imp in facts.imports:
+            if imp.name is None:
+                # `import a.b` binds `a`; `import a.b as c` binds `c` to `a.b`
+                bound.append((imp.lineno, imp.alias or imp.module.split(".")[0], imp.module if imp.alias else imp.module.split(".")[0]))
+                continue
+            source = resolve_relative(module, scope.is_package, imp.level, imp.module)
+            if imp.name == "*":
+                scope.star_imports.append(source)
+            else:
+                bound.append((imp.lineno, imp.alias or imp.name, f"{source}.{imp.name}" if source else imp.name))
+        for definition in (*facts.functions, *facts.classes):
+            scope.definitions[qualify(definition)] = definition
+            if not definition.scope:
+                bound.append((definition.lineno, definition.name, qualify(definition)))
+        for _, name, target in sorted(bound, key=lambda item: item[0]):
+            scope.bindings[name] = target
+
+        scope.class_scopes = frozenset(".".join(part for part in (klass.scope, klass.name) if part) for klass in facts.classes)
+        return scope
+
+    def lookup(self, name: str, call_scope: str) -> Optional[str]:
+        """Qualified target of bare `name` used in `call_scope`, following Python's scoping rules:
+        enclosing function scopes, then module bindings. Class bodies are only visible to themselves."""
+        parts = call_scope.split(".") if call_scope else []
+        for depth in range(len(parts), 0, -1):
+            enclosing = ".".join(parts[:depth])
+            if depth < len(parts) and enclosing in self.class_scopes:
+                continue
+            qualified = f"{self.module}.{enclosing}.{name}" if self.module else f"{enclosing}.{name}"
+            if qualified in self.definitions:
+                return qualified
+        return self.bindings.get(name)
+
+    def enclosing_class(self, call_scope: str) -> Optional[str]:
+        """Qualified name of the class whose method contains `call_scope` (for `self.x()` / `cls.x()`)."""
+        parts = call_scope.split(".") if call_scope else []
+        for depth in range(len(parts) - 1, 0, -1):
+            enclosing = ".".join(parts[:depth])
+            if enclosing in self.class_scopes:
+                return f"{self.module}.{enclosing}" if self.module else enclosing
+        return None
+
+
+def _as_facts(path: str, facts: Union[FileFacts, Dict[str, list]]) -> FileFacts:
+    """Accepts `FileFacts` or their `to_record()` form (as stored by the parse store)."""
+    if isinstance(facts, FileFacts):
+        return facts
+    return FileFacts(
+        path,
+        functions=[Definition(*item) for item in facts.get("functions", ())],
+        classes=[Definition(*item) for item in facts.get("classes", ())],
+        imports=[ImportRecord(*item) for item in facts.get("imports", ())],
+        calls=[CallRecord(*item) for item in facts.get("calls", ())],
+    )
+
+
+# ============================
+# 📌 Resolution
+# ============================
+class CallGraph:
+    """File -> function call graph of one repository, resolved once from extracted facts.
+
+    `build()` creates a scope table per file and indexes every module name and qualified
+    definition; each call is then resolved to a fully-qualified target with dictionary
+    lookups, following aliases, relative imports and re-exports through `__init__.py`.
+    Edges are indexed by caller file and by target for querying.
+    """
+
+    def __init__(self, edges: List[CallEdge]):
+        self.edges = edges
+        self._by_caller: Dict[str, List[int]] = {}
+        self._by_target: Dict[str, List[int]] = {}
+        for index, edge in enumerate(edges):
+            self._by_caller.setdefault(edge.caller_path, []).append(index)
+            if edge.target is not None:
+                self._by_target.setdefault(edge.target, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    @classmethod
+    def build(cls, files: Dict[str, Union[FileFacts, Dict[str, list]]]) -> "CallGraph":
+        """Resolves the calls of `{repository-relative path: facts}`."""
+        return cls(list(resolve_calls(files)))
+
+    @classmethod
+    def from_store(cls, store, repo: Dict) -> "CallGraph":
+        """Builds the graph of a stored repository (`repo` as returned by `ParseStore.get_repo`)."""
+        return cls.build(store.load_file_facts(repo))
+
+    # ============================
+    # 📌 Queries
+    # ============================
+    def calls_from(self, path: str) -> List[CallEdge]:
+        """Every call made in file `path`, in source order."""
+        return [self.edges[index] for index in self._by_caller.get(path, ())]
+
+    def callers_of(self, target: str) -> List[CallEdge]:
+        """Every call site resolved to `target`, or to a member of it (`pkg.mod` matches `pkg.mod.f`)."""
+        if target in self._by_target:
+            return [self.edges[index] for index in self._by_target[target]]
+        prefix = target + "."
+        return [self.edges[index] for key, indexes in self._by_target.items() if key.startswith(prefix) for index in indexes]
+
+    def file_edges(self) -> pd.DataFrame:
+        """Distinct `caller_path -> target` edges with their call count, e.g. for dependency graphs."""
+        frame = self.to_frame()
+        frame = frame[frame["target"].notna()]
+        return (
+            frame.groupby(["caller_path", "target", "target_path", "kind"], dropna=False, sort=True)
+            .size()
+            .reset_index(name="calls")
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.edges, columns=CallEdge._fields)
+
+
+class _Resolver:
+    """Scope tables plus the module and definition indexes shared by every file of a repository."""
+
+    def __init__(self, files: Dict[str, Union[FileFacts, Dict[str, list]]]):
+        names = module_names(files)
+        self.scopes: Dict[str, FileScope] = {}
+        self.modules: Dict[str, List[FileScope]] = {}  # Module name -> scopes (several when ambiguous)
+        self.symbols: Dict[str, Tuple[str, Definition, str]] = {}  # Qualified name -> (path, definition, kind)
+
+        for path, facts in files.items():
+            facts = _as_facts(path, facts)
+            scope = FileScope.build(path, names[path][0] if names[path] else "", facts)
+            self.scopes[path] = scope
+            for name in names[path]:
+                self.modules.setdefault(name, []).append(scope)
+            for qualified, definition in scope.definitions.items():
+                local = qualified[len(scope.module) + 1:] if scope.module else qualified
+                self.symbols.setdefault(qualified, (path, definition, CLASS if local in scope.class_scopes else FUNCTION))
+
+        self.top_level = {name.split(".")[0] for name in self.modules}
+
+    def _module(self, name: str, near: str) -> Optional[FileScope]:
+        """Scope of module `name`; when several files claim it, the one next to `near` wins."""
+        candidates = self.modules.get(name)
+        if not candidates:
+            return None
+        if len(candidates) > 1:
+            directory = os.path.dirname(near)
+            for candidate in candidates:
+                if os.path.dirname(candidate.path) == directory:
+                    return candidate
+        return candidates[0]
+
+    def canonical(self, qualified: str, near: str) -> Tuple[str, Optional[str], Optional[Definition], str]:
+        """Follows `qualified` to its definition: returns `(target, path, definition, kind)`."""
+        for _ in range(_MAX_REEXPORT_HOPS):
+            symbol = self.symbols.get(qualified)
+            if symbol is not None:
+                path, definition, kind = symbol
+                return qualified, path, definition, kind
+
+            # Split into the longest known module and the attribute path within it
+            parts = qualified.split(".")
+            for split in range(len(parts) - 1, 0, -1):
+                scope = self._module(".".join(parts[:split]), near)
+                if scope is not None:
+                    break
+            else:
+                if self._module(qualified, near) is not None or parts[0] in self.top_level:
+                    return qualified, None, None, UNRESOLVED  # A repository module, but no such definition
+                return qualified, None, None, EXTERNAL
+
+            # Local definitions were checked above; a module-level import re-exports the name
+            head, rest = parts[split], parts[split + 1:]
+            target = scope.bindings.get(head)
+            if target is None:
+                for star_module in scope.star_imports:
+                    if f"{star_module}.{head}" in self.symbols:
+                        target = f"{star_module}.{head}"
+                        break
+            # Stop when there is nothing to follow or the name is the module's own definition
+            if target is None or target == ".".join(parts[:split + 1]):
+                return qualified, None, None, UNRESOLVED
+            qualified, near = ".".join((target, *rest)), scope.path
+        return qualified, None, None, UNRESOLVED
+
+    def resolve_call(self, scope: FileScope, call: CallRecord) -> CallEdge:
+        written = f"{call.receiver}.{call.name}" if call.receiver else call.name
+        qualified = None
+        if call.receiver is None:
+            qualified = scope.lookup(call.name, call.scope)
+            if qualified is None:
+                for star_module in scope.star_imports:
+                    target, path, _, _ = self.canonical(f"{star_module}.{call.name}", scope.path)
+                    if path is not None:
+                        qualified = target
+                        break
+            if qualified is None and call.name in _BUILTINS:
+                qualified = f"builtins.{call.name}"
+        else:
+            head, _, rest = call.receiver.partition(".")
+            base = scope.enclosing_class(call.scope) if head in ("self", "cls") else scope.lookup(head, call.scope)
+            if base is not None:
+                qualified = ".".join(part for part in (base, rest, call.name) if part)
+
+        if qualified is None:
+            return CallEdge(scope.path, call.scope, call.lineno, written, None, None, None, UNRESOLVED)
+        target, path, definition, kind = self.canonical(qualified, scope.path)
+        return CallEdge(scope.path, call.scope, call.lineno, written, target, path, definition.lineno if definition else None, kind)
+
+
+def resolve_calls(files: Dict[str, Union[FileFacts, Dict[str, list]]],
+                  calls_of: Optional[Callable[[str], Iterable[CallRecord]]] = None) -> Iterator[CallEdge]:
+    """Yields the resolved calls of `{repository-relative path: facts}` file by file (sorted by path),
+    without keeping the edges; `CallGraph.build()` collects them. With `calls_of` (e.g.
+    `CallSpill.calls_of`), each file's calls are read from it instead of from its facts."""
+    resolver = _Resolver(files)
+    for path in sorted(resolver.scopes):
+        scope = resolver.scopes[path]
+        for call in (scope.calls if calls_of is None else calls_of(path)):
+            yield resolver.resolve_call(scope, call)
+
+
+class CallSpill:
+    """Per-file call lists kept in a temporary SQLite file instead of in memory.
+
+    Scope tables need every file's definitions and imports before any call can be resolved,
+    but calls are by far the largest part of the facts; spilling them while the files are
+    parsed bounds memory by the scope tables plus the calls of one file.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        fd, self.path = tempfile.mkstemp(prefix="calls.", suffix=".sqlite3", dir=directory)
+        os.close(fd)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=OFF")  # Scratch data: nothing to recover after a crash
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("CREATE TABLE calls (path TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def add(self, path: str, calls: Iterable[CallRecord]):
+        self.conn.execute("INSERT OR REPLACE INTO calls VALUES (?, ?)", (path, json.dumps([tuple(call) for call in calls])))
+
+    def calls_of(self, path: str) -> List[CallRecord]:
+        row = self.conn.execute("SELECT value FROM calls WHERE path = ?", (path,)).fetchone()
+        return [CallRecord(*item) for item in json.loads(row[0])] if row else []
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ============================
+# 📌 In-Process Cache
+# ============================
+class CallGraphCache:
+    """Call graphs of the most recently queried repositories, rebuilt when their store version changes."""
+
+    def __init__(self, store, max_repos: int = DEFAULT_MAX_CACHED_GRAPHS):
+        self.store = store
+        self.max_repos = max_repos
+        self._graphs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, repo: Dict) -> CallGraph:
+        """Returns the call graph of `repo` (a `ParseStore.get_repo` row), building it if stale."""
+        key = parsed_views.repo_version_key(repo)
+        with self._lock:
+            cached = self._graphs.get(repo["repo_name"])
+            if cached is not None and cached[0] == key:
+                self._graphs.move_to_end(repo["repo_name"])
+                return cached[1]
+
+        graph = CallGraph.from_store(self.store, repo)
+        with self._lock:
+            self._graphs[repo["repo_name"]] = (key, graph)
+            self._graphs.move_to_end(repo["repo_name"])
+            while len(self._graphs) > self.max_repos:
+                self._graphs.popitem(last=False)
+        return graph
@@ -1,52 +1,61 @@
 import pandas as pd
-import re
+import numpy as np
 import os
-from collections import defaultdict
 
 # Define output paths
 LANGUAGE_IMPORT_RULES_CSV = "backend/raw/language_import_rules.csv"
 LANGUAGE_PATTERNS_CSV = "backend/raw/language_patterns.csv"
 
-def classify_import_patterns(parsed_csv_path):
-    """Reads parsed CSV and generates dynamic import rules & regex based on observed behaviors."""
-    
-    # Read parsed CSV
-    df = pd.read_csv(parsed_csv_path)
+# Rows per chunk when streaming the parsed CSV; memory is bounded by the chunk, not the file
+DEFAULT_CHUNK_ROWS = 500_000
+
+# Import classification rules, checked in order: (match regex, pattern type, rule regex)
+IMPORT_RULES = [
+    (r"^[a-zA-Z0-9_]+$", "Standard Import", r"^import (\w+)"),
+    (r"^[a-zA-Z0-9_]+\.[a-zA-Z0-9_]+$", "Selective Import", r"^from (\w+) import (\w+)"),
+    (r"^[a-zA-Z0-9_]+ as [a-zA-Z0-9_]+$", "Aliased Import", r"^import (\w+) as (\w+)"),
+]
+UNKNOWN_RULE = ("Unknown Pattern", "N/A")
+
+# `Type` value -> `reference_type` of the language patterns dataset
+REFERENCE_TYPES = {"Import": "Import", "Definition": "Function Definition", "Call": "Function Call"}
+
+
+def _read_parsed_csv(parsed_csv_path, columns, chunk_rows):
+    """Yields the parsed CSV in chunks, reading only `columns` and keeping every value a string (or NaN)."""
+    return pd.read_csv(parsed_csv_path, usecols=columns, dtype=str, chunksize=chunk_rows)
+
 
-    # Filter only import statements
-    df_imports = df[df["Type"] == "Import"]
+def _classify_modules(modules: pd.Series):
+    """Returns `(pattern_type, regex_pattern)` arrays for a Series of module names."""
+    # `str.match` has `re.match` semantics, so `$` also matches before a trailing newline as before
+    conditions = [modules.str.match(match_regex).to_numpy(dtype=bool) for match_regex, _, _ in IMPORT_RULES]
+    pattern_types = np.select(conditions, [pattern_type for _, pattern_type, _ in IMPORT_RULES], UNKNOWN_RULE[0])
+    regex_patterns = np.select(conditions, [regex for _, _, regex in IMPORT_RULES], UNKNOWN_RULE[1])
+    return pattern_types, regex_patterns
 
-    # Dictionary to store unique import patterns
-    import_patterns = defaultdict(set)
 
-    # Process each import statement
-    for _, row in df_imports.iterrows():
-        module_name = row["Module"]
-        file_path = row["File"]
+def classify_import_patterns(parsed_csv_path, output_file=LANGUAGE_IMPORT_RULES_CSV, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Reads parsed CSV and generates dynamic import rules & regex based on observed behaviors."""
+
+    # Dictionary to store unique import patterns, groups in first-seen order
+    import_patterns = {}
+    seen_modules = set()
 
-        # Skip invalid or empty values
-        if not isinstance(module_name, str) or module_name.strip() == "":
+    for chunk in _read_parsed_csv(parsed_csv_path, ["Type", "Module"], chunk_rows):
+        # Filter only import statements, skipping invalid or empty module names
+        modules = chunk.loc[chunk["Type"] == "Import", "Module"].dropna()
+        modules = modules[modules.str.strip() != ""].drop_duplicates()
+        modules = modules[~modules.isin(seen_modules)]
+        if modules.empty:
             continue
 
-        # Classify based on structure
-        if re.match(r"^[a-zA-Z0-9_]+$", module_name):
-            pattern_type = "Standard Import"
-            regex_pattern = r"^import (\w+)"
-        
-        elif re.match(r"^[a-zA-Z0-9_]+\.[a-zA-Z0-9_]+$", module_name):
-            pattern_type = "Selective Import"
-            regex_pattern = r"^from (\w+) import (\w+)"
-        
-        elif re.match(r"^[a-zA-Z0-9_]+ as [a-zA-Z0-9_]+$", module_name):
-            pattern_type = "Aliased Import"
-            regex_pattern = r"^import (\w+) as (\w+)"
-        
-        else:
-            pattern_type = "Unknown Pattern"
-            regex_pattern = "N/A"
-
-        # Store unique patterns
-        import_patterns[(pattern_type, regex_pattern)].add(module_name)
+        seen_modules.update(modules)
+        pattern_types, regex_patterns = _classify_modules(modules)
+        for module_name, pattern_type, regex_pattern in zip(modules, pattern_types, regex_patterns):
+            # Sets are filled one module at a time in row order, exactly like the row-by-row
+            # version, so they iterate (and the CSV rows come out) in the same order
+            import_patterns.setdefault((pattern_type, regex_pattern), set()).add(module_name)
 
     # Convert to DataFrame
     import_rules_list = [
@@ -58,52 +67,47 @@ def classify_import_patterns(parsed_csv_path):
     df_rules = pd.DataFrame(import_rules_list)
 
     # Save to CSV
-    df_rules.to_csv(LANGUAGE_IMPORT_RULES_CSV, index=False)
-    print(f"✅ Generated import rules and saved to {LANGUAGE_IMPORT_RULES_CSV}")
-
-def process_language_patterns(parsed_csv_path):
+    df_rules.to_csv(output_file, index=False)
+    print(f"✅ Generated import rules and saved to {output_file}")
+
+
+def _language_pattern_frame(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Builds the language patterns rows for one chunk of the parsed CSV."""
+    record_types = chunk["Type"].to_numpy(dtype=object)
+    reference_types = np.select(
+        [record_types == record_type for record_type in REFERENCE_TYPES],
+        list(REFERENCE_TYPES.values()),
+        None,
+    )
+    file_paths = chunk["File"].to_numpy(dtype=object)
+
+    return pd.DataFrame({
+        "language": "Python",
+        "module_name": chunk["Module"].fillna("").to_numpy(dtype=object),
+        "file_defined": np.where(reference_types == "Function Definition", file_paths, ""),
+        "file_used": np.where((reference_types == "Function Call") | (reference_types == "Import"), file_paths, ""),
+        "reference_type": reference_types,
+    })
+
+
+def process_language_patterns(parsed_csv_path, output_file=LANGUAGE_PATTERNS_CSV, chunk_rows=DEFAULT_CHUNK_ROWS):
     """Processes the parsed CSV to create a structured dataset for language patterns."""
-    
-    df = pd.read_csv(parsed_csv_path)
-    language_patterns = []
-
-    for _, row in df.iterrows():
-        record_type = row["Type"]
-        module_name = row["Module"] if pd.notna(row["Module"]) else ""
-        function_name = row["Function"] if pd.notna(row["Function"]) else ""
-        file_path = row["File"]
-
-        reference_type = None
-
-        if record_type == "Import":
-            reference_type = "Import"
-        elif record_type == "Definition":
-            reference_type = "Function Definition"
-        elif record_type == "Call":
-            reference_type = "Function Call"
-
-        # Append processed data
-        language_patterns.append([
-            "Python",
-            module_name,
-            file_path if reference_type == "Function Definition" else "",
-            file_path if reference_type in ["Function Call", "Import"] else "",
-            reference_type
-        ])
 
-    # Convert to DataFrame
-    df_patterns = pd.DataFrame(language_patterns, columns=[
-        "language", "module_name", "file_defined", "file_used", "reference_type"
-    ])
+    header = True
+    for chunk in _read_parsed_csv(parsed_csv_path, ["Type", "Module", "File"], chunk_rows):
+        # Save to CSV, appending chunk by chunk after the header
+        _language_pattern_frame(chunk).to_csv(output_file, index=False, header=header, mode="w" if header else "a")
+        header = False
 
-    # Save to CSV
-    df_patterns.to_csv(LANGUAGE_PATTERNS_CSV, index=False)
-    print(f"✅ Saved language patterns dataset: {LANGUAGE_PATTERNS_CSV}")
+    if header:  # No rows: still write the header
+        pd.DataFrame(columns=["language", "module_name", "file_defined", "file_used", "reference_type"]).to_csv(output_file, index=False)
+    print(f"✅ Saved language patterns dataset: {output_file}")
 
 # Example Usage
 if __name__ == "__main__":
     parsed_csv_path = "backend/raw/github_Python_030425_repoai_extract.csv"  # Change to actual parsed file
-    
+    os.makedirs(os.path.dirname(LANGUAGE_PATTERNS_CSV), exist_ok=True)
+
     # Generate Import Rules
     classify_import_patterns(parsed_csv_path)
 
@@ -0,0 +1,114 @@
+from array import array
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Label of each record type, as written to CSV and stored in DuckDB (see `extract_sink.RECORD_TYPES`)
+RECORD_TYPE_LABELS = ("Import", "Definition", "Call", "Class Definition", "Class Call")
+
+
+class RecordType(IntEnum):
+    IMPORT = 0
+    DEFINITION = 1
+    CALL = 2
+    CLASS_DEFINITION = 3
+    CLASS_CALL = 4
+
+    @property
+    def label(self) -> str:
+        return RECORD_TYPE_LABELS[self]
+
+
+class StringTable:
+    """Interns strings to integer codes; code 0 is the empty string (None is stored as "")."""
+
+    __slots__ = ("strings", "_codes")
+
+    def __init__(self):
+        self.strings: List[str] = [""]
+        self._codes: Dict[str, int] = {"": 0}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def code(self, value: Optional[str]) -> int:
+        if not value:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+
+class RecordBatch:
+    """Columnar batch of extract records: an enum-coded type plus interned string fields.
+
+    A record costs one byte for its type and four bytes per field, instead of a dict per
+    record; repeated values (file paths, module names) are stored once in a `StringTable`,
+    which several batches can share. `rows()` / `dicts()` adapt it to the CSV schema.
+    """
+
+    __slots__ = ("fields", "strings", "types", "_columns")
+
+    def __init__(self, fields: Sequence[str], strings: Optional[StringTable] = None):
+        self.fields = tuple(fields)
+        self.strings = strings if strings is not None else StringTable()
+        self.types = array("B")
+        self._columns = tuple(array("I") for _ in self.fields)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def append(self, record_type: RecordType, *values: Optional[str]):
+        """Appends one record; `values` follow `fields`."""
+        self.types.append(record_type)
+        code = self.strings.code
+        for column, value in zip(self._columns, values):
+            column.append(code(value))
+
+    def extend(self, other: "RecordBatch"):
+        """Appends every record of `other` (which must share this batch's fields)."""
+        if other.strings is self.strings:
+            self.types.extend(other.types)
+            for column, other_column in zip(self._columns, other._columns):
+                column.extend(other_column)
+            return
+        for row in other.coded_rows():
+            self.append(*row)
+
+    def clear(self):
+        del self.types[:]
+        for column in self._columns:
+            del column[:]
+
+    def coded_rows(self) -> Iterator[Tuple]:
+        """Yields `(RecordType, *values)` per record."""
+        strings = self.strings.strings
+        for record_type, *codes in zip(self.types, *self._columns):
+            yield (RecordType(record_type), *(strings[code] for code in codes))
+
+    # ============================
+    # 📌 Schema Adapters
+    # ============================
+    def rows(self) -> Iterator[List[str]]:
+        """Yields `[type label, *values]` per record, i.e. the CSV rows (None written as "")."""
+        strings = self.strings.strings
+        for record_type, *codes in zip(self.types, *self._columns):
+            yield [RECORD_TYPE_LABELS[record_type], *(strings[code] for code in codes)]
+
+    def dicts(self, type_field: str = "type") -> Iterator[Dict[str, str]]:
+        """Yields the records as `{type_field: label, field: value}` dicts, as `csv.DictWriter` rows."""
+        keys = (type_field, *self.fields)
+        for row in self.rows():
+            yield dict(zip(keys, row))
+
+    def column(self, field: str, none_for_empty: bool = False) -> List[Optional[str]]:
+        """Decoded values of one field (empty strings as None with `none_for_empty`)."""
+        strings = self.strings.strings
+        codes = self._columns[self.fields.index(field)]
+        if none_for_empty:
+            return [strings[code] if code else None for code in codes]
+        return [strings[code] for code in codes]
+
+    def type_labels(self) -> List[str]:
+        return [RECORD_TYPE_LABELS[record_type] for record_type in self.types]
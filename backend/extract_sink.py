@@ -0,0 +1,177 @@
+import os
+import uuid
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import duckdb
+import pandas as pd
+from extract_records import RECORD_TYPE_LABELS, RecordBatch
+
+try:
+    import pyarrow as pa
+except ImportError:  # Optional: batches go through a typed DataFrame instead
+    pa = None
+
+# Default database location, next to the other DuckDB files in `backend/db`
+DEFAULT_DB_PATH = os.environ.get(
+    "EXTRACT_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "db", "repo_extracts.duckdb")
+)
+DEFAULT_BATCH_ROWS = 50_000
+
+RECORD_TYPES = RECORD_TYPE_LABELS
+PATTERN_TYPES = ("Call", "Definition", "Class Definition", "Class Call")
+RECORD_FIELDS = ("type", "module", "function", "file_defined", "file_used")
+
+SCHEMA = f"""
+CREATE SCHEMA IF NOT EXISTS ingestion;
+
+CREATE TABLE IF NOT EXISTS ingestion.extract_runs (
+    run_id VARCHAR PRIMARY KEY,
+    repo_name VARCHAR NOT NULL,
+    source VARCHAR,
+    started_at TIMESTAMP NOT NULL,
+    row_count BIGINT
+);
+
+CREATE TABLE IF NOT EXISTS ingestion.repo_extract (
+    run_id VARCHAR NOT NULL,
+    seq BIGINT NOT NULL,  -- Extraction order within the run
+    type ENUM({", ".join(f"'{record_type}'" for record_type in RECORD_TYPES)}) NOT NULL,
+    module VARCHAR,
+    function VARCHAR,
+    file_defined VARCHAR,
+    file_used VARCHAR
+);
+"""
+
+# Rows kept as language patterns downstream, in extraction order
+LANGUAGE_PATTERNS_QUERY = f"""
+    SELECT type, module, function, file_defined, file_used
+    FROM ingestion.repo_extract
+    WHERE run_id = ? AND type IN ({", ".join(f"'{record_type}'" for record_type in PATTERN_TYPES)})
+    ORDER BY seq
+"""
+
+if pa is not None:
+    ARROW_SCHEMA = pa.schema([
+        ("run_id", pa.string()),
+        ("seq", pa.int64()),
+        ("type", pa.string()),  # Cast to the ENUM on insert
+        *[(name, pa.string()) for name in RECORD_FIELDS[1:]],
+    ])
+
+
+class DuckDBExtractSink:
+    """Appends `GitHubRepoParser` records to `ingestion.repo_extract` in columnar batches.
+
+    Records are buffered as columns and inserted every `batch_rows` rows as an Arrow
+    record batch (or a typed DataFrame when pyarrow is not installed), so nothing is
+    serialized to text in between. Empty strings are stored as NULL. Each run gets a
+    `run_id`; use it to query the run, e.g. with `language_patterns()`.
+    """
+
+    def __init__(self, repo_name: str, source: Optional[str] = None, path: str = DEFAULT_DB_PATH,
+                 batch_rows: int = DEFAULT_BATCH_ROWS, conn: Optional[duckdb.DuckDBPyConnection] = None):
+        self.path = path
+        self.batch_rows = batch_rows
+        self._owns_conn = conn is None  # Connections passed in are left open for the caller
+        if conn is None:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = duckdb.connect(path)
+        self.conn = conn
+        self.conn.execute(SCHEMA)
+
+        self.repo_name = repo_name
+        self.run_id = uuid.uuid4().hex
+        self.row_count = 0
+        self._columns = self._empty_columns()
+        self._lock = threading.Lock()
+        self.conn.execute(
+            "INSERT INTO ingestion.extract_runs VALUES (?, ?, ?, ?, NULL)",
+            [self.run_id, repo_name, source, datetime.now()],
+        )
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, List]:
+        return {name: [] for name in ("seq", *RECORD_FIELDS)}
+
+    def append(self, records: Iterable[Dict]):
+        """Buffers records (dicts with `RECORD_FIELDS` keys), flushing full batches."""
+        with self._lock:
+            columns = self._columns
+            seq = columns["seq"]
+            for record in records:
+                seq.append(self.row_count + len(seq))
+                for name in RECORD_FIELDS:
+                    columns[name].append(record.get(name) or None)
+            if len(seq) >= self.batch_rows:
+                self._flush()
+
+    def append_batch(self, batch: RecordBatch):
+        """Buffers an `extract_records.RecordBatch` with `RECORD_FIELDS[1:]` fields, flushing full batches."""
+        with self._lock:
+            columns = self._columns
+            start = self.row_count + len(columns["seq"])
+            columns["seq"].extend(range(start, start + len(batch)))
+            columns["type"].extend(batch.type_labels())
+            for name in RECORD_FIELDS[1:]:
+                columns[name].extend(batch.column(name, none_for_empty=True))
+            if len(columns["seq"]) >= self.batch_rows:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        rows = len(self._columns["seq"])
+        if not rows:
+            return
+
+        columns = {"run_id": [self.run_id] * rows, **self._columns}
+        if pa is not None:
+            batch = pa.Table.from_batches([pa.RecordBatch.from_pydict(columns, schema=ARROW_SCHEMA)])
+        else:
+            batch = pd.DataFrame(columns).astype({"seq": "int64"})
+        self.conn.register("extract_batch", batch)
+        try:
+            self.conn.execute("INSERT INTO ingestion.repo_extract SELECT * FROM extract_batch")
+        finally:
+            self.conn.unregister("extract_batch")
+
+        self.row_count += rows
+        self._columns = self._empty_columns()
+
+    def close(self):
+        """Flushes the last batch, records the run's row count and closes the sink's own connection."""
+        if self.conn is None:
+            return
+        self.flush()
+        self.conn.execute("UPDATE ingestion.extract_runs SET row_count = ? WHERE run_id = ?", [self.row_count, self.run_id])
+        logging.info(f"🗄️ Stored {self.row_count} extract rows for {self.repo_name} (run {self.run_id}) in {self.path}")
+        if self._owns_conn:
+            self.conn.close()
+        self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ============================
+    # 📌 Downstream Queries
+    # ============================
+    def language_patterns(self) -> duckdb.DuckDBPyRelation:
+        """Calls, definitions, class definitions and class calls of this run, in extraction order."""
+        return self.conn.sql(LANGUAGE_PATTERNS_QUERY, params=[self.run_id])
+
+    def export_language_patterns(self, output_file: str) -> str:
+        """Writes `language_patterns()` to a CSV file straight from DuckDB."""
+        if os.path.dirname(output_file):
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        self.language_patterns().write_csv(output_file)
+        return output_file
@@ -0,0 +1,200 @@
+import os
+import logging
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import duckdb
+
+# The DuckDB file `db/prod/config_proddb.py` sets up (its DB_PATH is a developer's local path)
+FORMATS_DB_PATH = os.environ.get(
+    "FILE_FORMATS_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "db", "database.duckdb")
+)
+FORMATS_TABLE = os.environ.get("FILE_FORMATS_TABLE", "prod.file_formats")
+UNKNOWN_CATEGORY = "Unknown"  # Formats stored without a category
+SKIPPED_DIRS = frozenset({".git"})
+UNCLASSIFIED = -1
+
+
+def _suffix_key(extension: str) -> str:
+    """".TAR.GZ" / "tar.gz" → "tar.gz"."""
+    return extension.strip().lstrip(".").lower()
+
+
+def _file_tail(name: str) -> str:
+    """Everything after the stem: "a.tar.gz" → "tar.gz", ".eslintrc.json" → "eslintrc.json", "Makefile" → ""."""
+    name = name.lower()
+    if name.startswith("."):
+        return name[1:]
+    return name.partition(".")[2]
+
+
+class ExtensionIndex:
+    """In-memory index of the file format table: one dict from lower-cased suffix to row.
+
+    Rows are kept column-wise (categories interned), and names are matched on their
+    longest known suffix, so `archive.tar.gz` is a `.TAR.GZ` file when that format is
+    listed and a `.GZ` file otherwise. Dotfiles match on their full name (`.gitignore`).
+    """
+
+    __slots__ = ("extensions", "descriptions", "popularity", "category_names", "category_codes", "max_parts", "_codes")
+
+    def __init__(self, rows: Iterable[Tuple[str, Optional[str], Optional[str], Optional[float]]] = ()):
+        """`rows` are `(extension, description, category, popularity)`; the first row of a suffix wins."""
+        self.extensions: List[str] = []
+        self.descriptions: List[str] = []
+        self.popularity = array("d")
+        self.category_names: List[str] = []
+        self.category_codes = array("H")
+        self.max_parts = 1
+        self._codes: Dict[str, int] = {}
+
+        category_code: Dict[str, int] = {}
+        for extension, description, category, popularity in rows:
+            key = _suffix_key(extension or "")
+            if not key or key in self._codes:
+                continue
+            category = (category or "").strip() or UNKNOWN_CATEGORY
+            if category not in category_code:
+                category_code[category] = len(self.category_names)
+                self.category_names.append(category)
+
+            self._codes[key] = len(self.extensions)
+            self.extensions.append("." + key.upper())
+            self.descriptions.append(description or "")
+            self.popularity.append(float("nan") if popularity is None else popularity)
+            self.category_codes.append(category_code[category])
+            self.max_parts = max(self.max_parts, key.count(".") + 1)
+
+    def __len__(self) -> int:
+        return len(self.extensions)
+
+    def _lookup_tail(self, tail: str) -> int:
+        if not tail:
+            return UNCLASSIFIED
+        parts = tail.split(".")
+        codes = self._codes
+        for start in range(max(0, len(parts) - self.max_parts), len(parts)):
+            code = codes.get(".".join(parts[start:]))
+            if code is not None:
+                return code
+        return UNCLASSIFIED
+
+    def lookup(self, file_name: str) -> int:
+        """Row of the longest listed suffix of `file_name`, or `UNCLASSIFIED`."""
+        return self._lookup_tail(_file_tail(os.path.basename(file_name)))
+
+    def classify(self, paths: Sequence[str]) -> "Classification":
+        """Classifies `paths` (relative, "/"-separated); each distinct suffix is looked up once."""
+        codes = array("i")
+        append = codes.append
+        memo: Dict[str, int] = {}
+        lookup_tail = self._lookup_tail
+        for path in paths:
+            name = path[path.rfind("/") + 1:].lower()
+            tail = name[1:] if name[:1] == "." else name.partition(".")[2]
+            code = memo.get(tail)
+            if code is None:
+                code = memo[tail] = lookup_tail(tail)
+            append(code)
+        return Classification(self, paths, codes)
+
+    def category_of(self, code: int) -> Optional[str]:
+        return None if code == UNCLASSIFIED else self.category_names[self.category_codes[code]]
+
+
+class Classification:
+    """Per-file rows of an `ExtensionIndex` (`codes`, aligned with `paths`) and their aggregates."""
+
+    def __init__(self, index: ExtensionIndex, paths: Sequence[str], codes: array):
+        self.index = index
+        self.paths = paths
+        self.codes = codes
+
+    def summary(self) -> Dict:
+        """File counts per category and per extension, plus the unlisted extensions."""
+        index = self.index
+        per_code = Counter(self.codes)
+        unclassified = per_code.pop(UNCLASSIFIED, 0)
+
+        categories = Counter()
+        for code, count in per_code.items():
+            categories[index.category_of(code)] += count
+        extensions = sorted(per_code.items(), key=lambda item: (-item[1], index.extensions[item[0]]))
+
+        unknown = Counter()
+        if unclassified:
+            for path, code in zip(self.paths, self.codes):
+                if code == UNCLASSIFIED:
+                    name = path[path.rfind("/") + 1:]
+                    suffix = name.rpartition(".")[2].lower() if "." in name.lstrip(".") else ""
+                    unknown["." + suffix if suffix else ""] += 1
+
+        return {
+            "file_count": len(self.codes),
+            "classified": len(self.codes) - unclassified,
+            "unclassified": unclassified,
+            "categories": [
+                {"category": category, "files": count}
+                for category, count in sorted(categories.items(), key=lambda item: (-item[1], item[0]))
+            ],
+            "extensions": [
+                {"extension": index.extensions[code], "category": index.category_of(code), "files": count}
+                for code, count in extensions
+            ],
+            "unknown_extensions": [
+                {"extension": suffix, "files": count}
+                for suffix, count in sorted(unknown.items(), key=lambda item: (-item[1], item[0]))
+            ],
+        }
+
+    def files(self, category: Optional[str] = None) -> List[Dict]:
+        """One `{path, extension, category}` item per file (only `category`'s files when given)."""
+        index = self.index
+        # Each row's item fields are built once and shared by all of its files
+        row_fields = [(index.extensions[code], index.category_of(code)) for code in range(len(index))]
+        row_fields.append(("", None))  # UNCLASSIFIED (-1)
+        return [
+            {"path": path, "extension": row_fields[code][0], "category": row_fields[code][1]}
+            for path, code in zip(self.paths, self.codes)
+            if category is None or row_fields[code][1] == category
+        ]
+
+
+def load_index(db_path: str = FORMATS_DB_PATH, table: str = FORMATS_TABLE) -> ExtensionIndex:
+    """Reads the file format table once into an `ExtensionIndex` (empty if it can't be read)."""
+    try:
+        con = duckdb.connect(db_path, read_only=True)
+        try:
+            rows = con.execute(
+                f"SELECT extension, description, category, popularity FROM {table} "
+                "ORDER BY popularity DESC NULLS LAST, extension"
+            ).fetchall()
+        finally:
+            con.close()
+    except duckdb.Error as e:
+        logging.warning(f"⚠️ Could not load file formats from {table} in {db_path}: {e}")
+        rows = []
+
+    index = ExtensionIndex(rows)
+    logging.info(f"📇 Indexed {len(index)} file formats from {table} ({len(index.category_names)} categories)")
+    return index
+
+
+def iter_repo_files(repo_path: str, skipped_dirs: Iterable[str] = SKIPPED_DIRS) -> Iterator[str]:
+    """Yields the "/"-separated path of every file under `repo_path`, relative to it (`.git` skipped)."""
+    skipped = frozenset(skipped_dirs)
+    pending = [("", repo_path)]
+    while pending:
+        prefix, directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skipped:
+                        pending.append((prefix + entry.name + "/", entry.path))
+                else:
+                    yield prefix + entry.name
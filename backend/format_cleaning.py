@@ -0,0 +1,218 @@
+import os
+import re
+import csv
+import logging
+import unicodedata
+from collections import Counter
+from operator import itemgetter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from streaming_csv import StreamingCSVWriter
+
+# Regex pattern: Initial period, 1-15 uppercase letters or digits (.C, .MP3, .7Z, .3GP), no spaces
+VALID_EXTENSION_REGEX = r"^\.[A-Z0-9]{1,15}$"
+VALID_EXTENSION = re.compile(VALID_EXTENSION_REGEX)
+
+# En dashes left in place, their mojibake and double spaces all point at cleaning issues
+UNEXPECTED_SEQUENCES = ("–", "â€“", "  ")
+UNEXPECTED = re.compile("|".join(map(re.escape, UNEXPECTED_SEQUENCES)))
+
+REQUIRED_FIELDS = ("category", "extension", "description")
+TRIMMED_FIELDS = ("description", "category", "popularity")
+OUTPUT_FIELDS = ("extension", "description", "category", "popularity")
+ISSUE_FIELDS = ("row", "column", "issue", "value")
+WRITE_BATCH = 10_000  # Entries processed between hand-offs of the buffered rows to the writers
+EXAMPLES_PER_ISSUE = 5  # Issues of each kind kept on the report (and logged)
+
+# Issue kinds
+INVALID_EXTENSION = "invalid_extension"
+UNEXPECTED_CHARACTER = "unexpected_character"
+MISSING_VALUE = "missing_value"
+DUPLICATE_EXTENSION = "duplicate_extension"
+MISSING_DESCRIPTION = "missing_description"
+
+
+# An issue is a `(row, column, issue kind, value)` tuple (`ISSUE_FIELDS`); rows are 0-based input positions
+Issue = Tuple[int, str, str, str]
+_issue_kind = itemgetter(2)
+
+
+@dataclass
+class CleaningReport:
+    rows: int = 0
+    clean: int = 0
+    dirty: int = 0
+    issue_counts: Counter = field(default_factory=Counter)
+    examples: Dict[str, List[Issue]] = field(default_factory=dict)
+
+    def add(self, issues: Sequence[Issue]):
+        """Counts a batch of issues, keeping the first `EXAMPLES_PER_ISSUE` of each kind."""
+        counts = Counter(map(_issue_kind, issues))
+        self.issue_counts.update(counts)
+        wanted = {kind for kind in counts if len(self.examples.get(kind, ())) < EXAMPLES_PER_ISSUE}
+        for issue in issues if wanted else ():
+            examples = self.examples.setdefault(issue[2], [])
+            if issue[2] in wanted and len(examples) < EXAMPLES_PER_ISSUE:
+                examples.append(issue)
+                if len(examples) == EXAMPLES_PER_ISSUE:
+                    wanted.discard(issue[2])
+                    if not wanted:
+                        break
+
+    def log(self):
+        logging.info(f"🧹 Cleaned {self.rows} entries: {self.clean} clean, {self.dirty} dirty")
+        if not self.issue_counts:
+            logging.info("No data quality issues found.")
+        for kind, count in self.issue_counts.most_common():
+            logging.warning(f"Found {count} {kind.replace('_', ' ')} issues.")
+            for row, column, _, value in self.examples[kind]:
+                logging.warning(f"Row {row} | Column: {column} | Value: {value}")
+
+
+class FormatCleaner:
+    """Normalizes, validates and quality-checks file format entries in a single pass.
+
+    Each entry is cleaned in place: the extension is NFKD-normalized, anything after an en
+    dash (or ", ") is moved to the description, fields are trimmed, and the extension is
+    upper-cased with a leading period. Extensions that don't match `VALID_EXTENSION` make
+    the entry dirty. Every entry is checked for unexpected characters and missing
+    `required_fields`; clean entries also for duplicate extensions and missing descriptions.
+    Only the first row of each extension is remembered, so memory does not grow with the
+    number of rows.
+    Issues are counted on `report` in batches by `clean_all` / `clean_to_files` (callers of
+    `clean_entry` / `process` pass theirs to `report.add`).
+    """
+
+    def __init__(self, required_fields: Sequence[str] = REQUIRED_FIELDS):
+        self.required_fields = tuple(required_fields)
+        self.report = CleaningReport()
+        self._first_rows: Dict[str, int] = {}
+
+    def clean_entry(self, entry: Dict) -> Tuple[bool, List[Issue]]:
+        """Cleans `entry` in place; returns whether it is clean and the issues it has."""
+        report = self.report
+        row = report.rows
+        report.rows += 1
+
+        extension = entry.get("extension")
+        if not isinstance(extension, str):
+            report.dirty += 1
+            issues = [(row, "extension", MISSING_VALUE, "")]
+            return False, self._check_fields(row, entry, ("description",), issues, reported=("extension",))
+
+        # Normalize encoding to avoid unexpected characters (a no-op for ASCII)
+        if not extension.isascii():
+            extension = unicodedata.normalize("NFKD", extension)
+
+        # Replace en dash (U+2013) with a comma + space, then keep the first part as the extension
+        # and move the rest to the description ("ABC – Another Format" → "ABC" + description)
+        head, separator, tail = extension.strip().replace("–", ", ").partition(", ")
+        if separator:
+            entry["description"] = tail.strip() + " " + (entry.get("description") or "").strip()
+
+        # Trim all fields
+        for name in TRIMMED_FIELDS:
+            value = entry.get(name)
+            entry[name] = value.strip() if value else ""
+
+        # Convert to uppercase and prepend a period if missing
+        extension = head.strip().upper()
+        if extension[:1] != ".":
+            extension = "." + extension
+
+        if not VALID_EXTENSION.match(extension):
+            report.dirty += 1
+            # The dirty row keeps its extension as read, so it is searched along with the description
+            issues = [(row, "extension", INVALID_EXTENSION, extension)]
+            return False, self._check_fields(row, entry, ("extension", "description"), issues)
+
+        entry["extension"] = extension
+        report.clean += 1
+        issues = []
+        if not entry["description"]:
+            issues.append((row, "extension", MISSING_DESCRIPTION, extension))
+        # A valid extension has no room for unexpected sequences: only the description is searched
+        self._check_fields(row, entry, ("description",), issues)
+        first_row = self._first_rows.setdefault(extension, row)
+        if first_row != row:
+            issues.append((row, "extension", DUPLICATE_EXTENSION, f"{extension} (first in row {first_row})"))
+        return True, issues
+
+    def _check_fields(self, row: int, entry: Dict, searched: Sequence[str], issues: List[Issue],
+                      reported: Sequence[str] = ()) -> List[Issue]:
+        """Appends the unexpected sequences in the `searched` columns and the missing required
+        fields (other than those `reported` already) to `issues`; returns `issues`."""
+        for name in searched:
+            value = entry.get(name)
+            if value and UNEXPECTED.search(value):
+                issues.append((row, name, UNEXPECTED_CHARACTER, value))
+        for name in self.required_fields:
+            if not entry.get(name) and name not in reported:
+                issues.append((row, name, MISSING_VALUE, ""))
+        return issues
+
+    def process(self, entries: Iterable[Dict]) -> Iterator[Tuple[bool, Dict, List[Issue]]]:
+        """Yields `(is_clean, entry, issues)` per entry, cleaning them as they stream by."""
+        clean_entry = self.clean_entry
+        for entry in entries:
+            is_clean, issues = clean_entry(entry)
+            yield is_clean, entry, issues
+
+    def clean_all(self, entries: Iterable[Dict]) -> Tuple[List[Dict], List[Dict], List[Issue]]:
+        """Returns the clean entries, the dirty entries and every issue."""
+        clean, dirty, all_issues = [], [], []
+        for is_clean, entry, issues in self.process(entries):
+            (clean if is_clean else dirty).append(entry)
+            all_issues.extend(issues)
+        self.report.add(all_issues)
+        return clean, dirty, all_issues
+
+    def clean_to_files(self, entries: Iterable[Dict], clean_path: str, dirty_path: str, issues_path: str,
+                       fieldnames: Sequence[str] = OUTPUT_FIELDS) -> CleaningReport:
+        """
+        Streams the clean entries, the dirty entries and the issue report to three CSV files
+        (columns `fieldnames` for the entries, `ISSUE_FIELDS` for the report). Each file is
+        written next to its path and moved into place only once every entry was processed.
+        """
+        for path in (clean_path, dirty_path, issues_path):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fieldnames = tuple(fieldnames)
+
+        values = itemgetter(*fieldnames) if len(fieldnames) > 1 else lambda entry: (entry[fieldnames[0]],)
+
+        with StreamingCSVWriter(clean_path, fieldnames) as clean_writer, \
+                StreamingCSVWriter(dirty_path, fieldnames) as dirty_writer, \
+                StreamingCSVWriter(issues_path, ISSUE_FIELDS) as issues_writer:
+            outputs = ([], [])  # Dirty rows, clean rows
+            all_issues = []
+            clean_entry = self.clean_entry
+            for count, entry in enumerate(entries, 1):
+                is_clean, issues = clean_entry(entry)
+                try:
+                    outputs[is_clean].append(values(entry))
+                except KeyError:  # Entries without some of the columns (not read from a CSV)
+                    outputs[is_clean].append([entry.get(name, "") for name in fieldnames])
+                if issues:
+                    all_issues.extend(issues)
+                if count % WRITE_BATCH == 0:
+                    self._write_batch(outputs, all_issues, clean_writer, dirty_writer, issues_writer)
+            self._write_batch(outputs, all_issues, clean_writer, dirty_writer, issues_writer)
+        return self.report
+
+    def _write_batch(self, outputs, issues, clean_writer, dirty_writer, issues_writer):
+        dirty, clean = outputs
+        self.report.add(issues)
+        clean_writer.writerows(clean)
+        dirty_writer.writerows(dirty)
+        issues_writer.writerows(issues)
+        clean.clear()
+        dirty.clear()
+        issues.clear()
+
+
+def iter_csv_entries(*file_paths: str) -> Iterator[Dict]:
+    """Yields the rows of one or more CSV files (e.g. several merged sources) as dicts, one at a time."""
+    for file_path in file_paths:
+        with open(file_path, mode="r", encoding="utf-8", errors="replace", newline="") as file:
+            yield from csv.DictReader(file)
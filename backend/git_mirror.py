@@ -0,0 +1,93 @@
+import os
+import stat
+import shutil
+import hashlib
+import logging
+import subprocess
+from typing import List, Optional
+
+# Persistent bare mirrors, one per remote URL (relative to the working directory, like `cloned_repos`)
+MIRROR_DIR = os.environ.get("GIT_MIRROR_DIR", os.path.join(".cache", "mirrors"))
+
+# How working trees are materialized from a mirror
+DEFAULT_DEPTH = int(os.environ.get("GIT_CHECKOUT_DEPTH", 1))  # 0 means full history
+DEFAULT_FILTER = os.environ.get("GIT_CHECKOUT_FILTER", "blob:none")  # "" disables partial clone
+
+
+def run_git(args: List[str], cwd: Optional[str] = None) -> str:
+    """Runs a git command and returns its stdout. Raises `subprocess.CalledProcessError` on failure."""
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def mirror_path(repo_url: str) -> str:
+    """Returns the mirror directory for a remote: `<name>-<url hash>.git` under `MIRROR_DIR`."""
+    name = repo_url.rstrip("/").split("/")[-1].replace(".git", "") or "repo"
+    digest = hashlib.sha1(repo_url.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(MIRROR_DIR, f"{name}-{digest}.git")
+
+
+def update_mirror(repo_url: str) -> str:
+    """Creates the bare mirror of `repo_url` on first use, otherwise fetches only new objects.
+
+    Returns the mirror path.
+    """
+    path = mirror_path(repo_url)
+    if os.path.isdir(path):
+        logging.info(f"🔄 Updating mirror {path}")
+        run_git(["fetch", "--prune", "--quiet", "origin"], cwd=path)
+    else:
+        logging.info(f"📥 Creating mirror of {repo_url} at {path}")
+        os.makedirs(MIRROR_DIR, exist_ok=True)
+        run_git(["clone", "--mirror", "--quiet", repo_url, path])
+        # Let working-tree clones from this mirror request partial (filtered) packs
+        run_git(["config", "uploadpack.allowFilter", "true"], cwd=path)
+    return path
+
+
+def _mirror_url(path: str) -> str:
+    # Shallow and filtered clones are only honored over a transport, so use file:// rather than a plain path
+    return "file://" + os.path.abspath(path).replace(os.sep, "/")
+
+
+def _is_checkout_of(repo_path: str, source_url: str) -> bool:
+    if not os.path.isdir(os.path.join(repo_path, ".git")):
+        return False
+    try:
+        return run_git(["remote", "get-url", "origin"], cwd=repo_path) == source_url
+    except subprocess.CalledProcessError:
+        return False
+
+
+def _remove_tree(path: str):
+    def remove_readonly(func, target, exc_info):
+        os.chmod(target, stat.S_IWRITE)  # Read-only files (e.g. git objects on Windows)
+        func(target)
+
+    shutil.rmtree(path, onerror=remove_readonly)
+
+
+def checkout(repo_url: str, repo_path: str, depth: int = DEFAULT_DEPTH, filter_spec: str = DEFAULT_FILTER) -> str:
+    """Brings `repo_path` to the latest default-branch commit of `repo_url` and returns its SHA.
+
+    The remote is only contacted to update the persistent mirror. An existing checkout of
+    the same mirror is updated in place (`fetch` + `reset --hard` + `clean`); anything
+    else at `repo_path` is replaced by a fresh clone from the mirror using `--depth`
+    and `--filter` to keep it small.
+    """
+    source_url = _mirror_url(update_mirror(repo_url))
+    depth_args = [f"--depth={depth}"] if depth else []
+
+    if _is_checkout_of(repo_path, source_url):
+        logging.info(f"🔄 Updating checkout {repo_path} from mirror")
+        run_git(["fetch", "--quiet", *depth_args, "origin", "HEAD"], cwd=repo_path)
+        run_git(["reset", "--quiet", "--hard", "FETCH_HEAD"], cwd=repo_path)
+        run_git(["clean", "-ffdxq"], cwd=repo_path)
+    else:
+        if os.path.exists(repo_path):
+            _remove_tree(repo_path)
+        logging.info(f"📦 Materializing {repo_path} from mirror")
+        filter_args = [f"--filter={filter_spec}"] if filter_spec else []
+        run_git(["clone", "--quiet", "--no-tags", *depth_args, *filter_args, source_url, repo_path])
+
+    return run_git(["rev-parse", "HEAD"], cwd=repo_path)
@@ -0,0 +1,320 @@
+import os
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components
+except ImportError:  # Optional: SCCs fall back to an iterative Tarjan over the same CSR arrays
+    csr_matrix = connected_components = None
+
+# Default database location, next to the other DuckDB files in `backend/db`
+DEFAULT_DB_PATH = os.environ.get(
+    "GRAPH_ANALYTICS_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "db", "graph_analytics.duckdb")
+)
+
+SCHEMA = """
+CREATE SCHEMA IF NOT EXISTS analytics;
+
+CREATE TABLE IF NOT EXISTS analytics.runs (
+    repo_name VARCHAR PRIMARY KEY,
+    computed_at TIMESTAMP NOT NULL,
+    node_count BIGINT NOT NULL,
+    edge_count BIGINT NOT NULL,
+    component_count BIGINT NOT NULL,
+    cycle_count BIGINT NOT NULL,
+    layer_count BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS analytics.nodes (
+    repo_name VARCHAR NOT NULL,
+    path VARCHAR NOT NULL,
+    component BIGINT NOT NULL,  -- Strongly connected component; shared by every file of an import cycle
+    component_size BIGINT NOT NULL,
+    layer BIGINT NOT NULL,  -- Build layer: 0 has no dependencies, layer k only depends on layers < k
+    fan_in BIGINT NOT NULL,  -- Files depending on this one
+    fan_out BIGINT NOT NULL,  -- Files this one depends on
+    fan_in_centrality DOUBLE NOT NULL,
+    fan_out_centrality DOUBLE NOT NULL
+);
+"""
+_MIN_VECTOR_FRONTIER = 512  # Smaller Kahn frontiers are processed without numpy
+
+NODE_COLUMNS = [
+    "path", "component", "component_size", "layer", "fan_in", "fan_out", "fan_in_centrality", "fan_out_centrality",
+]
+
+
+# ============================
+# 📌 Compact Graph
+# ============================
+@dataclass
+class CSRGraph:
+    """Directed graph as CSR arrays: the successors of node `i` are `indices[indptr[i]:indptr[i + 1]]`.
+
+    Node labels are factorized to `0..n-1` once; self-loops and duplicate edges are dropped.
+    """
+    labels: np.ndarray  # Node label (file path) per node id
+    indptr: np.ndarray
+    indices: np.ndarray
+
+    @property
+    def node_count(self) -> int:
+        return len(self.labels)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    @classmethod
+    def from_edges(cls, sources, targets) -> "CSRGraph":
+        """Builds the graph of edges `sources[i] -> targets[i]` (any hashable labels)."""
+        codes, labels = pd.factorize(pd.concat([pd.Series(sources), pd.Series(targets)], ignore_index=True), sort=True)
+        n_nodes, n_edges = len(labels), len(codes) // 2
+        return cls.from_codes(np.asarray(labels, dtype=object), codes[:n_edges], codes[n_edges:], n_nodes)
+
+    @classmethod
+    def from_codes(cls, labels: np.ndarray, sources: np.ndarray, targets: np.ndarray, n_nodes: int) -> "CSRGraph":
+        keep = sources != targets
+        keys = np.unique(sources[keep].astype(np.int64) * n_nodes + targets[keep])  # Sorted by source, then target
+        sources, targets = keys // n_nodes, keys % n_nodes
+        indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n_nodes), out=indptr[1:])
+        return cls(labels, indptr, targets.astype(np.int64))
+
+    def sources(self) -> np.ndarray:
+        """Source node id of every edge, aligned with `indices`."""
+        return np.repeat(np.arange(self.node_count, dtype=np.int64), np.diff(self.indptr))
+
+
+# ============================
+# 📌 Algorithms
+# ============================
+def _tarjan(indptr: np.ndarray, indices: np.ndarray, n_nodes: int) -> Tuple[int, np.ndarray]:
+    """Iterative Tarjan SCC over CSR arrays (no recursion limit); returns `(count, labels)`."""
+    indptr, indices = indptr.tolist(), indices.tolist()
+    index, low, on_stack, labels = [-1] * n_nodes, [0] * n_nodes, [False] * n_nodes, [-1] * n_nodes
+    stack, counter, n_components = [], 0, 0
+
+    for root in range(n_nodes):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr[root])]
+        while work:
+            node, position = work[-1]
+            end = indptr[node + 1]
+            while position < end:
+                successor = indices[position]
+                position += 1
+                if index[successor] == -1:
+                    # Descend; resume `node` at `position` afterwards
+                    work[-1] = (node, position)
+                    index[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, indptr[successor]))
+                    break
+                if on_stack[successor] and index[successor] < low[node]:
+                    low[node] = index[successor]
+            else:
+                work.pop()
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        labels[member] = n_components
+                        if member == node:
+                            break
+                    n_components += 1
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+    return n_components, np.asarray(labels, dtype=np.int64)
+
+
+def strongly_connected_components(graph: CSRGraph) -> Tuple[int, np.ndarray]:
+    """Returns `(component count, component id per node)`; uses scipy when it is installed."""
+    if graph.node_count == 0:
+        return 0, np.zeros(0, dtype=np.int64)
+    if connected_components is not None:
+        matrix = csr_matrix(
+            (np.ones(graph.edge_count, dtype=np.int8), graph.indices, graph.indptr), shape=(graph.node_count,) * 2
+        )
+        n_components, labels = connected_components(matrix, directed=True, connection="strong")
+        return n_components, labels.astype(np.int64)
+    return _tarjan(graph.indptr, graph.indices, graph.node_count)
+
+
+def topological_layers(graph: CSRGraph, labels: np.ndarray, n_components: int) -> np.ndarray:
+    """Layer of every component of the condensation, for edges pointing dependent -> dependency.
+
+    Layer 0 holds the components without dependencies; every other component sits one layer
+    above its deepest dependency (Kahn's algorithm, one vectorized step per wide layer).
+    """
+    # Condensation edges reversed to dependency -> dependent, so a layer releases its dependents
+    condensed = CSRGraph.from_codes(
+        np.arange(n_components), labels[graph.indices], labels[graph.sources()], n_components
+    )
+    remaining = np.bincount(condensed.indices, minlength=n_components)  # Unbuilt dependencies per component
+    layers = np.full(n_components, -1, dtype=np.int64)
+
+    frontier, depth = np.flatnonzero(remaining == 0), 0
+    while frontier.size >= _MIN_VECTOR_FRONTIER:
+        layers[frontier] = depth
+        starts, counts = condensed.indptr[frontier], np.diff(condensed.indptr)[frontier]
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        dependents = condensed.indices[offsets]
+        np.subtract.at(remaining, dependents, 1)
+        frontier = np.unique(dependents[remaining[dependents] == 0])
+        depth += 1
+
+    # Narrow layers (deep chains) cost less as plain list operations than as array calls per layer
+    indptr, indices, remaining, frontier = condensed.indptr.tolist(), condensed.indices.tolist(), remaining.tolist(), frontier.tolist()
+    scalar_layers = {}
+    while frontier:
+        next_frontier = []
+        for component in frontier:
+            scalar_layers[component] = depth
+            for dependent in indices[indptr[component]:indptr[component + 1]]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    next_frontier.append(dependent)
+        frontier, depth = next_frontier, depth + 1
+    if scalar_layers:
+        layers[np.fromiter(scalar_layers.keys(), dtype=np.int64)] = np.fromiter(scalar_layers.values(), dtype=np.int64)
+    return layers
+
+
+def degree_centrality(graph: CSRGraph) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Returns `(fan_in, fan_out, fan_in_centrality, fan_out_centrality)` per node.
+
+    Centralities are degrees normalized by `n - 1`, as in `networkx.in_degree_centrality`.
+    """
+    fan_out = np.diff(graph.indptr)
+    fan_in = np.bincount(graph.indices, minlength=graph.node_count)
+    scale = 1.0 / (graph.node_count - 1) if graph.node_count > 1 else 1.0
+    return fan_in, fan_out, fan_in * scale, fan_out * scale
+
+
+# ============================
+# 📌 Analysis
+# ============================
+@dataclass
+class GraphAnalytics:
+    """Structural metrics of one dependency graph."""
+    nodes: pd.DataFrame  # One row per file with `NODE_COLUMNS`
+    edge_count: int
+    component_count: int
+    layer_count: int
+
+    @property
+    def cycles(self) -> List[List[str]]:
+        """Import cycles (components with more than one file), largest first."""
+        members = self.nodes.loc[self.nodes["component_size"] > 1, ["component", "component_size", "path"]]
+        members = members.sort_values(["component_size", "component", "path"], ascending=[False, True, True])
+        return [group["path"].tolist() for _, group in members.groupby("component", sort=False)]
+
+    def most_depended_on(self, limit: int = 20) -> pd.DataFrame:
+        return self.nodes.nlargest(limit, "fan_in")
+
+
+def analyze(edges: pd.DataFrame, dependent: str = "file_used", dependency: str = "file_defined") -> GraphAnalytics:
+    """Computes SCCs, build layers and fan-in/fan-out of a dependency edge list.
+
+    `edges` is e.g. `_mapping_dependencies.build_dependency_edges()`; each row says that
+    file `edges[dependent]` depends on (imports or calls into) `edges[dependency]`.
+    """
+    graph = CSRGraph.from_edges(edges[dependent], edges[dependency])
+    n_components, labels = strongly_connected_components(graph)
+    layers = topological_layers(graph, labels, n_components)
+    fan_in, fan_out, fan_in_centrality, fan_out_centrality = degree_centrality(graph)
+
+    nodes = pd.DataFrame({
+        "path": graph.labels,
+        "component": labels,
+        "component_size": np.bincount(labels, minlength=n_components)[labels],
+        "layer": layers[labels],
+        "fan_in": fan_in,
+        "fan_out": fan_out,
+        "fan_in_centrality": fan_in_centrality,
+        "fan_out_centrality": fan_out_centrality,
+    }, columns=NODE_COLUMNS)
+    return GraphAnalytics(nodes, graph.edge_count, n_components, int(layers.max()) + 1 if n_components else 0)
+
+
+# ============================
+# 📌 Persistence
+# ============================
+class AnalyticsStore:
+    """Keeps the latest `GraphAnalytics` of each repository in DuckDB (`analytics.runs` / `analytics.nodes`)."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, conn: Optional[duckdb.DuckDBPyConnection] = None):
+        self.path = path
+        if conn is None:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = duckdb.connect(path)
+        self.conn = conn
+        self.write_lock = threading.Lock()
+        self.conn.execute(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def save(self, repo_name: str, result: GraphAnalytics):
+        """Replaces the stored analytics of `repo_name` in one transaction."""
+        with self.write_lock:
+            cursor = self.conn.cursor()
+            cursor.begin()
+            try:
+                cursor.execute("DELETE FROM analytics.nodes WHERE repo_name = ?", [repo_name])
+                cursor.register("node_rows", result.nodes)
+                cursor.execute(
+                    f"INSERT INTO analytics.nodes SELECT ? AS repo_name, {', '.join(NODE_COLUMNS)} FROM node_rows", [repo_name]
+                )
+                cursor.unregister("node_rows")
+                cursor.execute(
+                    "INSERT OR REPLACE INTO analytics.runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [repo_name, datetime.now(), len(result.nodes), result.edge_count, result.component_count,
+                     len(result.cycles), result.layer_count],
+                )
+                cursor.commit()
+            except Exception:
+                cursor.rollback()
+                raise
+        logging.info(f"🗄️ Stored graph analytics of {repo_name} ({len(result.nodes)} files) in {self.path}")
+
+    def get_run(self, repo_name: str) -> Optional[Dict]:
+        cursor = self.conn.cursor().execute("SELECT * FROM analytics.runs WHERE repo_name = ?", [repo_name])
+        columns = [column[0] for column in cursor.description]
+        row = cursor.fetchone()
+        return dict(zip(columns, row)) if row else None
+
+    def load(self, repo_name: str) -> Optional[GraphAnalytics]:
+        run = self.get_run(repo_name)
+        if run is None:
+            return None
+        nodes = self.conn.cursor().execute(
+            f"SELECT {', '.join(NODE_COLUMNS)} FROM analytics.nodes WHERE repo_name = ? ORDER BY path", [repo_name]
+        ).df()
+        return GraphAnalytics(nodes, run["edge_count"], run["component_count"], run["layer_count"])
+
+
+def analyze_and_store(repo_name: str, edges: pd.DataFrame, store: Optional[AnalyticsStore] = None) -> GraphAnalytics:
+    """Runs `analyze()` on `edges` and persists the result under `repo_name`."""
+    result = analyze(edges)
+    (store or AnalyticsStore()).save(repo_name, result)
+    return result
@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+# Cached responses live under `backend/.cache/http` (ignored by git)
+DEFAULT_CACHE_DIR = os.environ.get(
+    "HTTP_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "http")
+)
+DEFAULT_MAX_AGE = 24 * 3600  # Seconds a cached page is reused without revalidating it
+DEFAULT_RATE = 1.0  # Requests per second, on average
+DEFAULT_BURST = 3
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 1.0  # Seconds; doubled after every failed attempt (plus jitter)
+DEFAULT_TIMEOUT = 30.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+# ============================
+# 📌 Rate Limiting
+# ============================
+class TokenBucket:
+    """Async token bucket: on average `rate` acquisitions per second, bursts of up to `capacity`."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: int = DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:  # Waiters are served in order; one sleeps while the rest queue
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# ============================
+# 📌 Disk Cache
+# ============================
+@dataclass
+class CachedResponse:
+    url: str
+    status: int
+    body: bytes
+    encoding: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float  # Last time the origin served or confirmed (304) this body
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+
+class DiskHTTPCache:
+    """Response cache keyed by URL: `<sha256>.json` holds the metadata, `<sha256>.body` the body.
+
+    Files are written to a temporary name and renamed, so an interrupted run never leaves
+    a torn entry and the next run resumes from every page that was already saved.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + suffix)
+
+    def _write(self, path: str, data: bytes):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        try:
+            with open(self._path(url, ".json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(self._path(url, ".body"), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return CachedResponse(url, meta["status"], body, meta.get("encoding"), meta.get("etag"),
+                              meta.get("last_modified"), meta["fetched_at"])
+
+    def put(self, entry: CachedResponse):
+        # Body first: metadata only ever points at a complete body
+        self._write(self._path(entry.url, ".body"), entry.body)
+        self.touch(entry)
+
+    def touch(self, entry: CachedResponse):
+        """Rewrites the metadata of `entry` (e.g. a refreshed `fetched_at` after a 304)."""
+        meta = {
+            "url": entry.url, "status": entry.status, "encoding": entry.encoding, "etag": entry.etag,
+            "last_modified": entry.last_modified, "fetched_at": entry.fetched_at,
+        }
+        self._write(self._path(entry.url, ".json"), json.dumps(meta).encode("utf-8"))
+
+
+# ============================
+# 📌 Fetcher
+# ============================
+@dataclass
+class FetchResult:
+    url: str
+    status: int  # 200 for cached / revalidated pages; the origin's status otherwise (0 after network errors)
+    text: str = ""
+    source: str = "network"  # "network", "cache" (fresh, no request) or "revalidated" (304)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+@dataclass
+class AsyncFetcher:
+    """Fetches pages concurrently through one pooled `httpx.AsyncClient`.
+
+    Requests are paced by a `TokenBucket`, at most `concurrency` are in flight, and
+    transport errors, 429 and 5xx responses are retried with exponential backoff (honoring
+    `Retry-After`). Successful pages are kept in a `DiskHTTPCache`: entries younger than
+    `max_age` are served without a request, older ones are revalidated with
+    `If-None-Match` / `If-Modified-Since`. Use as `async with AsyncFetcher(...) as fetcher`.
+    """
+    cache: Optional[DiskHTTPCache] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    rate: float = DEFAULT_RATE
+    burst: int = DEFAULT_BURST
+    concurrency: int = DEFAULT_CONCURRENCY
+    retries: int = DEFAULT_RETRIES
+    backoff: float = DEFAULT_BACKOFF
+    max_age: float = DEFAULT_MAX_AGE
+    timeout: float = DEFAULT_TIMEOUT
+    client: Optional[httpx.AsyncClient] = None  # Injected clients (e.g. with a mock transport) are not closed
+
+    async def __aenter__(self):
+        self._bucket = TokenBucket(self.rate, self.burst)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._owns_client = self.client is None
+        if self._owns_client:
+            self.client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._owns_client:
+            await self.client.aclose()
+            self.client = None
+
+    async def fetch(self, url: str) -> FetchResult:
+        cached = self.cache.get(url) if self.cache is not None else None
+        if cached is not None and time.time() - cached.fetched_at < self.max_age:
+            return FetchResult(url, 200, cached.text, "cache")
+
+        conditional = {}
+        if cached is not None and cached.etag:
+            conditional["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            conditional["If-Modified-Since"] = cached.last_modified
+
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                await self._bucket.acquire()
+                delay = self.backoff * 2 ** attempt * (1 + random.random() / 2)
+                try:
+                    response = await self.client.get(url, headers=conditional)
+                except httpx.TransportError as e:
+                    if attempt == self.retries:
+                        return FetchResult(url, 0, error=f"{type(e).__name__}: {e}")
+                    logging.warning(f"⚠️ {url}: {type(e).__name__}, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+
+                if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                    delay = _retry_after(response) or delay
+                    logging.warning(f"⚠️ {url}: HTTP {response.status_code}, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                break
+
+        if response.status_code == 304 and cached is not None:
+            cached.fetched_at = time.time()
+            self.cache.touch(cached)
+            return FetchResult(url, 200, cached.text, "revalidated")
+        if response.status_code != 200:
+            return FetchResult(url, response.status_code, error=f"HTTP {response.status_code}")
+
+        if self.cache is not None:
+            self.cache.put(CachedResponse(
+                url, 200, response.content, response.encoding, response.headers.get("ETag"),
+                response.headers.get("Last-Modified"), time.time(),
+            ))
+        return FetchResult(url, 200, response.text)
+
+    async def fetch_all(self, urls: Sequence[str]) -> List[FetchResult]:
+        """Fetches every URL concurrently; results are in the order of `urls`."""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
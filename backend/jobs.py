@@ -0,0 +1,105 @@
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_FINISHED_JOBS = 500  # Finished jobs kept around for polling
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat() if timestamp else None
+
+
+@dataclass
+class Job:
+    """A unit of background work and its bookkeeping."""
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    state: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializes the job for API responses, including queue and run durations."""
+        now = time.time()
+        queued_seconds = (self.started_at or now) - self.created_at
+        run_seconds = (self.finished_at or now) - self.started_at if self.started_at else None
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "state": self.state,
+            "created_at": _iso(self.created_at),
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+            "queued_seconds": round(queued_seconds, 3),
+            "run_seconds": round(run_seconds, 3) if run_seconds is not None else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Runs submitted jobs on a bounded thread pool and keeps their state for polling.
+
+    Jobs are plain callables returning a result dict; any exception marks the job as
+    failed with the exception text. Only the `max_finished_jobs` most recent finished
+    jobs are retained.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable[..., Dict[str, Any]], **params) -> Job:
+        """Queues `func(**params)` and returns its job immediately."""
+        job = Job(id=uuid.uuid4().hex, kind=kind, params=params)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self.executor.submit(self._run, job, func)
+        logging.info(f"📨 Queued {kind} job {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: Job, func: Callable[..., Dict[str, Any]]):
+        job.state, job.started_at = RUNNING, time.time()
+        try:
+            job.result = func(**job.params)
+            job.state = SUCCEEDED
+            logging.info(f"✅ Job {job.id} succeeded")
+        except Exception as e:
+            job.error = str(getattr(e, "detail", e))  # HTTPException carries its message in `detail`
+            job.state = FAILED
+            logging.error(f"❌ Job {job.id} failed: {job.error}")
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.state in (SUCCEEDED, FAILED)]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,11 +1,25 @@
-import requests
+import os
+import sys
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
 from bs4 import BeautifulSoup
 import chromadb
 from tqdm import tqdm
 
-# 🛠️ Initialize ChromaDB
-client = chromadb.PersistentClient(path="./chroma_reusable_code")
-collection = client.get_or_create_collection("reusable_code_docs")
+# ✅ `http_fetch` lives in `backend/`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from http_fetch import AsyncFetcher, DiskHTTPCache  # noqa: E402
+
+# 🛠️ ChromaDB location: the same store `python_llm` (and `POST /query/docs`) reads
+from python_llm import CHROMA_PATH, COLLECTION_NAME  # noqa: E402
+BATCH_SIZE = 1000  # Paragraphs per add/upsert call (capped by the client's max batch size)
+
+# Every page is on a different host, so the fetcher can be less conservative than for a single site
+FETCH_RATE = 4.0
+FETCH_CONCURRENCY = 8
 
 # 🌎 Documentation URLs for Each Language
 DOC_URLS = {
@@ -22,36 +36,174 @@ DOC_URLS = {
     "SQL": "https://www.postgresql.org/docs/current/sql.html"
 }
 
-# 📥 Function to Scrape Documentation Page
-def scrape_doc(url):
-    response = requests.get(url)
-    if response.status_code != 200:
-        return []
+# A record is `(id, document, metadata)`
+Record = Tuple[str, str, Dict[str, str]]
+
+
+@dataclass
+class IngestReport:
+    pages: int = 0
+    failed: int = 0
+    unchanged_pages: int = 0  # Same page as last time: not even parsed
+    added: int = 0
+    kept: int = 0
+    removed: int = 0
+
+    def __str__(self):
+        return (f"{self.pages} pages ({self.unchanged_pages} unchanged, {self.failed} failed): "
+                f"{self.added} paragraphs added, {self.kept} kept, {self.removed} removed")
+
+
+def open_collection(path: str = CHROMA_PATH, name: str = COLLECTION_NAME):
+    """Returns the collection and the batch size its client accepts."""
+    client = chromadb.PersistentClient(path=path)
+    return client.get_or_create_collection(name), min(BATCH_SIZE, client.get_max_batch_size())
+
+
+def make_fetcher(cache_dir: Optional[str] = None, **options) -> AsyncFetcher:
+    """An `AsyncFetcher` with an on-disk HTTP cache: unchanged pages are not downloaded again."""
+    options.setdefault("rate", FETCH_RATE)
+    options.setdefault("concurrency", FETCH_CONCURRENCY)
+    cache = DiskHTTPCache(cache_dir) if cache_dir else DiskHTTPCache()
+    return AsyncFetcher(cache=cache, **options)
+
+
+# 📥 Parse a Documentation Page
+def parse_doc(html: str) -> List[Tuple[str, str]]:
+    """Returns `(section, paragraph)` pairs, the section being the last h1-h3 before the paragraph."""
+    soup = BeautifulSoup(html, "html.parser")
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    
     structured_data = []
     current_section = "General"
 
-    for tag in soup.find_all():
-        if tag.name in ["h1", "h2", "h3"]:  # Section titles
+    for tag in soup.find_all(["h1", "h2", "h3", "p"]):
+        if tag.name == "p":  # Paragraphs
+            content = tag.get_text(strip=True)
+            if content:
+                structured_data.append((current_section, content))
+        else:  # Section titles
             current_section = tag.get_text(strip=True)
-        elif tag.name == "p":  # Paragraphs
-            structured_data.append((current_section, tag.get_text(strip=True)))
 
     return structured_data
 
+
+def paragraph_id(language: str, url: str, section: str, content: str) -> str:
+    """Content-hash id: the same paragraph always gets the same id, a changed one a new id."""
+    return hashlib.sha256("\0".join((language, url, section, content)).encode("utf-8")).hexdigest()
+
+
+def _batched(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@dataclass
+class PageSync:
+    """What `sync_page` found for one fetched page; `finish_page` applies it once its new records are stored."""
+    url: str
+    page_hash: str
+    records: List[Record]  # New paragraphs, stored without the page hash until `finish_page`
+    metadatas: Dict[str, Dict[str, str]]  # Id -> final metadata of every paragraph on the page
+    stale: List[str]  # Stored ids that are no longer on the page
+
+
+def sync_page(collection, language: str, url: str, html: str, report: IngestReport) -> Optional[PageSync]:
+    """
+    Compares a fetched page with what is stored for its URL and returns the records of its new
+    paragraphs plus the stored paragraphs to delete; nothing is written yet. A page whose
+    hash is unchanged is skipped without being parsed (None).
+    """
+    page_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+    stored = collection.get(where={"source": url}, include=["metadatas"])
+    stored_ids = stored["ids"]
+    if stored_ids and all((metadata or {}).get("page_hash") == page_hash for metadata in stored["metadatas"]):
+        report.unchanged_pages += 1
+        report.kept += len(stored_ids)
+        return None
+
+    records = {}
+    for section, content in parse_doc(html):
+        record_id = paragraph_id(language, url, section, content)
+        if record_id not in records:  # Repeated paragraphs are stored once
+            records[record_id] = (content, {"language": language, "section": section, "source": url})
+
+    existing = set(stored_ids)
+    stale = [record_id for record_id in stored_ids if record_id not in records]
+    report.removed += len(stale)
+    report.kept += sum(record_id in existing for record_id in records)
+
+    return PageSync(
+        url, page_hash,
+        [(record_id, content, metadata) for record_id, (content, metadata) in records.items() if record_id not in existing],
+        {record_id: {**metadata, "page_hash": page_hash} for record_id, (_, metadata) in records.items()},
+        stale,
+    )
+
+
+def finish_page(collection, page: PageSync, batch_size: int):
+    """
+    Deletes the page's stale paragraphs and tags all of its paragraphs with the page hash
+    (metadata only: nothing is re-embedded). Called after the page's new records are stored,
+    so a run that fails before leaves the old hash in place and the page is synced again.
+    """
+    for batch in _batched(page.stale, batch_size):
+        collection.delete(ids=list(batch))
+    ids = list(page.metadatas)
+    for batch in _batched(ids, batch_size):
+        collection.update(ids=list(batch), metadatas=[page.metadatas[record_id] for record_id in batch])
+
+
+def upsert_records(collection, records: Sequence[Record], batch_size: int = BATCH_SIZE):
+    """Embeds and stores `records` in batches of `batch_size` (one call per batch)."""
+    for batch in tqdm(list(_batched(records, batch_size)), desc="Storing Docs", disable=not records):
+        ids, documents, metadatas = zip(*batch)
+        collection.upsert(ids=list(ids), documents=list(documents), metadatas=list(metadatas))
+
+
+async def ingest_docs(doc_urls: Dict[str, str] = DOC_URLS, collection=None, batch_size: Optional[int] = None,
+                      fetcher: Optional[AsyncFetcher] = None) -> IngestReport:
+    """
+    Fetches every documentation page concurrently and brings the collection up to date with
+    them: only paragraphs that are new or changed are embedded, in batched upserts.
+    """
+    if fetcher is None:
+        async with make_fetcher() as fetcher:
+            return await ingest_docs(doc_urls, collection, batch_size, fetcher)
+    if collection is None:
+        collection, client_batch_size = open_collection()
+        batch_size = batch_size or client_batch_size
+    batch_size = batch_size or BATCH_SIZE
+
+    languages = list(doc_urls)
+    results = await fetcher.fetch_all([doc_urls[language] for language in languages])
+
+    report = IngestReport(pages=len(results))
+    pages = []
+    for language, result in zip(languages, results):
+        if not result.ok:
+            print(f"⚠️ Failed to fetch {result.url} ({result.error})")
+            report.failed += 1
+            continue
+        page = sync_page(collection, language, result.url, result.text, report)
+        if page is not None:
+            pages.append(page)
+
+    # New paragraphs of every page go out in shared batches; pages are only marked as synced afterwards
+    records = [record for page in pages for record in page.records]
+    upsert_records(collection, records, batch_size)
+    for page in pages:
+        finish_page(collection, page, batch_size)
+    report.added = len(records)
+    return report
+
+
+def ingest(doc_urls: Dict[str, str] = DOC_URLS, collection=None, batch_size: Optional[int] = None) -> IngestReport:
+    """Synchronous `ingest_docs`."""
+    return asyncio.run(ingest_docs(doc_urls, collection, batch_size))
+
+
 # 🔄 Scrape & Store Data in ChromaDB
-print(f"📚 Scraping and structuring reusable code documentation...")
-
-for idx, (language, url) in tqdm(enumerate(DOC_URLS.items()), total=len(DOC_URLS), desc="Scraping Docs"):
-    doc_data = scrape_doc(url)
-    
-    for i, (sub_section, content) in enumerate(doc_data):
-        collection.add(
-            ids=[f"{idx}-{i}"],
-            documents=[content],
-            metadatas=[{"language": language, "section": sub_section, "source": url}]
-        )
-
-print("\n🚀 Reusable code documentation successfully structured and stored in ChromaDB!")
+if __name__ == "__main__":
+    print("📚 Scraping and structuring reusable code documentation...")
+    report = ingest()
+    print(f"\n🚀 Reusable code documentation successfully structured and stored in ChromaDB! ({report})")
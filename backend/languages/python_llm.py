@@ -1,38 +1,205 @@
-import chromadb
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
 
-# 🛠️ Connect to ChromaDB
-client = chromadb.PersistentClient(path="./vector_db/chroma_reusable_code")
-collection = client.get_collection("reusable_code_docs")
+try:
+    import chromadb
+    from chromadb.utils import embedding_functions
+except ImportError:  # The query service reports itself unavailable
+    chromadb = None
 
-# 🔍 Query the vector database
-def query_docs(question, language=None):
-    results = collection.query(
-        query_texts=[question],
-        n_results=3
-    )
+# 🛠️ ChromaDB location (next to the other databases in `backend/db`), shared with `_scraping_python.py`
+CHROMA_PATH = os.environ.get(
+    "CHROMA_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "chroma_reusable_code")
+)
+COLLECTION_NAME = "reusable_code_docs"
 
-    if not results["documents"]:
-        return ["No results found."]
+DEFAULT_N_RESULTS = 3
+MAX_N_RESULTS = 50
+MAX_QUESTIONS = 64  # Per batched query
+DEFAULT_CACHE_SIZE = 1024  # Questions whose embedding (and results) are kept
+REFRESH_INTERVAL = 10.0  # Seconds between checks of the collection for changed paragraphs
+
+
+class DocsUnavailable(RuntimeError):
+    """ChromaDB is not installed or the docs collection does not exist (run `_scraping_python.py`)."""
+
+
+class _LRU:
+    """A small thread-safe LRU mapping."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class DocsQueryService:
+    """Answers questions from the reusable code docs collection, for the life of the process.
+
+    The language filter is pushed into the Chroma query as a `where` clause, so every
+    returned hit is in that language. Questions are embedded and queried in one batch;
+    query embeddings and results are kept in LRU caches. The results are dropped when the
+    set of stored paragraph ids changes (e.g. after re-running the scraper, whose ids are
+    content hashes, so an edited paragraph gets a new id); the ids are checked at most
+    every `refresh_interval` seconds.
+    """
 
-    formatted_results = []
-    for i in range(len(results["documents"])):
-        # 🛠️ FIX: Index into the metadata list correctly
-        lang = results["metadatas"][0][i].get("language", "Unknown Language")
-        section = results["metadatas"][0][i].get("section", "Unknown Section")
-        text = results["documents"][0][i]
+    def __init__(self, collection=None, path: str = CHROMA_PATH, name: str = COLLECTION_NAME,
+                 embedding_function=None, cache_size: int = DEFAULT_CACHE_SIZE,
+                 refresh_interval: float = REFRESH_INTERVAL):
+        self.path = path
+        self.name = name
+        self._collection = collection
+        self._embedding_function = embedding_function
+        self._embeddings = _LRU(cache_size)
+        self._results = _LRU(cache_size)
+        self.refresh_interval = refresh_interval
+        self._languages: Dict[str, str] = {}  # Lower-cased → stored language name
+        self._ids_digest: Optional[str] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
 
-        # 🔍 Filter by language if specified
-        if language and lang.lower() != language.lower():
-            continue
+    def _open(self):
+        """Returns the collection and embedding function, opening them on first use."""
+        with self._lock:
+            if self._collection is None or self._embedding_function is None:
+                if chromadb is None:
+                    raise DocsUnavailable("chromadb is not installed.")
+                if self._embedding_function is None:  # The scraper stores with Chroma's default embeddings
+                    self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
+            if self._collection is None:
+                try:
+                    client = chromadb.PersistentClient(path=self.path)
+                    self._collection = client.get_collection(self.name, embedding_function=self._embedding_function)
+                except Exception as e:  # Missing collections raise different errors across chromadb versions
+                    raise DocsUnavailable(f"Collection '{self.name}' not found in {self.path}: {e}")
+            return self._collection, self._embedding_function
 
-        formatted_results.append(f"\n📌 **Language: {lang}**\n🔹 **Section: {section}**\n{text}\n")
+    def _refresh(self, collection):
+        """Drops cached results and re-reads the stored languages when the collection's ids changed."""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_interval:
+            return
+        stored = collection.get(include=["metadatas"])
+        digest = hashlib.sha256("\0".join(sorted(stored["ids"])).encode("utf-8")).hexdigest()
+        with self._lock:
+            self._checked_at = now
+            if digest == self._ids_digest:
+                return
+            self._results.clear()
+            self._languages = {m["language"].lower(): m["language"] for m in stored["metadatas"] if m and m.get("language")}
+            self._ids_digest = digest
 
-    return formatted_results
+    @property
+    def languages(self) -> List[str]:
+        collection, _ = self._open()
+        self._refresh(collection)
+        return sorted(self._languages.values())
+
+    def _embed(self, questions: Sequence[str], embedding_function) -> List:
+        embeddings = [self._embeddings.get(question) for question in questions]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            for i, embedding in zip(missing, embedding_function([questions[i] for i in missing])):
+                embeddings[i] = embedding
+                self._embeddings.put(questions[i], embedding)
+        return embeddings
+
+    def query(self, questions: Sequence[str], language: Optional[str] = None,
+              n_results: int = DEFAULT_N_RESULTS) -> List[List[Dict]]:
+        """
+        Returns the `n_results` closest paragraphs to each question (in `language` only, matched
+        case-insensitively), as `{language, section, source, text, distance}` hits. Raises
+        `ValueError` for a language that is not in the collection.
+        """
+        collection, embedding_function = self._open()
+        self._refresh(collection)
+
+        stored_language = None
+        if language:
+            stored_language = self._languages.get(language.lower())
+            if stored_language is None:
+                raise ValueError(f"Unknown language '{language}'. Use one of: {', '.join(self.languages)}.")
+
+        results = [self._results.get((question, stored_language, n_results)) for question in questions]
+        # Each distinct uncached question is embedded and queried once, all of them in one call
+        pending = list(dict.fromkeys(question for question, hits in zip(questions, results) if hits is None))
+        if pending:
+            found = collection.query(
+                query_embeddings=self._embed(pending, embedding_function),
+                n_results=n_results,
+                where={"language": stored_language} if stored_language else None,
+                include=["documents", "metadatas", "distances"],
+            )
+            answered = {}
+            for i, question in enumerate(pending):
+                hits = [
+                    {
+                        "language": (metadata or {}).get("language", "Unknown Language"),
+                        "section": (metadata or {}).get("section", "Unknown Section"),
+                        "source": (metadata or {}).get("source"),
+                        "text": text,
+                        "distance": float(distance),
+                    }
+                    for text, metadata, distance in zip(found["documents"][i], found["metadatas"][i], found["distances"][i])
+                ]
+                answered[question] = hits
+                self._results.put((question, stored_language, n_results), hits)
+            results = [answered[question] if hits is None else hits for question, hits in zip(questions, results)]
+        return results
+
+    def clear(self):
+        """Drops every cached embedding and result."""
+        self._embeddings.clear()
+        self._results.clear()
+        self._ids_digest = self._checked_at = None
+
+
+def format_hit(hit: Dict) -> str:
+    return f"\n📌 **Language: {hit['language']}**\n🔹 **Section: {hit['section']}**\n{hit['text']}\n"
+
+
+_default_service: Optional[DocsQueryService] = None
+
+
+# 🔍 Query the vector database
+def query_docs(question, language=None):
+    """Formatted answers to `question` (a shared `DocsQueryService`)."""
+    global _default_service
+    if _default_service is None:
+        _default_service = DocsQueryService()
+    hits = _default_service.query([question], language)[0]
+    if not hits:
+        return ["No results found."]
+    return [format_hit(hit) for hit in hits]
 
 
 # Example Queries
-question = "How does Python handle modules?"
-answers = query_docs(question, language="Python")
+if __name__ == "__main__":
+    question = "How does Python handle modules?"
+    answers = query_docs(question, language="Python")
 
-for answer in answers:
-    print(answer)
+    for answer in answers:
+        print(answer)
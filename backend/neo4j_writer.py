@@ -0,0 +1,174 @@
+import logging
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_BATCH_SIZE = 1000  # Rows per UNWIND statement and per flush
+
+# Uniqueness constraints also create the indexes the MERGEs below look nodes up by
+CONSTRAINTS = [
+    "CREATE CONSTRAINT file_path IF NOT EXISTS FOR (f:File) REQUIRE f.path IS UNIQUE",
+    "CREATE CONSTRAINT function_name IF NOT EXISTS FOR (fn:Function) REQUIRE fn.name IS UNIQUE",
+    "CREATE CONSTRAINT library_name IF NOT EXISTS FOR (l:Library) REQUIRE l.name IS UNIQUE",
+]
+
+# Every node is MERGEd on its key alone, then the relationship between the bound nodes;
+# MERGEing a whole pattern would create a fresh File whenever the relationship is missing.
+QUERIES = {
+    "files": """
+        UNWIND $rows AS row
+        MERGE (:File {path: row.path})
+    """,
+    "functions": """
+        UNWIND $rows AS row
+        MERGE (f:File {path: row.path})
+        MERGE (fn:Function {name: row.name})
+        MERGE (fn)-[:DEFINED_IN]->(f)
+    """,
+    "imports": """
+        UNWIND $rows AS row
+        MERGE (f:File {path: row.path})
+        MERGE (imp:Library {name: row.name})
+        MERGE (imp)-[:IMPORTED_IN]->(f)
+    """,
+    "dependencies": """
+        UNWIND $rows AS row
+        MERGE (f:File {path: row.path})
+        MERGE (dep:File {path: row.dependency})
+        MERGE (f)-[:DEPENDS_ON]->(dep)
+    """,
+}
+
+
+class Neo4jBatchWriter:
+    """Accumulates file facts across many files and writes them with a few `UNWIND` queries.
+
+    Rows are flushed once `batch_size` of them are pending (and on `flush()`/`close()`);
+    each flush is one write transaction with at most one statement per row kind and
+    `batch_size` rows. The driver is only used through `session()`, so any object with
+    the driver's session API works, e.g. `RecordingDriver`.
+    """
+
+    def __init__(self, driver, batch_size: int = DEFAULT_BATCH_SIZE, database: Optional[str] = None):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.driver = driver
+        self.batch_size = batch_size
+        self.database = database
+        self._pending = {kind: [] for kind in QUERIES}
+        self._pending_rows = 0
+
+    def _session(self):
+        return self.driver.session(database=self.database) if self.database else self.driver.session()
+
+    def ensure_constraints(self):
+        """Creates the uniqueness constraints (no-op when they already exist)."""
+        with self._session() as session:
+            for statement in CONSTRAINTS:
+                session.run(statement)
+
+    def add_file(self, path: str, functions: Iterable[str] = (), imports: Iterable[str] = (), dependencies: Iterable[str] = ()):
+        """Queues one file and the names it defines, imports and calls."""
+        self._pending["files"].append({"path": path})
+        self._pending["functions"].extend({"path": path, "name": name} for name in functions)
+        self._pending["imports"].extend({"path": path, "name": name} for name in imports)
+        self._pending["dependencies"].extend({"path": path, "dependency": name} for name in dependencies)
+        self._pending_rows = sum(len(rows) for rows in self._pending.values())
+
+        while self._pending_rows >= self.batch_size:
+            self._flush_batch()
+
+    def flush(self):
+        """Writes every pending row."""
+        while self._pending_rows:
+            self._flush_batch()
+
+    def _flush_batch(self):
+        # Take up to `batch_size` rows, files first so relationships find their File nodes
+        batch, budget = {}, self.batch_size
+        for kind in QUERIES:
+            if budget and self._pending[kind]:
+                batch[kind], self._pending[kind] = self._pending[kind][:budget], self._pending[kind][budget:]
+                budget -= len(batch[kind])
+
+        with self._session() as session:
+            session.execute_write(self._write_batch, batch)
+
+        written = self.batch_size - budget
+        self._pending_rows -= written
+        logging.info(f"🕸️ Wrote {written} rows to Neo4j ({', '.join(f'{kind}={len(rows)}' for kind, rows in batch.items())})")
+
+    @staticmethod
+    def _write_batch(tx, batch: Dict[str, List[Dict]]):
+        for kind, rows in batch.items():
+            tx.run(QUERIES[kind], rows=rows)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+
+
+# ============================
+# 📌 Offline Fake Driver
+# ============================
+class RecordingTransaction:
+    """Records `run` calls instead of executing them."""
+
+    def __init__(self):
+        self.queries = []
+
+    def run(self, query: str, parameters: Optional[Dict] = None, **kwargs):
+        self.queries.append((query, {**(parameters or {}), **kwargs}))
+
+
+class RecordingSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def run(self, query: str, parameters: Optional[Dict] = None, **kwargs):
+        self.driver.statements.append((query, {**(parameters or {}), **kwargs}))
+
+    def execute_write(self, work, *args, **kwargs):
+        tx = RecordingTransaction()
+        result = work(tx, *args, **kwargs)
+        self.driver.transactions.append(tx.queries)
+        return result
+
+    write_transaction = execute_write  # Name used by 4.x drivers
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RecordingDriver:
+    """Stand-in for `neo4j.Driver` that records what would be sent, for testing without a server.
+
+    `statements` holds auto-commit queries (`session.run`), `transactions` one list of
+    `(query, parameters)` per write transaction.
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.transactions = []
+        self.sessions = 0
+
+    def session(self, **kwargs):
+        self.sessions += 1
+        return RecordingSession(self)
+
+    def rows_written(self, kind: str) -> List[Dict]:
+        """Returns every row sent for one of the `QUERIES` kinds, in order."""
+        return [row for tx in self.transactions for query, params in tx if query == QUERIES[kind] for row in params["rows"]]
+
+    def close(self):
+        pass
@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+
+# Default cache location (relative to the working directory, like `cloned_repos`)
+DEFAULT_CACHE_PATH = os.environ.get("PARSE_CACHE_PATH", os.path.join(".cache", "parse_cache.sqlite3"))
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB of cached extraction results
+
+
+def hash_content(content: bytes) -> str:
+    """Returns a fast, collision-resistant digest of a file's raw bytes."""
+    return hashlib.blake2b(content, digest_size=20).hexdigest()
+
+
+class ParseCache:
+    """Persistent on-disk cache of per-file extraction results.
+
+    Entries are keyed by `<parser version>:<content hash>`, so an edited file or a
+    parser upgrade simply misses. The store is a single SQLite file; every hit
+    refreshes the entry's `last_used` stamp and `evict()` drops the least recently
+    used entries once the total payload exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent without an fsync per commit
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries (last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(version: str, content_hash: str) -> str:
+        """Builds the cache key for a parser version and a content hash."""
+        return f"{version}:{content_hash}"
+
+    def contains_many(self, keys):
+        """Returns the subset of `keys` that are cached, without loading their values."""
+        present = set()
+        keys = list(keys)
+        for start in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(f"SELECT key FROM entries WHERE key IN ({placeholders})", batch)
+            present.update(key for (key,) in rows)
+        return present
+
+    def get_many(self, keys):
+        """Returns a `{key: value}` dict for the keys that are cached and marks them as recently used."""
+        found = {}
+        keys = list(keys)
+        for start in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(f"SELECT key, value FROM entries WHERE key IN ({placeholders})", batch)
+            for key, value in rows:
+                found[key] = json.loads(value)
+
+        if found:
+            now = time.time()
+            self.conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?", [(now, key) for key in found])
+            self.conn.commit()
+        return found
+
+    def put_many(self, items):
+        """Stores `(key, value)` pairs, then evicts old entries if the cache is over budget."""
+        now = time.time()
+        rows = []
+        for key, value in items:
+            payload = json.dumps(value, separators=(",", ":"))
+            rows.append((key, payload, len(payload), now))
+
+        if not rows:
+            return
+        self.conn.executemany("INSERT OR REPLACE INTO entries (key, value, size, last_used) VALUES (?, ?, ?, ?)", rows)
+        self.conn.commit()
+        self.evict()
+
+    def total_bytes(self) -> int:
+        """Returns the combined size of all cached payloads."""
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self):
+        """Deletes least recently used entries until the cache fits in `max_bytes`."""
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+
+        freed, stale_keys = 0, []
+        for key, size in self.conn.execute("SELECT key, size FROM entries ORDER BY last_used ASC"):
+            if freed >= excess:
+                break
+            stale_keys.append((key,))
+            freed += size
+
+        self.conn.executemany("DELETE FROM entries WHERE key = ?", stale_keys)
+        self.conn.commit()
+        logging.info(f"🧹 Evicted {len(stale_keys)} parse cache entries ({freed} bytes)")
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        self.conn.execute("DELETE FROM entries")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
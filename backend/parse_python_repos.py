@@ -6,20 +6,33 @@ import subprocess
 import logging
 from pathlib import Path
 from typing import List, Dict, Tuple
+import ast_extractor
+from extract_records import RecordBatch, RecordType, StringTable
+from streaming_csv import StreamingCSVWriter
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+CSV_HEADER = ["Type", "Module", "Alias", "Function", "File"]
+RECORD_FIELDS = ("module", "alias", "function", "file")  # Fields of a `RecordBatch` after the enum-coded type
+
 class GitHubRepoParser:
-    """A class to clone and parse a GitHub repository or a local folder for Python function imports, definitions, and calls."""
+    """A class to clone and parse a GitHub repository or a local folder for Python function imports, definitions, and calls.
+
+    With `stream=True` rows are written to the CSV as each file is parsed (then the file is
+    atomically renamed into place) instead of being collected in `self.results`.
+    """
 
-    def __init__(self, source: str, clone_dir: str = "cloned_repos"):
+    def __init__(self, source: str, clone_dir: str = "cloned_repos", stream: bool = False):
         self.source = source  # Can be a GitHub URL or local folder
         self.clone_dir = Path(clone_dir)
         self.is_cloned_repo = source.startswith("https")  # Automatically determine mode
         self.repo_name = source.split("/")[-1].replace(".git", "") if self.is_cloned_repo else Path(source).name
         self.local_repo_path = self.clone_dir / self.repo_name if self.is_cloned_repo else Path(source)
-        self.results = []  # Stores parsed data
+        self.strings = StringTable()  # Interned paths and names shared by every batch
+        self.results = RecordBatch(RECORD_FIELDS, self.strings)  # Stores parsed data
+        self.stream = stream
+        self.writer = None  # `StreamingCSVWriter` while a streaming run is parsing
 
     def clone_repo(self):
         """Clones a GitHub repository to a local directory if it's a remote repo."""
@@ -50,44 +63,47 @@ class GitHubRepoParser:
         imports, functions, calls = self._extract_ast_data(tree)
 
         # Store results in structured format
+        batch = self._new_batch()
+        file_name = str(file_path)
         for imp in imports:
-            self.results.append(["Import", imp["module"], imp["alias"], "", str(file_path)])
+            batch.append(RecordType.IMPORT, imp["module"], imp["alias"], "", file_name)
 
         for func in functions:
-            self.results.append(["Definition", "", "", func, str(file_path)])
+            batch.append(RecordType.DEFINITION, "", "", func, file_name)
 
         for call in calls:
-            self.results.append(["Call", "", "", call, str(file_path)])
+            batch.append(RecordType.CALL, "", "", call, file_name)
 
-    def _extract_ast_data(self, tree: ast.AST) -> Tuple[List[Dict], List[str], List[str]]:
-        """Extracts imports, function definitions, and function calls from the AST."""
-        imports = []
-        functions = []
-        calls = []
+        if self.writer is not None:
+            self.writer.writerows(batch.rows())
+        else:
+            self.results.extend(batch)
 
-        for node in ast.walk(tree):
-            # Detect Imports
-            if isinstance(node, ast.Import):
-                for name in node.names:
-                    imports.append({"module": name.name, "alias": name.asname})
+    def _new_batch(self) -> RecordBatch:
+        """An empty batch; it shares `self.strings` only when rows are collected in `self.results`,
+        so a streaming run does not keep every string it has written."""
+        if self.writer is None:
+            return RecordBatch(RECORD_FIELDS, self.strings)
+        return RecordBatch(RECORD_FIELDS)
 
-            elif isinstance(node, ast.ImportFrom):
-                module_name = node.module if node.module else ""
-                for name in node.names:
-                    imports.append({"module": module_name, "alias": name.name})
+    def _extract_ast_data(self, tree: ast.AST) -> Tuple[List[Dict], List[str], List[str]]:
+        """Extracts imports, function definitions, and function calls from the AST."""
+        facts = ast_extractor.extract(tree)
 
-            # Detect Function Definitions
-            elif isinstance(node, ast.FunctionDef):
-                functions.append(node.name)
+        imports = []
+        for imp in facts.imports:
+            if imp.name is None:
+                imports.append({"module": imp.module, "alias": imp.alias})
+            else:
+                imports.append({"module": imp.module, "alias": imp.name})
 
-            # Detect Function Calls
-            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-                calls.append(node.func.id)
+        functions = [func.name for func in facts.functions]
+        calls = [call.name for call in facts.calls if call.receiver is None]
 
         return imports, functions, calls
 
-    def save_results_to_csv(self):
-        """Saves parsed data to a dynamically named CSV file based on source type."""
+    def output_path(self) -> Path:
+        """Dynamically named CSV path based on source type."""
         
         # Generate timestamp (MMDDYY format)
         timestamp = datetime.now().strftime("%m%d%y")
@@ -98,23 +114,38 @@ class GitHubRepoParser:
         else:
             # Save as: folder_upload_folderName_MMDDYY_repoai_extract.csv
             output_file = f"backend/raw/folder_upload_{self.repo_name}_{timestamp}_repoai_extract.csv"
+        return Path(output_file)
+
+    def save_results_to_csv(self):
+        """Saves parsed data to a dynamically named CSV file based on source type."""
 
         # Save CSV
-        output_path = Path(output_file)
+        output_path = self.output_path()
         logging.info(f"💾 Saving results to {output_path}...")
 
         with open(output_path, "w", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
-            writer.writerow(["Type", "Module", "Alias", "Function", "File"])
-            writer.writerows(self.results)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(self.results.rows())
 
         logging.info(f"✅ Data successfully saved to {output_path}")
 
     def run(self):
         """Executes the full pipeline: Clone (if needed), Parse, Save."""
         self.clone_repo()  # Will only clone if it's a GitHub URL
-        self.parse_python_files()
-        self.save_results_to_csv()
+        if not self.stream:
+            self.parse_python_files()
+            self.save_results_to_csv()
+            return
+
+        # Streaming: the CSV only appears at its final path once every file is parsed
+        output_path = self.output_path()
+        logging.info(f"💾 Streaming results to {output_path}...")
+        try:
+            with StreamingCSVWriter(output_path, CSV_HEADER) as self.writer:
+                self.parse_python_files()
+        finally:
+            self.writer = None
 
 
 # Example Usage
@@ -0,0 +1,415 @@
+import os
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import duckdb
+import pandas as pd
+
+# Per-repository parse results (relative to this file, next to the other DuckDB databases)
+DEFAULT_DB_PATH = os.environ.get(
+    "PARSE_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "db", "parse_store.duckdb")
+)
+DEFAULT_BATCH_FILES = 2000  # Files buffered per bulk insert
+
+SCHEMA = """
+CREATE SCHEMA IF NOT EXISTS parsed;
+
+CREATE TABLE IF NOT EXISTS parsed.repos (
+    repo_id INTEGER PRIMARY KEY,
+    repo_name TEXT NOT NULL,
+    repo_path TEXT NOT NULL,
+    commit_sha TEXT,
+    parser_version TEXT,
+    version INTEGER NOT NULL,
+    file_count INTEGER NOT NULL,
+    updated_at TIMESTAMP NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS parsed.files (
+    repo_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    path TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS parsed.definitions (
+    repo_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    ordinal INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    lineno INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS parsed.classes (
+    repo_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    ordinal INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    lineno INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS parsed.imports (
+    repo_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    ordinal INTEGER NOT NULL,
+    module TEXT NOT NULL,
+    name TEXT,
+    alias TEXT,
+    level INTEGER NOT NULL,
+    lineno INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS parsed.calls (
+    repo_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    ordinal INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    receiver TEXT,
+    scope TEXT NOT NULL,
+    lineno INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_files_path ON parsed.files (path);
+CREATE INDEX IF NOT EXISTS idx_definitions_name ON parsed.definitions (name);
+CREATE INDEX IF NOT EXISTS idx_classes_name ON parsed.classes (name);
+CREATE INDEX IF NOT EXISTS idx_imports_module ON parsed.imports (module);
+CREATE INDEX IF NOT EXISTS idx_imports_name ON parsed.imports (name);
+CREATE INDEX IF NOT EXISTS idx_calls_name ON parsed.calls (name);
+"""
+
+# Fact tables and the columns filled from an `ast_extractor` record (after repo_id, file_id, ordinal)
+FACT_TABLES = {
+    "definitions": ("functions", ["name", "scope", "lineno"]),
+    "classes": ("classes", ["name", "scope", "lineno"]),
+    "imports": ("imports", ["module", "name", "alias", "level", "lineno"]),
+    "calls": ("calls", ["name", "receiver", "scope", "lineno"]),
+}
+
+
+def _rows_as_dicts(cursor) -> List[Dict]:
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+class ParseStore:
+    """DuckDB store holding the latest parse of each repository in normalized, indexed tables.
+
+    One parse is kept per repository: the commit it was built from is recorded on its
+    `parsed.repos` row, and a re-parse of a newer commit patches or replaces its rows.
+    Paths are stored relative to the repository root. Writes go through `RepoWriter`,
+    which stages rows in bulk and swaps them in with one transaction; reads use a cursor
+    per call so the store can be shared across request threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = duckdb.connect(path)
+        self.write_lock = threading.Lock()
+        self.conn.execute(SCHEMA)
+
+    def cursor(self):
+        return self.conn.cursor()
+
+    def close(self):
+        self.conn.close()
+
+    # ============================
+    # 📌 Writes
+    # ============================
+    def writer(self, repo_name: str, repo_path: str, commit: Optional[str], parser_version: str, removed=None, batch_files: int = DEFAULT_BATCH_FILES):
+        """Returns a `RepoWriter`. With `removed=None` the repository is replaced; otherwise it is
+        patched: `removed` paths are dropped and every added file replaces its previous rows."""
+        return RepoWriter(self, repo_name, repo_path, commit, parser_version, removed, batch_files)
+
+    # ============================
+    # 📌 Reads
+    # ============================
+    def get_repo(self, repo_name: str) -> Optional[Dict]:
+        """Returns the metadata row of a stored repository, or None."""
+        rows = _rows_as_dicts(self.cursor().execute("SELECT * FROM parsed.repos WHERE repo_name = ?", [repo_name]))
+        return rows[0] if rows else None
+
+    def latest_repo(self) -> Optional[Dict]:
+        """Returns the metadata row of the most recently parsed repository, or None."""
+        rows = _rows_as_dicts(self.cursor().execute("SELECT * FROM parsed.repos ORDER BY updated_at DESC LIMIT 1"))
+        return rows[0] if rows else None
+
+    def list_repos(self) -> List[Dict]:
+        return _rows_as_dicts(self.cursor().execute("SELECT * FROM parsed.repos ORDER BY repo_name"))
+
+    def _load_facts(self, repo: Dict):
+        """Returns `({file_id: relative path}, {kind: {file_id: [names]}})` for a stored repository."""
+        cursor = self.cursor()
+        repo_id = repo["repo_id"]
+        paths = dict(cursor.execute("SELECT file_id, path FROM parsed.files WHERE repo_id = ? ORDER BY file_id", [repo_id]).fetchall())
+        facts = {kind: {file_id: [] for file_id in paths} for kind in ("functions", "classes", "imports")}
+        queries = {
+            "functions": "SELECT file_id, name FROM parsed.definitions WHERE repo_id = ? ORDER BY file_id, ordinal",
+            "classes": "SELECT file_id, name FROM parsed.classes WHERE repo_id = ? ORDER BY file_id, ordinal",
+            "imports": "SELECT file_id, COALESCE(name, module) FROM parsed.imports WHERE repo_id = ? ORDER BY file_id, ordinal",
+        }
+        for kind, query in queries.items():
+            for file_id, name in cursor.execute(query, [repo_id]).fetchall():
+                facts[kind][file_id].append(name)
+        return paths, facts
+
+    def load_repo_dict(self, repo_name: str) -> Optional[Dict]:
+        """Rebuilds the `parser.parse_repository` dictionary for a stored repository."""
+        repo = self.get_repo(repo_name)
+        if repo is None:
+            return None
+        return self.repo_dict(repo, self.load_file_entries(repo, sort=False))
+
+    @staticmethod
+    def repo_dict(repo: Dict, entries: List[Dict]) -> Dict:
+        """The `parser.parse_repository` dictionary of `repo` from its `load_file_entries(repo, sort=False)`."""
+        repo_data = {
+            "repo_path": repo["repo_path"],
+            "commit": repo["commit_sha"],
+            "parser_version": repo["parser_version"],
+            "files": [entry["file"] for entry in entries],
+        }
+        for kind in ("functions", "classes", "imports"):
+            repo_data[kind] = {entry["file"]: entry[kind] for entry in entries}
+        return repo_data
+
+    def load_file_entries(self, repo: Dict, sort: bool = True) -> List[Dict]:
+        """Returns one `{"path", "file", "functions", "classes", "imports"}` dict per file of a
+        stored repository (`repo` as returned by `get_repo`), sorted by relative path (in the
+        order the files were parsed with `sort=False`)."""
+        paths, facts = self._load_facts(repo)
+        entries = [
+            {
+                "path": path,
+                "file": os.path.normpath(os.path.join(repo["repo_path"], path)),
+                **{kind: names_by_file[file_id] for kind, names_by_file in facts.items()},
+            }
+            for file_id, path in paths.items()
+        ]
+        if sort:
+            entries.sort(key=lambda entry: entry["path"])
+        return entries
+
+    def load_file_facts(self, repo: Dict) -> Dict[str, Dict[str, list]]:
+        """Returns `{relative path: ast_extractor record}` (every fact table, as tuples in extraction
+        order) for a stored repository, e.g. to resolve its call graph without reparsing."""
+        cursor = self.cursor()
+        repo_id = repo["repo_id"]
+        paths = dict(cursor.execute("SELECT file_id, path FROM parsed.files WHERE repo_id = ?", [repo_id]).fetchall())
+        records = {file_id: {key: [] for key, _ in FACT_TABLES.values()} for file_id in paths}
+        for table, (key, columns) in FACT_TABLES.items():
+            rows = cursor.execute(
+                f"SELECT file_id, {', '.join(columns)} FROM parsed.{table} WHERE repo_id = ? ORDER BY file_id, ordinal", [repo_id]
+            ).fetchall()
+            for file_id, *fact in rows:
+                records[file_id][key].append(tuple(fact))
+        return {paths[file_id]: record for file_id, record in records.items()}
+
+    def find_definitions(self, name: str, repo_name: Optional[str] = None) -> List[Dict]:
+        """Where is function or class `name` defined?"""
+        query = """
+            SELECT r.repo_name, f.path, d.kind, d.name, d.scope, d.lineno
+            FROM (
+                SELECT repo_id, file_id, 'function' AS kind, name, scope, lineno FROM parsed.definitions WHERE name = $name
+                UNION ALL
+                SELECT repo_id, file_id, 'class' AS kind, name, scope, lineno FROM parsed.classes WHERE name = $name
+            ) d
+            JOIN parsed.files f USING (repo_id, file_id)
+            JOIN parsed.repos r USING (repo_id)
+            WHERE $repo_name IS NULL OR r.repo_name = $repo_name
+            ORDER BY r.repo_name, f.path, d.lineno
+        """
+        return _rows_as_dicts(self.cursor().execute(query, {"name": name, "repo_name": repo_name}))
+
+    def load_symbols(self) -> pd.DataFrame:
+        """Returns every function and class definition of every repository as one DataFrame
+        (`name, kind, repo_name, path, lineno`), e.g. to build a symbol index."""
+        query = """
+            SELECT d.name, d.kind, r.repo_name, f.path, d.lineno
+            FROM (
+                SELECT repo_id, file_id, 'function' AS kind, name, lineno FROM parsed.definitions
+                UNION ALL
+                SELECT repo_id, file_id, 'class' AS kind, name, lineno FROM parsed.classes
+            ) d
+            JOIN parsed.files f USING (repo_id, file_id)
+            JOIN parsed.repos r USING (repo_id)
+        """
+        return self.cursor().execute(query).df()
+
+    def find_importers(self, module: str, repo_name: Optional[str] = None) -> List[Dict]:
+        """Which files import `module`, one of its submodules, or `module` as a `from` import?"""
+        query = """
+            SELECT r.repo_name, f.path, i.module, i.name, i.alias, i.lineno
+            FROM parsed.imports i
+            JOIN parsed.files f USING (repo_id, file_id)
+            JOIN parsed.repos r USING (repo_id)
+            WHERE (i.module = $module OR starts_with(i.module, $module || '.') OR i.module || '.' || i.name = $module)
+              AND ($repo_name IS NULL OR r.repo_name = $repo_name)
+            ORDER BY r.repo_name, f.path, i.lineno
+        """
+        return _rows_as_dicts(self.cursor().execute(query, {"module": module, "repo_name": repo_name}))
+
+
+class RepoWriter:
+    """Context manager that writes one repository's parse results in a single transaction.
+
+    `add(filepath, record)` buffers rows; every `batch_files` files they are bulk-inserted
+    (through a registered DataFrame) into temporary staging tables private to the writer's
+    cursor, so any number of repositories can be parsed at once. Leaving the block takes
+    the store's write lock only to swap the staged rows in and commit; on error the
+    staged rows are dropped and the store is untouched.
+    """
+
+    def __init__(self, store: ParseStore, repo_name: str, repo_path: str, commit: Optional[str], parser_version: str, removed, batch_files: int):
+        self.store = store
+        self.repo_name = repo_name
+        self.repo_path = repo_path
+        self.commit = commit
+        self.parser_version = parser_version
+        self.removed = removed
+        self.batch_files = batch_files
+        self._pending = []
+
+    def __enter__(self):
+        # Staged rows use the staging sequence number as file_id; real ids are assigned at commit
+        self.cursor = self.store.cursor()
+        for table in ("files", *FACT_TABLES):
+            self.cursor.execute(f"CREATE OR REPLACE TEMP TABLE stage_{table} AS SELECT * FROM parsed.{table} LIMIT 0")
+        self.staged_files = 0
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            if exc_type is None:
+                self._flush()
+                with self.store.write_lock:
+                    self.cursor.begin()
+                    try:
+                        self._swap_in()
+                        self.cursor.commit()
+                    except Exception:
+                        self.cursor.rollback()
+                        raise
+                logging.info(f"🗄️ Stored parse of {self.repo_name} @ {self.commit} in {self.store.path}")
+        finally:
+            for table in ("files", *FACT_TABLES):
+                self.cursor.execute(f"DROP TABLE IF EXISTS stage_{table}")
+            self.cursor.close()
+
+    def add(self, filepath: str, record: Dict):
+        self._pending.append((self._relative(filepath), record))
+        if len(self._pending) >= self.batch_files:
+            self._flush()
+
+    def _relative(self, filepath: str) -> str:
+        return os.path.relpath(filepath, self.repo_path).replace(os.sep, "/")
+
+    def _flush(self):
+        if not self._pending:
+            return
+        file_rows = []
+        fact_rows = {table: [] for table in FACT_TABLES}
+        for path, record in self._pending:
+            seq = self.staged_files
+            self.staged_files += 1
+            file_rows.append((0, seq, path))
+            for table, (key, _) in FACT_TABLES.items():
+                fact_rows[table].extend((0, seq, ordinal, *fact) for ordinal, fact in enumerate(record[key]))
+
+        self._insert("stage_files", ["repo_id", "file_id", "path"], file_rows)
+        for table, (_, columns) in FACT_TABLES.items():
+            self._insert(f"stage_{table}", ["repo_id", "file_id", "ordinal", *columns], fact_rows[table])
+        self._pending = []
+
+    def _insert(self, table: str, columns: List[str], rows: List[tuple]):
+        if not rows:
+            return
+        column_list = ", ".join(columns)
+        self.cursor.register("batch_rows", pd.DataFrame(rows, columns=columns))
+        self.cursor.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM batch_rows")
+        self.cursor.unregister("batch_rows")
+
+    # ============================
+    # 📌 Commit (under the store's write lock)
+    # ============================
+    def _swap_in(self):
+        repo = self.store.get_repo(self.repo_name)
+        if repo is None:
+            self.repo_id = self.cursor.execute("SELECT COALESCE(MAX(repo_id), 0) + 1 FROM parsed.repos").fetchone()[0]
+            self.version = 0
+        else:
+            self.repo_id, self.version = repo["repo_id"], repo["version"]
+
+        staged = self.cursor.execute("SELECT file_id, path FROM stage_files ORDER BY file_id").fetchall()
+        existing = {}
+        if self.removed is None:
+            self._delete_files(None)
+        else:
+            if self.removed:
+                self._delete_files([self._relative(path) for path in self.removed])
+            # Files that are already stored keep their id (and position); their old facts are replaced
+            existing = dict(self.cursor.execute(
+                "SELECT path, file_id FROM parsed.files WHERE repo_id = ? AND list_contains(?, path)",
+                [self.repo_id, [path for _, path in staged]],
+            ).fetchall())
+            if existing:
+                self._delete_files(list(existing), keep_files=True)
+
+        next_file_id = self.cursor.execute(
+            "SELECT COALESCE(MAX(file_id), -1) + 1 FROM parsed.files WHERE repo_id = ?", [self.repo_id]
+        ).fetchone()[0]
+        id_map = []
+        for seq, path in staged:
+            file_id = existing.get(path)
+            if file_id is None:
+                file_id, next_file_id = next_file_id, next_file_id + 1
+            id_map.append((seq, file_id, path in existing))
+
+        self.cursor.register("id_map", pd.DataFrame(id_map, columns=["seq", "file_id", "stored"]))
+        try:
+            self.cursor.execute(
+                "INSERT INTO parsed.files (repo_id, file_id, path) "
+                "SELECT ?, m.file_id, s.path FROM stage_files s JOIN id_map m ON s.file_id = m.seq WHERE NOT m.stored "
+                "ORDER BY m.file_id",
+                [self.repo_id],
+            )
+            for table, (_, columns) in FACT_TABLES.items():
+                column_list = ", ".join(columns)
+                staged_columns = ", ".join(f"s.{column}" for column in columns)
+                self.cursor.execute(
+                    f"INSERT INTO parsed.{table} (repo_id, file_id, ordinal, {column_list}) "
+                    f"SELECT ?, m.file_id, s.ordinal, {staged_columns} FROM stage_{table} s JOIN id_map m ON s.file_id = m.seq",
+                    [self.repo_id],
+                )
+        finally:
+            self.cursor.unregister("id_map")
+        self._save_repo_row()
+
+    def _delete_files(self, paths: Optional[List[str]], keep_files: bool = False):
+        """Deletes the fact rows (and, unless `keep_files`, the file rows) of `paths`; None means every file."""
+        if paths is None:
+            condition, params = "repo_id = ?", [self.repo_id]
+        else:
+            condition = "repo_id = ? AND file_id IN (SELECT file_id FROM parsed.files WHERE repo_id = ? AND list_contains(?, path))"
+            params = [self.repo_id, self.repo_id, paths]
+        for table in FACT_TABLES:
+            self.cursor.execute(f"DELETE FROM parsed.{table} WHERE {condition}", params)
+        if not keep_files:
+            self.cursor.execute(f"DELETE FROM parsed.files WHERE {condition}", params)
+
+    def _save_repo_row(self):
+        file_count = self.cursor.execute("SELECT COUNT(*) FROM parsed.files WHERE repo_id = ?", [self.repo_id]).fetchone()[0]
+        self.cursor.execute(
+            """
+            INSERT OR REPLACE INTO parsed.repos
+                (repo_id, repo_name, repo_path, commit_sha, parser_version, version, file_count, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [self.repo_id, self.repo_name, self.repo_path, self.commit, self.parser_version,
+             self.version + 1, file_count, datetime.now(timezone.utc).replace(tzinfo=None)],
+        )
@@ -0,0 +1,152 @@
+import json
+import base64
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import serializers
+
+KINDS = ("functions", "classes", "imports")
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DEFAULT_MAX_CACHED_REPOS = 8
+
+
+def repo_version_key(repo: Dict) -> Tuple:
+    """Identifies one stored state of a repository; every store write bumps `version` and `updated_at`."""
+    return repo["repo_id"], repo["version"], str(repo["updated_at"])
+
+
+# ============================
+# 📌 In-Process Cache
+# ============================
+@dataclass
+class CachedRepo:
+    """A repository's stored parse, loaded once per store version."""
+    key: Tuple
+    entries: List[Dict]  # One dict per file, sorted by relative path
+    paths: List[str]  # `entry["path"]` of every entry, for bisecting
+    parse_order: List[Dict]  # The same entries in the order the files were parsed
+    repo: Dict  # The `ParseStore.get_repo` row of this version
+    full: Optional[Dict] = None  # Legacy `parse_repository` dictionary, built on first use
+    encoded: Dict[Tuple[str, bool], bytes] = field(default_factory=dict)  # `full` per (serializer, interned)
+
+
+class ParsedDataCache:
+    """Keeps the parsed files of the most recently requested repositories in memory.
+
+    An entry is reused for as long as the repository's store version is unchanged, so
+    a poll costs one metadata lookup instead of reloading every row.
+    """
+
+    def __init__(self, store, max_repos: int = DEFAULT_MAX_CACHED_REPOS):
+        self.store = store
+        self.max_repos = max_repos
+        self._repos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, repo: Dict) -> CachedRepo:
+        """Returns the cached parse of `repo` (a `ParseStore.get_repo` row), loading it if stale."""
+        key = repo_version_key(repo)
+        with self._lock:
+            cached = self._repos.get(repo["repo_name"])
+            if cached is not None and cached.key == key:
+                self._repos.move_to_end(repo["repo_name"])
+                return cached
+
+        # Loaded outside the lock; concurrent misses for the same version load identical data
+        parse_order = self.store.load_file_entries(repo, sort=False)
+        entries = sorted(parse_order, key=lambda entry: entry["path"])
+        cached = CachedRepo(key, entries, [entry["path"] for entry in entries], parse_order, repo)
+        with self._lock:
+            self._repos[repo["repo_name"]] = cached
+            self._repos.move_to_end(repo["repo_name"])
+            while len(self._repos) > self.max_repos:
+                self._repos.popitem(last=False)
+        return cached
+
+    def full(self, repo: Dict) -> Dict:
+        """Returns the legacy whole-repository dictionary of `repo`, built from (and cached with) its entries."""
+        cached = self.get(repo)
+        if cached.full is None:
+            cached.full = self.store.repo_dict(cached.repo, cached.parse_order)
+        return cached.full
+
+    def full_encoded(self, repo: Dict, serializer: serializers.Serializer, interned: bool = False) -> bytes:
+        """Returns `full(repo)` encoded with `serializer`; each encoding is done once per store version."""
+        cached = self.get(repo)
+        key = (serializer.name, interned)
+        if key not in cached.encoded:
+            if cached.full is None:
+                cached.full = self.store.repo_dict(cached.repo, cached.parse_order)
+            full = cached.full
+            cached.encoded[key] = serializer.dumps(serializers.intern_paths(full) if interned else full)
+        return cached.encoded[key]
+
+    def clear(self):
+        with self._lock:
+            self._repos.clear()
+
+
+# ============================
+# 📌 Filtering & Pagination
+# ============================
+def encode_cursor(path: str) -> str:
+    """Opaque cursor pointing just past the file at `path`."""
+    return base64.urlsafe_b64encode(json.dumps({"after": path}).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Returns the path encoded in `cursor`. Raises `ValueError` for a malformed cursor."""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["after"]
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def page(cached: CachedRepo, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+         path_prefix: Optional[str] = None, kind: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """Returns `(items, next_cursor)` for one page of files, ordered by path.
+
+    `path_prefix` keeps files under a relative path prefix; `kind` keeps only files that
+    define or import something of that kind and trims each item to that list. Cursors
+    are keyed by path, so they stay valid when the repository is reparsed.
+    """
+    paths = cached.paths
+    start = bisect.bisect_left(paths, path_prefix) if path_prefix else 0
+    end = bisect.bisect_left(paths, path_prefix + "\U0010ffff") if path_prefix else len(paths)
+    if cursor:
+        start = max(start, bisect.bisect_right(paths, decode_cursor(cursor)))
+
+    items = []
+    index = start
+    while index < end and len(items) < limit:
+        entry = cached.entries[index]
+        index += 1
+        if kind is None:
+            items.append(entry)
+        elif entry[kind]:
+            items.append({"path": entry["path"], "file": entry["file"], kind: entry[kind]})
+
+    # Only hand out a cursor if something is left in range (a filtered tail may still be empty)
+    next_cursor = encode_cursor(cached.paths[index - 1]) if items and index < end else None
+    return items, next_cursor
+
+
+# ============================
+# 📌 Conditional Requests
+# ============================
+def make_etag(repo: Dict, **params) -> str:
+    """Strong ETag for a response derived from `repo`'s stored version and the request parameters."""
+    material = json.dumps([repo_version_key(repo), sorted(params.items())], default=str)
+    return '"' + hashlib.blake2b(material.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluates an `If-None-Match` header against `etag` (weak comparison, `*` matches anything)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
@@ -1,75 +1,335 @@
 import os
-import ast
-import json
 import logging
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+import ast_extractor
+import serializers
+from parse_cache import ParseCache, DEFAULT_CACHE_PATH, hash_content
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Bump whenever the extraction output changes so cached results are invalidated
+PARSER_VERSION = "4"
+
+# Parallel parsing settings
+DEFAULT_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_FILES = 200  # Below this, process start-up costs more than it saves
+CHUNKS_PER_WORKER = 4  # Several chunks per worker keeps the pool balanced
+CACHE_BATCH_SIZE = 500  # Files per parse-cache read/write round
+
+# Function to extract every fact from a single Python file
+def extract_facts(filepath):
+    """Extracts definitions, classes, imports and calls from a Python file as an `ast_extractor` record.
+
+    Unparseable files yield an empty record (the error is logged).
+    """
+    try:
+        return ast_extractor.extract_file(filepath).to_record()
+    except Exception as e:
+        logging.error(f"❌ Failed to parse {filepath}: {e}")
+        return ast_extractor.FileFacts(filepath).to_record()
+
+def summarize_facts(record):
+    """Reduces an `extract_facts` record to the `(functions, classes, imports)` name lists."""
+    functions = [func[0] for func in record["functions"]]
+    classes = [cls[0] for cls in record["classes"]]
+    imports = [module if name is None else name for module, name, *_ in record["imports"]]
+    return functions, classes, imports
+
 # Function to parse a single Python file
 def parse_file(filepath):
     """Parses a Python file to extract functions, classes, and imports."""
+    return summarize_facts(extract_facts(filepath))
+
+# Function to collect the Python files of a repository
+def collect_python_files(repo_path):
+    """Walks a repository directory and returns the normalized paths of all Python files in walk order."""
+    python_files = []
+    for root, _, files in os.walk(repo_path):
+        for file_name in files:
+            if file_name.endswith('.py'):
+                python_files.append(os.path.normpath(os.path.join(root, file_name)))  # Normalize paths
+    return python_files
+
+# Function to run extract_facts over a batch of files, on `executor` when the batch is large enough
+def _extract_batch(filepaths, executor=None, workers=1):
+    if executor is None or len(filepaths) < PARALLEL_MIN_FILES:
+        return map(extract_facts, filepaths)
+    chunksize = max(1, len(filepaths) // (workers * CHUNKS_PER_WORKER))
+    # `map` yields results in submission order, so the output stays deterministic
+    return executor.map(extract_facts, filepaths, chunksize=chunksize)
+
+# Function to run extract_facts over many files, optionally on a process pool
+def iter_extract_files(filepaths, workers=None):
+    """Extracts a list of Python files and yields their records in the same order as `filepaths`.
+
+    Small batches (or `workers=1`) are parsed serially; larger ones are spread over a
+    process pool in chunks so that each worker receives several files per round-trip.
+    Results are yielded as soon as they are ready, so callers can stream them.
+    """
+    workers = DEFAULT_WORKERS if workers is None else max(1, workers)
+
+    if workers == 1 or len(filepaths) < PARALLEL_MIN_FILES:
+        yield from _extract_batch(filepaths)
+        return
+
+    logging.info(f"⚙️ Parsing {len(filepaths)} files on {workers} workers")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from _extract_batch(filepaths, executor, workers)
+
+# Function to compute the parse-cache key of a file
+def _cache_key(filepath):
     try:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            tree = ast.parse(file.read(), filename=filepath)
-    except Exception as e:
-        logging.error(f"❌ Failed to parse {filepath}: {e}")
-        return [], [], []
+        with open(filepath, "rb") as file:
+            return ParseCache.make_key(PARSER_VERSION, hash_content(file.read()))
+    except OSError:
+        return None  # Unreadable files fall through to extract_facts, which logs the error
+
+# Function to extract files, reusing cached records for unchanged content
+def iter_extract_files_cached(filepaths, cache, workers=None):
+    """Yields records for `filepaths`, only running `extract_facts` on content not already in `cache`.
 
-    functions, classes, imports = [], [], []
+    Files are handled in windows of `CACHE_BATCH_SIZE`: each window is read and hashed,
+    its cached records are fetched in one lookup and only the files missing from that
+    lookup are parsed, so the first records are yielded before later files are read and
+    memory stays bounded. Fresh records are stored once their window is done; as every
+    hit is already in hand by then, evictions never affect the window being yielded.
+    A process pool is started the first time a window has enough misses to need one.
+    """
+    workers = DEFAULT_WORKERS if workers is None else max(1, workers)
+    executor = None
+    hits = misses = 0
+    try:
+        for start in range(0, len(filepaths), CACHE_BATCH_SIZE):
+            window = filepaths[start:start + CACHE_BATCH_SIZE]
+            keys = [_cache_key(filepath) for filepath in window]
+            cached = cache.get_many({key for key in keys if key})
+            missing = [filepath for filepath, key in zip(window, keys) if key not in cached]
+            hits += len(window) - len(missing)
+            misses += len(missing)
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            functions.append(node.name)
-        elif isinstance(node, ast.ClassDef):
-            classes.append(node.name)
-        elif isinstance(node, ast.Import) or isinstance(node, ast.ImportFrom):
-            for name in node.names:
-                imports.append(name.name)
+            if executor is None and workers > 1 and len(missing) >= PARALLEL_MIN_FILES:
+                logging.info(f"⚙️ Parsing cache misses on {workers} workers")
+                executor = ProcessPoolExecutor(max_workers=workers)
+            parsed = _extract_batch(missing, executor, workers)
 
-    return functions, classes, imports
+            fresh = []
+            for key in keys:
+                if key in cached:
+                    yield cached[key]
+                else:
+                    result = next(parsed)
+                    if key:
+                        fresh.append((key, result))
+                    yield result
+            cache.put_many(fresh)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        logging.info(f"♻️ Parse cache: {hits} hits, {misses} misses")
+
+# Function to extract an explicit list of files
+def iter_extract_paths(filepaths, workers=None, use_cache=True, cache_path=DEFAULT_CACHE_PATH):
+    """Yields `(filepath, record)` for each of `filepaths`, in order.
+
+    `workers` sets the size of the process pool (defaults to the CPU count); small
+    batches are always parsed serially. With `use_cache`, per-file results are kept
+    in an on-disk cache at `cache_path` and only changed files are re-parsed.
+    """
+    cache = ParseCache(cache_path) if use_cache else None
+    try:
+        if cache:
+            records = iter_extract_files_cached(filepaths, cache, workers=workers)
+        else:
+            records = iter_extract_files(filepaths, workers=workers)
+
+        # Drive `records` to exhaustion (rather than zipping) so its final cache write runs
+        for i, record in enumerate(records):
+            yield filepaths[i], record
+    finally:
+        if cache:
+            cache.close()
+
+# Function to parse an explicit list of files
+def iter_parse_paths(filepaths, workers=None, use_cache=True, cache_path=DEFAULT_CACHE_PATH):
+    """Yields `(filepath, functions, classes, imports)` for each of `filepaths`, in order.
+
+    Accepts the same options as `iter_extract_paths`.
+    """
+    for filepath, record in iter_extract_paths(filepaths, workers, use_cache, cache_path):
+        yield (filepath, *summarize_facts(record))
+
+# Function to parse a repository directory file by file
+def iter_parse_repository(repo_path, workers=None, use_cache=True, cache_path=DEFAULT_CACHE_PATH):
+    """Yields `(filepath, functions, classes, imports)` for each Python file of a repository, in walk order.
+
+    Accepts the same options as `iter_parse_paths`.
+    """
+    if not os.path.exists(repo_path):
+        logging.error(f"❌ Repository path {repo_path} does not exist.")
+        return
+
+    yield from iter_parse_paths(collect_python_files(repo_path), workers, use_cache, cache_path)
+    logging.info("✅ Repository parsing complete.")
 
 # Function to parse a repository directory
-def parse_repository(repo_path):
-    """Walks through a repository directory, parses each Python file, and returns structured JSON data."""
+def parse_repository(repo_path, workers=None, use_cache=True, cache_path=DEFAULT_CACHE_PATH):
+    """Walks through a repository directory, parses each Python file, and returns structured JSON data.
+
+    The result records the repository path, the git commit it was built from (None
+    outside a git checkout) and the parser version, so `reparse_repository` can
+    later patch it. Accepts the same options as `iter_parse_paths`.
+    """
     if not os.path.exists(repo_path):
         logging.error(f"❌ Repository path {repo_path} does not exist.")
         return {"error": "Repository path does not exist"}
 
     repo_data = {
+        "repo_path": repo_path,
+        "commit": git_head(repo_path),
+        "parser_version": PARSER_VERSION,
         "files": [],
         "functions": {},
         "classes": {},
         "imports": {}
     }
 
-    for root, _, files in os.walk(repo_path):
-        for file_name in files:
-            if file_name.endswith('.py'):
-                filepath = os.path.normpath(os.path.join(root, file_name))  # Normalize paths
-                
-                # Parse the file
-                functions, classes, imports = parse_file(filepath)
-
-                # Store parsed data
-                repo_data["files"].append(filepath)
-                repo_data["functions"][filepath] = functions
-                repo_data["classes"][filepath] = classes
-                repo_data["imports"][filepath] = imports
+    for filepath, functions, classes, imports in iter_parse_repository(repo_path, workers, use_cache, cache_path):
+        # Store parsed data
+        repo_data["files"].append(filepath)
+        repo_data["functions"][filepath] = functions
+        repo_data["classes"][filepath] = classes
+        repo_data["imports"][filepath] = imports
 
-    logging.info("✅ Repository parsing complete.")
     return repo_data  # ⬅️ Now returns a structured dictionary instead of a string!
 
-# Function to save parsed data to a JSON file
-def save_parsed_data(parsed_data, output_file="parsed_repo.json"):
-    """Saves parsed JSON data to a file."""
+# ============================
+# 📌 Git-Driven Incremental Reparse
+# ============================
+def _git(repo_path, *args):
+    return subprocess.run(["git", *args], cwd=repo_path, capture_output=True, text=True, check=True).stdout
+
+def git_head(repo_path):
+    """Returns the commit SHA checked out at `repo_path`, or None if it is not a git checkout."""
+    try:
+        return _git(repo_path, "rev-parse", "HEAD").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def git_changed_python_files(repo_path, since):
+    """Returns `(changed, removed)` repo-relative `.py` paths between commit `since` and the working tree.
+
+    Covers committed, uncommitted and untracked changes; renames count as a removal
+    plus a change. A shallow checkout that lacks `since` fetches it from `origin`
+    first. Returns None when git cannot answer (not a checkout, unknown commit).
+    """
     try:
-        with open(output_file, "w", encoding="utf-8") as json_file:
-            json.dump(parsed_data, json_file, indent=4)  # ✅ Use json.dump() for proper formatting
-        logging.info(f"✅ Parsed data saved to {output_file}")
+        try:
+            _git(repo_path, "cat-file", "-e", f"{since}^{{commit}}")
+        except subprocess.CalledProcessError:
+            _git(repo_path, "fetch", "--quiet", "--depth=1", "origin", since)
+
+        diff = _git(repo_path, "diff", "--name-status", "-z", "-M", "--relative", since).split("\0")
+        untracked = _git(repo_path, "ls-files", "-z", "--others").split("\0")
+    except (OSError, subprocess.CalledProcessError) as e:
+        logging.warning(f"⚠️ Cannot diff {repo_path} against {since}: {getattr(e, 'stderr', e)}")
+        return None
+
+    changed, removed = [], []
+    i = 0
+    while i < len(diff) and diff[i]:
+        status = diff[i][0]
+        if status in "RC":  # Rename/copy records carry the old and the new path
+            old_path, new_path = diff[i + 1], diff[i + 2]
+            if status == "R":
+                removed.append(old_path)
+            changed.append(new_path)
+            i += 3
+        else:
+            (removed if status == "D" else changed).append(diff[i + 1])
+            i += 2
+    changed.extend(path for path in untracked if path)
+
+    changed = list(dict.fromkeys(path for path in changed if path.endswith(".py")))
+    removed = [path for path in removed if path.endswith(".py")]
+    return changed, removed
+
+def plan_reparse(repo_path, since):
+    """Returns `(head, changed, removed)` file paths (as produced by `collect_python_files`) since commit `since`.
+
+    Returns None when an incremental reparse is not possible.
+    """
+    head = git_head(repo_path)
+    changes = git_changed_python_files(repo_path, since) if since and head else None
+    if changes is None:
+        return None
+
+    to_path = lambda rel: os.path.normpath(os.path.join(repo_path, rel))
+    removed = {to_path(rel) for rel in changes[1]}
+    changed = [to_path(rel) for rel in changes[0]]
+    removed.update(path for path in changed if not os.path.isfile(path))
+    changed = [path for path in changed if path not in removed]
+    logging.info(f"🔀 Changes in {repo_path} since {since[:8]}: {len(changed)} changed, {len(removed)} removed")
+    return head, changed, removed
+
+def reparse_repository(repo_path, previous, workers=None, use_cache=True, cache_path=DEFAULT_CACHE_PATH):
+    """Brings a previous `parse_repository` result up to date with the current checkout.
+
+    Only the files git reports as changed, added, deleted or renamed since
+    `previous["commit"]` are re-parsed or dropped; everything else is reused, so the
+    cost follows the size of the diff. New files are appended after the existing ones.
+    Falls back to a full parse when the previous result has no commit, came from
+    another parser version or git cannot produce the diff.
+    """
+    changes = None
+    if previous.get("parser_version") == PARSER_VERSION:
+        changes = plan_reparse(repo_path, previous.get("commit"))
+    if changes is None:
+        logging.info(f"🔁 Full reparse of {repo_path}")
+        return parse_repository(repo_path, workers, use_cache, cache_path)
+
+    head, changed, removed = changes
+    repo_data = {
+        "repo_path": repo_path,
+        "commit": head,
+        "parser_version": PARSER_VERSION,
+        "files": [path for path in previous["files"] if path not in removed],
+        "functions": {path: value for path, value in previous["functions"].items() if path not in removed},
+        "classes": {path: value for path, value in previous["classes"].items() if path not in removed},
+        "imports": {path: value for path, value in previous["imports"].items() if path not in removed},
+    }
+
+    known_files = set(repo_data["functions"])
+    for filepath, functions, classes, imports in iter_parse_paths(changed, workers, use_cache, cache_path):
+        if filepath not in known_files:
+            repo_data["files"].append(filepath)
+        repo_data["functions"][filepath] = functions
+        repo_data["classes"][filepath] = classes
+        repo_data["imports"][filepath] = imports
+
+    return repo_data
+
+# Function to save parsed data to a file
+def save_parsed_data(parsed_data, output_file="parsed_repo.json", format=None, interned=False):
+    """Saves parsed data to a file.
+
+    The format follows the extension (`.json` is written as compact JSON, `.msgpack` as
+    MessagePack) unless `format` names a serializer, e.g. `"json-pretty"` for the old
+    indented output. `interned=True` stores each directory path once.
+    """
+    try:
+        serializer = serializers.get_serializer(format) if format else None
+        size = serializers.save(parsed_data, output_file, serializer, interned=interned)
+        logging.info(f"✅ Parsed data saved to {output_file} ({size} bytes)")
     except Exception as e:
         logging.error(f"❌ Failed to save parsed data: {e}")
 
+def load_parsed_data(input_file="parsed_repo.json", format=None):
+    """Loads a file written by `save_parsed_data`."""
+    serializer = serializers.get_serializer(format) if format else None
+    return serializers.load(input_file, serializer)
+
 # Example usage
 if __name__ == "__main__":
     repo_path = "./backend/cloned_repos"  # Change to actual repo path
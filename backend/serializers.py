@@ -0,0 +1,205 @@
+import os
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard library encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional: the msgpack format is only offered when installed
+    msgpack = None
+
+INTERNED_LAYOUT = "interned"
+
+
+# ============================
+# 📌 Serializers
+# ============================
+class Serializer(ABC):
+    """Encodes parse results to bytes and back. Subclasses set `name`, `media_type` and `extension`."""
+    name = ""
+    media_type = ""
+    extension = ""
+
+    @abstractmethod
+    def dumps(self, data) -> bytes:
+        ...
+
+    @abstractmethod
+    def loads(self, payload: bytes):
+        ...
+
+
+class JsonSerializer(Serializer):
+    """Compact JSON through the standard library (no indentation, no spaces)."""
+    name = "json"
+    media_type = "application/json"
+    extension = ".json"
+
+    def dumps(self, data) -> bytes:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, payload: bytes):
+        return json.loads(payload)
+
+
+class PrettyJsonSerializer(JsonSerializer):
+    """The historical `indent=4` output, for files meant to be read by people."""
+    name = "json-pretty"
+
+    def dumps(self, data) -> bytes:
+        return json.dumps(data, indent=4).encode("utf-8")
+
+
+class OrjsonSerializer(JsonSerializer):
+    """Compact JSON through orjson; same documents as `JsonSerializer`, several times faster."""
+    name = "orjson"
+
+    def dumps(self, data) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self, payload: bytes):
+        return orjson.loads(payload)
+
+
+class MsgpackSerializer(Serializer):
+    """Binary MessagePack: smallest payloads and fastest decoding."""
+    name = "msgpack"
+    media_type = "application/x-msgpack"
+    extension = ".msgpack"
+
+    def dumps(self, data) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, payload: bytes):
+        return msgpack.unpackb(payload, raw=False)
+
+
+SERIALIZERS = {serializer.name: serializer for serializer in [JsonSerializer(), PrettyJsonSerializer()]}
+if orjson is not None:
+    SERIALIZERS[OrjsonSerializer.name] = OrjsonSerializer()
+if msgpack is not None:
+    SERIALIZERS[MsgpackSerializer.name] = MsgpackSerializer()
+
+DEFAULT_JSON = SERIALIZERS["orjson" if orjson is not None else "json"]
+
+# Media types accepted in `Accept`, mapped to the serializer answering them
+MEDIA_TYPES = {"application/json": DEFAULT_JSON}
+if msgpack is not None:
+    MEDIA_TYPES["application/x-msgpack"] = MEDIA_TYPES["application/msgpack"] = SERIALIZERS["msgpack"]
+
+
+def get_serializer(name: str) -> Serializer:
+    """Returns the serializer registered as `name`. Raises `ValueError` if unknown or not installed."""
+    try:
+        return SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unsupported format '{name}'. Available: {', '.join(SERIALIZERS)}") from None
+
+
+def for_path(path: str) -> Serializer:
+    """Picks a serializer from a file extension; `.json` gets the fastest compact JSON encoder."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == MsgpackSerializer.extension:
+        return get_serializer(MsgpackSerializer.name)
+    return DEFAULT_JSON
+
+
+def negotiate(accept: Optional[str]) -> Optional[Serializer]:
+    """Chooses a serializer for an HTTP `Accept` header, honoring q-values.
+
+    A missing header or a wildcard gets JSON; None means nothing acceptable is offered (406).
+    """
+    if not accept:
+        return DEFAULT_JSON
+
+    ranked = []
+    for position, item in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranked.append((-quality, position, media_type.lower()))
+
+    for _, _, media_type in sorted(ranked):
+        if media_type in MEDIA_TYPES:
+            return MEDIA_TYPES[media_type]
+        if media_type in ("*/*", "application/*"):
+            return DEFAULT_JSON
+    return None
+
+
+# ============================
+# 📌 Path-Prefix Interning
+# ============================
+def intern_paths(repo_data: Dict) -> Dict:
+    """Rewrites a `parser.parse_repository` dictionary so each directory path is stored once.
+
+    `files` becomes `[dir index, basename]` pairs into `dirs`, and `functions`, `classes`
+    and `imports` become lists aligned with `files` instead of dicts keyed by full path.
+    """
+    files = list(repo_data["files"])
+    listed = set(files)
+    files.extend(path for path in repo_data["functions"] if path not in listed)
+
+    dir_index, dirs, interned_files = {}, [], []
+    for path in files:
+        directory, basename = os.path.split(path)
+        if directory not in dir_index:
+            dir_index[directory] = len(dirs)
+            dirs.append(directory)
+        interned_files.append([dir_index[directory], basename])
+
+    interned = {key: value for key, value in repo_data.items() if key not in ("files", "functions", "classes", "imports")}
+    interned.update({
+        "layout": INTERNED_LAYOUT,
+        "dirs": dirs,
+        "files": interned_files,
+        "listed_files": len(repo_data["files"]),
+    })
+    for kind in ("functions", "classes", "imports"):
+        interned[kind] = [repo_data[kind].get(path, []) for path in files]
+    return interned
+
+
+def expand_paths(interned: Dict) -> Dict:
+    """Inverse of `intern_paths`; dictionaries without the interned layout are returned unchanged."""
+    if interned.get("layout") != INTERNED_LAYOUT:
+        return interned
+
+    dirs = interned["dirs"]
+    files = [os.path.join(dirs[dir_id], basename) for dir_id, basename in interned["files"]]
+    repo_data = {key: value for key, value in interned.items() if key not in ("layout", "dirs", "files", "listed_files", "functions", "classes", "imports")}
+    repo_data["files"] = files[:interned["listed_files"]]
+    for kind in ("functions", "classes", "imports"):
+        repo_data[kind] = dict(zip(files, interned[kind]))
+    return repo_data
+
+
+# ============================
+# 📌 Files
+# ============================
+def save(data, path: str, serializer: Optional[Serializer] = None, interned: bool = False):
+    """Writes `data` (a parse result) to `path`, optionally with interned paths."""
+    serializer = serializer or for_path(path)
+    payload = serializer.dumps(intern_paths(data) if interned else data)
+    with open(path, "wb") as f:
+        f.write(payload)
+    return len(payload)
+
+
+def load(path: str, serializer: Optional[Serializer] = None):
+    """Reads a file written by `save`, expanding interned paths."""
+    serializer = serializer or for_path(path)
+    with open(path, "rb") as f:
+        return expand_paths(serializer.loads(f.read()))
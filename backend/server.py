@@ -1,14 +1,23 @@
 import os
 import sys
 import json
-import stat
-import shutil
 import subprocess
 import logging
-from pydantic import BaseModel
-from fastapi import FastAPI, HTTPException
+import threading
+from collections import defaultdict
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response, StreamingResponse
+import jobs
+import git_mirror
+import parse_store
+import parsed_views
+import serializers
+import symbol_index
+import call_graph
+import file_classifier
 
 # ✅ Ensure the `parser/` directory is in the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "parser")))
@@ -21,6 +30,10 @@ try:
 except ImportError:
     raise HTTPException(status_code=500, detail="Failed to import `parser.py`. Check file location.")
 
+# ✅ The docs query service lives in `languages/`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "languages")))
+import python_llm
+
 # ✅ Initialize FastAPI
 app = FastAPI()
 
@@ -42,6 +55,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],  # ✅ Restrict methods for security
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["ETag"],  # Lets the frontend send If-None-Match on repeat polls
 )
 
 # ============================
@@ -51,28 +65,44 @@ class RepoRequest(BaseModel):
     """Request model for fetching GitHub repository."""
     repo_url: str
 
+class DocsQuery(BaseModel):
+    """Request model for querying the reusable code docs with one or more questions."""
+    questions: List[str] = Field(..., min_length=1, max_length=python_llm.MAX_QUESTIONS)
+    language: Optional[str] = None
+    n_results: int = Field(python_llm.DEFAULT_N_RESULTS, ge=1, le=python_llm.MAX_N_RESULTS)
+
 # ============================
 # 📌 Utility Functions
 # ============================
 BASE_CLONE_DIR = "cloned_repos"
 
+# Parse results, one entry per repository, in DuckDB
+store = parse_store.ParseStore()
+parsed_cache = parsed_views.ParsedDataCache(store)
+symbol_cache = symbol_index.SymbolIndexCache(store)  # Maps the persisted index at startup
+call_graphs = call_graph.CallGraphCache(store)
 
-def remove_readonly(func, path, exc_info):
-    """Helper function to remove read-only files on Windows."""
-    os.chmod(path, stat.S_IWRITE)
-    func(path)
+# prod.file_formats, read once: classifying a repository's files never queries DuckDB
+extension_index = file_classifier.load_index()
 
-def clean_existing_repo(repo_path: str):
-    """Remove an existing repository before cloning."""
-    if os.path.exists(repo_path):
-        try:
-            shutil.rmtree(repo_path, onerror=remove_readonly)
-            print(f"✅ Deleted existing repo: {repo_path}")
-        except PermissionError as e:
-            print(f"❌ Permission Error: {e}")
-            raise HTTPException(status_code=500, detail=f"Failed to delete repo: {e}")
+# Opens the docs collection on first use; keeps query embeddings and results cached across requests
+docs_service = python_llm.DocsQueryService()
+
+# Background jobs run on a bounded pool so clones and parses never block request handlers
+job_queue = jobs.JobQueue(max_workers=int(os.environ.get("JOB_WORKERS", jobs.DEFAULT_MAX_WORKERS)))
 
+# One lock per checkout so concurrent requests never clone/parse the same directory at once
+_repo_locks = defaultdict(threading.Lock)
+_repo_locks_guard = threading.Lock()
 
+def repo_lock(repo_name: str) -> threading.Lock:
+    """Return the lock guarding the checkout of `repo_name`."""
+    with _repo_locks_guard:
+        return _repo_locks[repo_name]
+
+def repo_name_from_url(repo_url: str) -> str:
+    """Derive the checkout name from a repository URL."""
+    return repo_url.split("/")[-1].replace(".git", "")
 
 def check_git_installed():
     """Ensure Git is installed on the system."""
@@ -81,17 +111,22 @@ def check_git_installed():
     except FileNotFoundError:
         raise HTTPException(status_code=500, detail="Git is not installed. Please install Git.")
 
-def clone_github_repo(repo_url: str, repo_path: str):
-    """Clone a GitHub repository to a local directory."""
+def clone_github_repo(repo_url: str, repo_path: str) -> str:
+    """Bring a local checkout up to date with a GitHub repository and return its commit SHA.
+
+    The remote is fetched into a persistent bare mirror and the checkout is updated
+    (or shallow-cloned) from that mirror, so re-fetching an unchanged repo is cheap.
+    """
     try:
-        result = subprocess.run(
-            ["git", "clone", repo_url, repo_path],
-            capture_output=True, text=True, check=True
-        )
-        print("✅ Git Clone Success:", result.stdout)
+        commit = git_mirror.checkout(repo_url, repo_path)
+        print(f"✅ Git Checkout Success: {repo_path} @ {commit}")
+        return commit
     except subprocess.CalledProcessError as e:
         print("❌ Git Clone Error:", e.stderr)
         raise HTTPException(status_code=500, detail=f"Git Clone Failed: {e.stderr}")
+    except OSError as e:
+        print(f"❌ Checkout Error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to replace existing checkout: {e}")
 
 def list_repository_files(repo_path: str):
     """Return a list of all files inside the cloned repository."""
@@ -104,17 +139,81 @@ def list_repository_files(repo_path: str):
             file_list.append(os.path.relpath(os.path.join(root, file), repo_path))
     return file_list
 
+def ingest_repository(repo_path: str, incremental: bool = True):
+    """Parse a repository into the parse store, yielding `(filepath, record)` for each parsed file.
+
+    When the store already holds this checkout (same path and parser version), only the
+    files changed since the stored commit are parsed and patched in; otherwise the
+    repository's rows are replaced by a full parse.
+    """
+    repo_name = os.path.basename(os.path.normpath(repo_path))
+    stored = store.get_repo(repo_name)
+
+    plan = None
+    if incremental and stored and stored["repo_path"] == repo_path and stored["parser_version"] == parser.PARSER_VERSION:
+        plan = parser.plan_reparse(repo_path, stored["commit_sha"])
+
+    if plan:
+        commit, filepaths, removed = plan
+    else:
+        commit, filepaths, removed = parser.git_head(repo_path), parser.collect_python_files(repo_path), None
+
+    with store.writer(repo_name, repo_path, commit, parser.PARSER_VERSION, removed=removed) as writer:
+        for filepath, record in parser.iter_extract_paths(filepaths):
+            writer.add(filepath, record)
+            yield filepath, record
+    symbol_cache.refresh()  # Rebuilt in the background; lookups keep using the previous index meanwhile
+
 def parse_and_save_repo(repo_path: str):
-    """Parse repository using `parser.py` and save the result."""
+    """Parse repository using `parser.py`, store the result and return it."""
     if not os.path.exists(repo_path):
         raise HTTPException(status_code=404, detail="Repository not found")
 
-    parsed_data = parser.parse_repository(repo_path)
+    for _ in ingest_repository(repo_path):
+        pass
 
-    with open("parsed_repo.json", "w") as json_file:
-        json.dump(parsed_data, json_file, indent=4)
+    return store.load_repo_dict(os.path.basename(os.path.normpath(repo_path)))
 
-    return parsed_data
+def clone_and_parse_repo(repo_url: str):
+    """Clone a repository and parse it; runs as a background job."""
+    repo_name = repo_name_from_url(repo_url)
+    repo_path = os.path.join(BASE_CLONE_DIR, repo_name)
+
+    with repo_lock(repo_name):
+        check_git_installed()
+        commit = clone_github_repo(repo_url, repo_path)
+        for _ in ingest_repository(repo_path):
+            pass
+
+    return {
+        "repo_name": repo_name,
+        "commit": commit,
+        "files_parsed": store.get_repo(repo_name)["file_count"],
+        "result_store": store.path,
+        "result_url": f"/get_parsed_data?repo_name={repo_name}",
+    }
+
+def stream_parsed_repo(repo_path: str):
+    """Yield one NDJSON line per parsed file while the repository is still being parsed (and stored).
+
+    Holds the checkout's lock until the stream ends, like the other paths that parse it.
+    """
+    with repo_lock(os.path.basename(os.path.normpath(repo_path))):
+        for filepath, record in ingest_repository(repo_path, incremental=False):
+            functions, classes, imports = parser.summarize_facts(record)
+            yield json.dumps({"file": filepath, "functions": functions, "classes": classes, "imports": imports}) + "\n"
+
+def negotiate_serializer(accept: Optional[str]) -> serializers.Serializer:
+    """Pick the response encoding from the `Accept` header (JSON by default, MessagePack if installed)."""
+    serializer = serializers.negotiate(accept)
+    if serializer is None:
+        raise HTTPException(status_code=406, detail=f"Not acceptable. Supported media types: {', '.join(serializers.MEDIA_TYPES)}.")
+    return serializer
+
+def encoded_response(content, serializer: serializers.Serializer, headers: Optional[dict] = None) -> Response:
+    """Return `content` (or already encoded bytes) with the negotiated media type."""
+    body = content if isinstance(content, bytes) else serializer.dumps(content)
+    return Response(content=body, media_type=serializer.media_type, headers=headers)
 
 # ============================
 # 📌 API Endpoints
@@ -125,10 +224,14 @@ def root():
     return {"message": "Welcome to the Repo Parser API!"}
 
 @app.post("/fetch-repo")
-async def fetch_repo(request: RepoRequest):
-    """Clone a GitHub repository and return its file structure."""
+def fetch_repo(request: RepoRequest):
+    """Clone a GitHub repository and return its file structure.
+
+    Declared as a plain function so FastAPI runs the blocking clone in its threadpool
+    instead of on the event loop.
+    """
     repo_url = request.repo_url
-    repo_name = repo_url.split("/")[-1].replace(".git", "")
+    repo_name = repo_name_from_url(repo_url)
     repo_path = os.path.join(BASE_CLONE_DIR, repo_name)
 
     print(f"🔍 Fetching repository: {repo_url}")
@@ -136,14 +239,12 @@ async def fetch_repo(request: RepoRequest):
     # ✅ Check if Git is installed
     check_git_installed()
 
-    # ✅ Remove existing repo if it exists
-    clean_existing_repo(repo_path)
-
-    # ✅ Clone the repository
-    try:
-        clone_github_repo(repo_url, repo_path)
-    except HTTPException as e:
-        return {"error": str(e.detail)}
+    # ✅ Clone the repository (or update the existing checkout from its mirror)
+    with repo_lock(repo_name):
+        try:
+            commit = clone_github_repo(repo_url, repo_path)
+        except HTTPException as e:
+            return {"error": str(e.detail)}
 
     # ✅ Retrieve file list
     try:
@@ -151,47 +252,201 @@ async def fetch_repo(request: RepoRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list files: {e}")
 
-    return {"repo_name": repo_name, "files": files}
+    return {"repo_name": repo_name, "commit": commit, "files": files}
+
+@app.post("/jobs", status_code=202)
+def submit_job(request: RepoRequest):
+    """Queue a clone+parse job and return its id immediately."""
+    job = job_queue.submit("clone_and_parse", clone_and_parse_repo, repo_url=request.repo_url)
+    return {"job_id": job.id, "state": job.state, "status_url": f"/jobs/{job.id}"}
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Return the state, timings and result location of a background job."""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job.to_dict()
 
 @app.get("/parse/{repo_name}")
-def parse_repository_api(repo_name: str):
-    """Trigger parsing of a repository and return parsed JSON data."""
+def parse_repository_api(repo_name: str, stream: Optional[str] = None, accept: Optional[str] = Header(None)):
+    """Trigger parsing of a repository into the parse store and return parsed JSON data.
+
+    With `?stream=ndjson` the result is streamed as one JSON record per file while
+    parsing runs.
+    """
     repo_path = os.path.join(BASE_CLONE_DIR, repo_name)
 
     if not os.path.exists(repo_path):
         raise HTTPException(status_code=404, detail=f"Repository '{repo_name}' not found.")
 
+    if stream is not None:
+        if stream != "ndjson":
+            raise HTTPException(status_code=400, detail=f"Unsupported stream format '{stream}'. Use 'ndjson'.")
+        return StreamingResponse(stream_parsed_repo(repo_path), media_type="application/x-ndjson")
+
+    serializer = negotiate_serializer(accept)
+
     # ✅ Parse and save data
     try:
-        parsed_data = parse_and_save_repo(repo_path)
+        with repo_lock(repo_name):
+            parsed_data = parse_and_save_repo(repo_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error while parsing repository: {e}")
 
-    return parsed_data
+    return encoded_response(parsed_data, serializer)
 
 
 
 @app.get("/get_parsed_data")
-def get_parsed_data():
-    """Return the latest parsed repository data from the JSON file in a pretty format."""
-    json_file = "parsed_repo.json"
-
-    if not os.path.exists(json_file):
+def get_parsed_data(
+    repo_name: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=parsed_views.MAX_PAGE_SIZE),
+    path_prefix: Optional[str] = None,
+    kind: Optional[str] = None,
+    layout: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Return the stored parse result of `repo_name`, or of the most recently parsed repository.
+
+    Without paging parameters the whole result is returned (`layout=interned` stores each
+    directory once). With `cursor`, `limit`, `path_prefix` or `kind` a page of per-file
+    items is returned instead. The encoding follows `Accept` (JSON or MessagePack).
+    Responses carry an ETag; a matching `If-None-Match` gets an empty 304.
+    """
+    repo = store.get_repo(repo_name) if repo_name else store.latest_repo()
+    if repo is None:
         raise HTTPException(status_code=404, detail="❌ No parsed data available. Run /parse/{repo_name} first.")
+    if kind is not None and kind not in parsed_views.KINDS:
+        raise HTTPException(status_code=400, detail=f"Unsupported kind '{kind}'. Use one of: {', '.join(parsed_views.KINDS)}.")
+    if layout not in (None, serializers.INTERNED_LAYOUT):
+        raise HTTPException(status_code=400, detail=f"Unsupported layout '{layout}'. Use '{serializers.INTERNED_LAYOUT}'.")
+    serializer = negotiate_serializer(accept)
+
+    paged = any(param is not None for param in (cursor, limit, path_prefix, kind))
+    etag = parsed_views.make_etag(
+        repo, cursor=cursor, limit=limit, path_prefix=path_prefix, kind=kind, layout=layout, media_type=serializer.media_type
+    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if parsed_views.etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
 
     try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            parsed_data = json.load(f)  # ✅ Properly loads JSON file
-        return JSONResponse(content=parsed_data, media_type="application/json", indent=4)
-    
-    except json.JSONDecodeError as e:
-        logging.error(f"❌ JSON Decode Error: {e}")
-        raise HTTPException(status_code=500, detail="❌ Corrupted JSON file. Try re-parsing the repository.")
-
+        if not paged:
+            body = parsed_cache.full_encoded(repo, serializer, interned=layout is not None)
+            return encoded_response(body, serializer, headers)
+
+        cached = parsed_cache.get(repo)
+        items, next_cursor = parsed_views.page(cached, cursor, limit or parsed_views.DEFAULT_PAGE_SIZE, path_prefix, kind)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"❌ Unexpected Error: {e}")
         raise HTTPException(status_code=500, detail=f"❌ Internal Server Error: {e}")
 
+    return encoded_response(
+        {
+            "repo_name": repo["repo_name"],
+            "commit": repo["commit_sha"],
+            "version": repo["version"],
+            "items": items,
+            "next_cursor": next_cursor,
+        },
+        serializer,
+        headers,
+    )
+
+@app.get("/repos")
+def list_parsed_repos():
+    """List the repositories in the parse store with their commit and file count."""
+    return store.list_repos()
+
+@app.get("/query/definitions")
+def query_definitions(name: str, repo_name: Optional[str] = None):
+    """Where is function or class `name` defined (optionally within one repository)?"""
+    return {"name": name, "results": store.find_definitions(name, repo_name)}
+
+@app.get("/query/importers")
+def query_importers(module: str, repo_name: Optional[str] = None):
+    """Which files import `module` (optionally within one repository)?"""
+    return {"module": module, "results": store.find_importers(module, repo_name)}
+
+
+def stored_repo_or_404(repo_name: Optional[str]) -> dict:
+    repo = store.get_repo(repo_name) if repo_name else store.latest_repo()
+    if repo is None:
+        raise HTTPException(status_code=404, detail="❌ No parsed data available. Run /parse/{repo_name} first.")
+    return repo
+
+@app.get("/query/calls")
+def query_calls(path: str, repo_name: Optional[str] = None):
+    """Which functions does file `path` call? Each call is resolved to its fully-qualified target."""
+    repo = stored_repo_or_404(repo_name)
+    edges = call_graphs.get(repo).calls_from(path)
+    return {"repo_name": repo["repo_name"], "path": path, "results": [edge._asdict() for edge in edges]}
+
+@app.get("/query/callers")
+def query_callers(target: str, repo_name: Optional[str] = None):
+    """Where is the fully-qualified function or class `target` (or a member of module/class `target`) called?"""
+    repo = stored_repo_or_404(repo_name)
+    edges = call_graphs.get(repo).callers_of(target)
+    return {"repo_name": repo["repo_name"], "target": target, "results": [edge._asdict() for edge in edges]}
+
+@app.get("/symbols")
+def find_symbols(
+    q: str,
+    mode: str = symbol_index.EXACT,
+    case_sensitive: bool = True,
+    repo_name: Optional[str] = None,
+    limit: int = Query(symbol_index.DEFAULT_LIMIT, ge=1, le=1000),
+):
+    """Look up function and class names across every parsed repository (exact or prefix match)."""
+    if mode not in (symbol_index.EXACT, symbol_index.PREFIX):
+        raise HTTPException(status_code=400, detail=f"Unsupported mode '{mode}'. Use '{symbol_index.EXACT}' or '{symbol_index.PREFIX}'.")
+
+    results = symbol_cache.get().lookup(q, mode=mode, case_sensitive=case_sensitive, repo_name=repo_name, limit=limit)
+    return {"query": q, "mode": mode, "case_sensitive": case_sensitive, "results": results}
+
+@app.post("/query/docs")
+def query_docs(request: DocsQuery):
+    """Find the documentation paragraphs closest to each question, optionally in one language only."""
+    try:
+        results = docs_service.query(request.questions, request.language, request.n_results)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except python_llm.DocsUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {
+        "language": request.language,
+        "n_results": request.n_results,
+        "results": [{"question": question, "hits": hits} for question, hits in zip(request.questions, results)],
+    }
+
+@app.get("/classify-files/{repo_name}")
+def classify_repository_files(
+    repo_name: str,
+    files: bool = True,
+    category: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+):
+    """Classify every file of a cloned repository by format category, with aggregate counts.
+
+    Files are matched on their longest extension listed in `prod.file_formats` (so
+    `.tar.gz` before `.gz`). `files=false` returns only the counts; `category` keeps
+    only that category's files in the per-file list.
+    """
+    repo_path = os.path.join(BASE_CLONE_DIR, repo_name)
+    if not os.path.isdir(repo_path):
+        raise HTTPException(status_code=404, detail=f"Repository '{repo_name}' not found.")
+    serializer = negotiate_serializer(accept)
+
+    classification = extension_index.classify(list(file_classifier.iter_repo_files(repo_path)))
+    result = {"repo_name": repo_name, "formats_indexed": len(extension_index), **classification.summary()}
+    if files:
+        result["files"] = classification.files(category)
+    return encoded_response(result, serializer)
 
 @app.options("/fetch-repo")
 async def options_handler():
@@ -0,0 +1,90 @@
+import os
+import csv
+import logging
+import tempfile
+from typing import Dict, Iterable, Sequence, Union
+
+DEFAULT_FLUSH_ROWS = 10_000  # Rows between explicit flushes of the write buffer
+DEFAULT_BUFFER_BYTES = 1 << 20
+
+# `mkstemp` creates files as 0600; committed files keep the mode of the file they replace, or get this one
+DEFAULT_FILE_MODE = 0o644
+
+
+class StreamingCSVWriter:
+    """Writes CSV rows to disk as they are produced, then atomically moves the file into place.
+
+    Rows go to a temporary file next to `path` through a `buffer_bytes` write buffer that
+    is flushed every `flush_rows` rows, so memory stays bounded by the rows of one call.
+    `commit()` fsyncs and renames the file to `path`; `abort()` deletes it, leaving any
+    previous `path` untouched. As a context manager it commits on success and aborts on error.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], fieldnames: Sequence[str], dict_rows: bool = False,
+                 flush_rows: int = DEFAULT_FLUSH_ROWS, buffer_bytes: int = DEFAULT_BUFFER_BYTES):
+        self.path = os.fspath(path)
+        self.flush_rows = flush_rows
+        self.row_count = 0
+        self._unflushed = 0
+
+        fd, self.temp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.path)}.", suffix=".part", dir=os.path.dirname(self.path) or "."
+        )
+        self._file = os.fdopen(fd, "w", newline="", encoding="utf-8", buffering=buffer_bytes)
+        if dict_rows:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(fieldnames))
+            self._writer.writeheader()
+        else:
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(fieldnames)
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def writerows(self, rows: Iterable[Union[Sequence, Dict]]):
+        rows = rows if isinstance(rows, list) else list(rows)
+        self._writer.writerows(rows)
+        self.row_count += len(rows)
+        self._unflushed += len(rows)
+        if self._unflushed >= self.flush_rows:
+            self._file.flush()
+            self._unflushed = 0
+
+    def commit(self) -> str:
+        """Finishes the file and renames it to `path`; returns `path`."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        try:
+            mode = os.stat(self.path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = DEFAULT_FILE_MODE
+        os.chmod(self.temp_path, mode)
+        os.replace(self.temp_path, self.path)
+        logging.info(f"✅ Streamed {self.row_count} rows to {self.path}")
+        return self.path
+
+    def abort(self):
+        """Discards the partial file."""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self._file.closed:
+            return
+        if exc_type is None:
+            try:
+                self.commit()
+            except BaseException:
+                self.abort()  # `commit()` may fail after closing the file, so delete it here
+                raise
+        else:
+            self.abort()
@@ -0,0 +1,270 @@
+import os
+import json
+import shutil
+import logging
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Persisted index location (relative to this file, next to the DuckDB databases)
+DEFAULT_INDEX_DIR = os.environ.get(
+    "SYMBOL_INDEX_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "db", "symbol_index")
+)
+INDEX_FORMAT = 1
+
+KINDS = ("function", "class")
+EXACT, PREFIX = "exact", "prefix"
+DEFAULT_LIMIT = 50
+# Rows of a key range filtered per vectorized step of a lookup: the first step is small so that
+# a lookup with a small limit stops early, later ones grow up to the maximum
+SCAN_CHUNK_MIN, SCAN_CHUNK_MAX = 256, 65_536
+
+# Arrays making up an index; strings are stored as one UTF-8 blob plus offsets so they can be mmapped
+STRING_TABLES = ("names", "keys", "repos", "paths")
+COLUMNS = ("kind", "repo", "path", "lineno")
+
+
+def _pack(strings) -> Dict[str, np.ndarray]:
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    return {"blob": np.frombuffer(b"".join(encoded), dtype=np.uint8), "offsets": offsets}
+
+
+class SymbolIndex:
+    """Read-only index of function and class names -> (repo, file, line) over sorted arrays.
+
+    Symbols are sorted by lowercased name, so exact, prefix and case-insensitive lookups are
+    a binary search for the key range. Case-sensitive and repository filters are applied to
+    that range with vectorized comparisons over the arrays, a chunk at a time, so only the
+    returned rows are decoded. Every array is a flat numpy array; `save()` writes them as
+    `.npy` files and `load()` maps them back without reading them into memory.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict):
+        self.arrays = arrays
+        self.meta = meta
+        self._key_blob, self._key_offsets = arrays["keys_blob"], arrays["keys_offsets"]
+        self._repo_codes = {self._string("repos", code): code for code in range(len(arrays["repos_offsets"]) - 1)}
+
+    def __len__(self) -> int:
+        return len(self.arrays["kind"])
+
+    @property
+    def repo_versions(self) -> Dict[str, int]:
+        return self.meta.get("repo_versions", {})
+
+    # ============================
+    # 📌 Build
+    # ============================
+    @classmethod
+    def build(cls, symbols: pd.DataFrame, repo_versions: Optional[Dict[str, int]] = None) -> "SymbolIndex":
+        """Builds an index from a DataFrame with `name, kind, repo_name, path, lineno` columns."""
+        names = symbols["name"].tolist()
+        keys = [name.lower() for name in names]
+        repo_codes, repos = pd.factorize(symbols["repo_name"])
+        path_codes, paths = pd.factorize(symbols["path"])
+        kind_codes = symbols["kind"].map({kind: code for code, kind in enumerate(KINDS)}).to_numpy(dtype=np.uint8)
+        linenos = symbols["lineno"].to_numpy(dtype=np.uint32)
+
+        # Sort by (key, name, repo, path, line); Python string order equals UTF-8 byte order
+        order = sorted(range(len(names)), key=lambda i: (keys[i], names[i], repos[repo_codes[i]], paths[path_codes[i]], linenos[i]))
+        order = np.asarray(order, dtype=np.int64)
+
+        arrays = {
+            "kind": kind_codes[order],
+            "repo": repo_codes.astype(np.uint32)[order],
+            "path": path_codes.astype(np.uint32)[order],
+            "lineno": linenos[order],
+        }
+        for table, strings in (("names", [names[i] for i in order]), ("keys", [keys[i] for i in order]),
+                               ("repos", list(repos)), ("paths", list(paths))):
+            packed = _pack(strings)
+            arrays[f"{table}_blob"], arrays[f"{table}_offsets"] = packed["blob"], packed["offsets"]
+
+        meta = {"format": INDEX_FORMAT, "symbols": len(names), "repo_versions": repo_versions or {}}
+        return cls(arrays, meta)
+
+    @classmethod
+    def from_store(cls, store) -> "SymbolIndex":
+        """Builds an index over every repository in a `parse_store.ParseStore`."""
+        repo_versions = {repo["repo_name"]: repo["version"] for repo in store.list_repos()}
+        return cls.build(store.load_symbols(), repo_versions)
+
+    # ============================
+    # 📌 Persistence
+    # ============================
+    def save(self, directory: str = DEFAULT_INDEX_DIR):
+        """Writes the index to `directory`, replacing any previous index there."""
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".symbol_index-", dir=parent)
+        for name, array in self.arrays.items():
+            np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+
+        # Swap directories; readers holding maps of the old files keep them until they are dropped
+        retired = None
+        if os.path.exists(directory):
+            retired = tempfile.mkdtemp(prefix=".symbol_index-old-", dir=parent)
+            os.rmdir(retired)
+            os.replace(directory, retired)
+        os.replace(staging, directory)
+        if retired:
+            shutil.rmtree(retired, ignore_errors=True)
+        logging.info(f"💾 Saved symbol index ({len(self)} symbols) to {directory}")
+
+    @classmethod
+    def load(cls, directory: str = DEFAULT_INDEX_DIR, mmap: bool = True) -> Optional["SymbolIndex"]:
+        """Maps a saved index, or returns None if there is none (or it has an older format)."""
+        try:
+            with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("format") != INDEX_FORMAT:
+            return None
+
+        names = [f"{table}_{part}" for table in STRING_TABLES for part in ("blob", "offsets")] + list(COLUMNS)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None) for name in names}
+        return cls(arrays, meta)
+
+    # ============================
+    # 📌 Lookup
+    # ============================
+    def _string(self, table: str, i: int) -> str:
+        offsets = self.arrays[f"{table}_offsets"]
+        return self.arrays[f"{table}_blob"][offsets[i]:offsets[i + 1]].tobytes().decode("utf-8")
+
+    def _key(self, i: int) -> bytes:
+        return self._key_blob[self._key_offsets[i]:self._key_offsets[i + 1]].tobytes()
+
+    def _bisect(self, key: bytes, right: bool = False) -> int:
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = self._key(mid)
+            if mid_key < key or (right and mid_key == key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup(self, query: str, mode: str = EXACT, case_sensitive: bool = True,
+               repo_name: Optional[str] = None, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        """Returns up to `limit` symbols named `query` (`mode="exact"`) or starting with it (`"prefix"`)."""
+        if mode not in (EXACT, PREFIX):
+            raise ValueError(f"Unsupported mode '{mode}'. Use '{EXACT}' or '{PREFIX}'.")
+
+        key = query.lower().encode("utf-8")
+        start = self._bisect(key)
+        # 0xff never occurs in UTF-8, so it sorts after every key starting with `key`
+        end = self._bisect(key, right=True) if mode == EXACT else self._bisect(key + b"\xff")
+
+        repo_code = self._repo_codes.get(repo_name) if repo_name is not None else None
+        if repo_name is not None and repo_code is None:
+            return []
+
+        results = []
+        for i in self._matches(start, end, query.encode("utf-8") if case_sensitive else None, mode == EXACT, repo_code):
+            results.append({
+                "name": self._string("names", i),
+                "kind": KINDS[self.arrays["kind"][i]],
+                "repo_name": self._string("repos", int(self.arrays["repo"][i])),
+                "path": self._string("paths", int(self.arrays["path"][i])),
+                "lineno": int(self.arrays["lineno"][i]),
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+    def _matches(self, start: int, end: int, name: Optional[bytes], exact: bool, repo_code: Optional[int]):
+        """Yields the rows of `[start, end)` in repository `repo_code` whose name equals (or, unless
+        `exact`, starts with) the UTF-8 bytes `name`; None skips that filter."""
+        names_blob, names_offsets = self.arrays["names_blob"], self.arrays["names_offsets"]
+        needle = np.frombuffer(name, dtype=np.uint8) if name is not None else None
+        chunk_start, chunk_size = start, SCAN_CHUNK_MIN
+        while chunk_start < end:
+            chunk_end = min(end, chunk_start + chunk_size)
+            mask = np.ones(chunk_end - chunk_start, dtype=bool)
+            if repo_code is not None:
+                mask &= self.arrays["repo"][chunk_start:chunk_end] == repo_code
+            if needle is not None:
+                starts = np.asarray(names_offsets[chunk_start:chunk_end])
+                lengths = np.asarray(names_offsets[chunk_start + 1:chunk_end + 1]) - starts
+                mask &= lengths == len(needle) if exact else lengths >= len(needle)
+                candidates = np.flatnonzero(mask)
+                if len(needle) and len(candidates):
+                    name_bytes = names_blob[starts[candidates, None] + np.arange(len(needle))]
+                    mask[candidates] = (name_bytes == needle).all(axis=1)
+            yield from (chunk_start + np.flatnonzero(mask)).tolist()
+            chunk_start, chunk_size = chunk_end, min(chunk_size * 4, SCAN_CHUNK_MAX)
+
+
+class SymbolIndexCache:
+    """Holds the current `SymbolIndex` for a parse store.
+
+    The persisted index is mapped at construction. Rebuilds (and re-saves) run on a
+    background thread, started by `refresh()` when the store was written or by `get()`
+    when a repository was added, removed or reparsed since the index was built; `get()`
+    keeps returning the previous index until the new one is ready. Only the first build,
+    with no index to serve yet, runs in the caller.
+    """
+
+    def __init__(self, store, directory: str = DEFAULT_INDEX_DIR):
+        self.store = store
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._index = SymbolIndex.load(directory)
+        self._rebuild_thread: Optional[threading.Thread] = None
+        self._rebuild_again = False
+
+    def get(self) -> SymbolIndex:
+        repo_versions = {repo["repo_name"]: repo["version"] for repo in self.store.list_repos()}
+        with self._lock:
+            if self._index is None:
+                self._index = self._build()
+            index = self._index
+        if index.repo_versions != repo_versions:
+            self.refresh()
+        return index
+
+    def refresh(self):
+        """Starts a background rebuild (or queues one more if a rebuild is already running)."""
+        with self._lock:
+            if self._rebuild_thread is not None:
+                self._rebuild_again = True
+                return
+            self._rebuild_thread = threading.Thread(target=self._rebuild, name="symbol-index-rebuild", daemon=True)
+            self._rebuild_thread.start()
+
+    def wait(self, timeout: Optional[float] = None):
+        """Blocks until the running rebuild (if any) is done."""
+        thread = self._rebuild_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _build(self) -> SymbolIndex:
+        index = SymbolIndex.from_store(self.store)
+        index.save(self.directory)
+        return index
+
+    def _rebuild(self):
+        while True:
+            with self._lock:
+                self._rebuild_again = False
+            try:
+                index = self._build()
+            except Exception as e:
+                logging.error(f"❌ Symbol index rebuild failed: {e}")
+                index = None
+            with self._lock:
+                if index is not None:
+                    self._index = index
+                if index is None or not self._rebuild_again:
+                    self._rebuild_thread = None
+                    return
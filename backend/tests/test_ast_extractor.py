@@ -0,0 +1,69 @@
+import ast
+import textwrap
+
+import ast_extractor
+import parser
+
+SOURCE = textwrap.dedent("""
+    import os
+    from pkg import helpers as h
+
+    class A:
+        def m(self):
+            import json
+            return self.n(json.dumps(os.sep))
+
+        class Inner:
+            def deep(self):
+                pass
+
+    def f():
+        def nested():
+            h.run()
+        return nested()
+
+    async def g():
+        await f()
+""")
+
+
+def walk_order(tree):
+    """Names in `ast.walk` order, as the walkers replaced by `ast_extractor` produced them."""
+    functions, classes, imports = [], [], []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(node.name)
+        elif isinstance(node, ast.ClassDef):
+            classes.append(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports.extend(alias.name for alias in node.names)
+    return functions, classes, imports
+
+
+def test_facts_follow_ast_walk_order():
+    tree = ast.parse(SOURCE)
+    facts = ast_extractor.extract(tree)
+
+    assert ([d.name for d in facts.functions], [d.name for d in facts.classes], [i.name or i.module for i in facts.imports]) \
+        == walk_order(tree)
+    assert [d.name for d in facts.functions] == ["f", "g", "m", "nested", "deep"]
+    walked_calls = [node.func for node in ast.walk(tree) if isinstance(node, ast.Call)]
+    assert [call.name for call in facts.calls] == [func.attr if isinstance(func, ast.Attribute) else func.id for func in walked_calls]
+
+
+def test_scopes():
+    facts = ast_extractor.extract(ast.parse(SOURCE))
+
+    assert {d.name: d.scope for d in (*facts.functions, *facts.classes)} == {
+        "A": "", "m": "A", "Inner": "A", "deep": "A.Inner", "f": "", "nested": "f", "g": "",
+    }
+    assert {(c.receiver, c.name): c.scope for c in facts.calls} == {
+        ("self", "n"): "A.m", ("json", "dumps"): "A.m", ("h", "run"): "f.nested", (None, "nested"): "f", (None, "f"): "g",
+    }
+
+
+def test_parse_file_order(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text("class A:\n    def m(self): pass\n\ndef f(): pass\n\nasync def g(): pass\n", encoding="utf-8")
+
+    assert parser.parse_file(str(path)) == (["f", "g", "m"], ["A"], [])
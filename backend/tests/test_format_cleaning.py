@@ -0,0 +1,49 @@
+import csv
+
+import pytest
+
+import _cleaning_wiki_data
+from format_cleaning import INVALID_EXTENSION, FormatCleaner
+
+HEADERS = ("category", "extension", "description", "notes")
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("mp3", ".MP3"), (".mp4", ".MP4"), ("7z", ".7Z"), (" 3gp ", ".3GP"), ("c", ".C"), ("TAR – Tape archive", ".TAR"),
+])
+def test_extensions_with_digits_are_clean(raw, expected):
+    entry = {"category": "Audio", "extension": raw, "description": "A format", "notes": "n"}
+    is_clean, issues = FormatCleaner(HEADERS).clean_entry(entry)
+
+    assert is_clean, issues
+    assert entry["extension"] == expected
+
+
+@pytest.mark.parametrize("raw", ["", "MP 3", "ＦＷ-X", "A" * 16])
+def test_invalid_extensions_are_dirty(raw):
+    is_clean, issues = FormatCleaner(HEADERS).clean_entry({"category": "c", "extension": raw, "description": "d", "notes": "n"})
+
+    assert not is_clean
+    assert issues[0][2] == INVALID_EXTENSION
+
+
+def test_cleanup_script_keeps_digit_extensions(tmp_path):
+    source = tmp_path / "file_formats.csv"
+    with open(source, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows([("Audio", "mp3", "MPEG audio", "n"), ("Video", ".MP4", "MPEG-4 video", "n"),
+                          ("Compressed", "7z", "7-Zip archive", "n"), ("Video", "3gp", "3GPP video", "n"),
+                          ("Bad", "not an extension", "Spaces", "n")])
+    out = {name: str(tmp_path / f"{name}.csv") for name in ("clean", "dirty", "issues")}
+
+    report = _cleaning_wiki_data.main(str(source), output_file=out["clean"], dirty_file=out["dirty"], issues_file=out["issues"])
+
+    assert [row["extension"] for row in read_rows(out["clean"])] == [".MP3", ".MP4", ".7Z", ".3GP"]
+    assert [row["extension"] for row in read_rows(out["dirty"])] == ["not an extension"]
+    assert report.issue_counts[INVALID_EXTENSION] == 1
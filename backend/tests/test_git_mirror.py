@@ -0,0 +1,96 @@
+import os
+import subprocess
+
+import pytest
+
+import git_mirror
+import parser
+
+pytestmark = pytest.mark.skipif(subprocess.run(["git", "--version"], capture_output=True).returncode != 0,
+                                reason="git is not installed")
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def write(root, relpath, text):
+    path = os.path.join(root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+@pytest.fixture
+def origin(tmp_path, monkeypatch):
+    """A local repository to clone from, with the mirrors kept under `tmp_path`."""
+    for name in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{name}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{name}_EMAIL", "test@example.com")
+    monkeypatch.setattr(git_mirror, "MIRROR_DIR", str(tmp_path / "mirrors"))
+
+    root = str(tmp_path / "origin")
+    os.makedirs(root)
+    git(root, "init", "--quiet", "--initial-branch=main")
+    write(root, "app/models.py", "class User:\n    pass\n")
+    write(root, "app/helpers.py", "import os\n\ndef fmt(value):\n    return str(value)\n")
+    write(root, "app/old.py", "def legacy():\n    pass\n")
+    write(root, "README.md", "# Demo\n")
+    git(root, "add", "-A")
+    git(root, "commit", "--quiet", "-m", "Initial commit")
+    return root
+
+
+def commit_changes(root):
+    write(root, "app/helpers.py", "import os\nimport json\n\ndef fmt(value):\n    return json.dumps(value)\n\ndef parse(text):\n    return json.loads(text)\n")
+    write(root, "app/views.py", "from app.helpers import fmt\n\nclass View:\n    def render(self):\n        return fmt(1)\n")
+    os.remove(os.path.join(root, "app", "old.py"))
+    git(root, "add", "-A")
+    git(root, "commit", "--quiet", "-m", "Add, modify and delete files")
+
+
+def comparable(repo_data):
+    """A parse result without its file order (a reparse appends new files at the end)."""
+    return {**repo_data, "files": sorted(repo_data["files"])}
+
+
+def test_checkout_creates_mirror_and_updates_in_place(origin, tmp_path):
+    url = "file://" + origin
+    repo_path = str(tmp_path / "cloned_repos" / "origin")
+
+    commit = git_mirror.checkout(url, repo_path)
+    mirror = git_mirror.mirror_path(url)
+    assert git(mirror, "rev-parse", "--is-bare-repository") == "true"
+    assert commit == git(origin, "rev-parse", "HEAD")
+    assert os.path.exists(os.path.join(repo_path, "app", "old.py"))
+
+    marker = os.path.join(repo_path, ".git", "kept")  # Survives only an in-place update
+    open(marker, "w").close()
+    commit_changes(origin)
+
+    commit = git_mirror.checkout(url, repo_path)
+    assert commit == git(origin, "rev-parse", "HEAD")
+    assert git(mirror, "rev-parse", "HEAD") == commit
+    assert os.path.exists(marker)
+    assert os.path.exists(os.path.join(repo_path, "app", "views.py"))
+    assert not os.path.exists(os.path.join(repo_path, "app", "old.py"))
+
+
+def test_reparse_matches_full_parse(origin, tmp_path):
+    url = "file://" + origin
+    repo_path = str(tmp_path / "cloned_repos" / "origin")
+    git_mirror.checkout(url, repo_path)
+    previous = parser.parse_repository(repo_path, workers=1, use_cache=False)
+
+    commit_changes(origin)
+    git_mirror.checkout(url, repo_path)
+    write(repo_path, "app/scratch.py", "def draft():\n    pass\n")  # Untracked files count as changes too
+
+    assert parser.plan_reparse(repo_path, previous["commit"]) is not None  # Incremental, not a fallback
+    reparsed = parser.reparse_repository(repo_path, previous, workers=1, use_cache=False)
+    full = parser.parse_repository(repo_path, workers=1, use_cache=False)
+
+    assert reparsed["commit"] == full["commit"] == git(origin, "rev-parse", "HEAD")
+    assert comparable(reparsed) == comparable(full)
+    assert os.path.normpath(os.path.join(repo_path, "app", "old.py")) not in reparsed["files"]
+    assert reparsed["functions"][os.path.normpath(os.path.join(repo_path, "app", "helpers.py"))] == ["fmt", "parse"]
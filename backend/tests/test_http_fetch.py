@@ -0,0 +1,127 @@
+import os
+import csv
+import asyncio
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import _getting_files_info_data as files_info
+from http_fetch import AsyncFetcher, DiskHTTPCache
+
+LISTING = """<html><body><table>
+<tr><th>Extension</th><th>Description</th><th>Popularity</th></tr>
+<tr><td>.{page}</td><td>{page} file</td><td><span class="hidden">4.5</span></td></tr>
+<tr><td>.{page}2</td><td>Another {page} file</td><td></td></tr>
+</table></body></html>"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """`/flaky`: 503 twice, then a page; `/etag`: a page revalidated with its ETag; any other path: a listing."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests[self.path] += 1
+            count = server.requests[self.path]
+
+        if self.path == "/flaky" and count <= 2:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = (LISTING.format(page=self.path.strip("/")) if self.path not in ("/flaky", "/etag") else self.path).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.path == "/etag":
+            self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """A local stand-in HTTP server; `server.requests` counts the requests per path."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpd.lock = threading.Lock()
+    httpd.requests = Counter()
+    httpd.base_url = f"http://127.0.0.1:{httpd.server_address[1]}/"
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(cache_dir, urls, **options):
+    options = {"rate": 1000.0, "burst": 100, "backoff": 0.01, **options}
+
+    async def run():
+        async with AsyncFetcher(cache=DiskHTTPCache(str(cache_dir)), **options) as fetcher:
+            return await fetcher.fetch_all(urls)
+
+    return asyncio.run(run())
+
+
+def test_retries_503(server, tmp_path):
+    [result] = fetch(tmp_path, [server.base_url + "flaky"])
+
+    assert (result.ok, result.text, result.source) == (True, "/flaky", "network")
+    assert server.requests["/flaky"] == 3
+
+
+def test_gives_up_after_retries(server, tmp_path):
+    [result] = fetch(tmp_path, [server.base_url + "flaky"], retries=1)
+
+    assert (result.status, result.error) == (503, "HTTP 503")
+    assert server.requests["/flaky"] == 2
+
+
+def test_fresh_cache_hits_send_no_request(server, tmp_path):
+    fetch(tmp_path, [server.base_url + "page"])
+    [result] = fetch(tmp_path, [server.base_url + "page"])
+
+    assert (result.ok, result.source) == (True, "cache")
+    assert "page file" in result.text
+    assert server.requests["/page"] == 1
+
+
+def test_stale_entries_are_revalidated_with_etag(server, tmp_path):
+    [first] = fetch(tmp_path, [server.base_url + "etag"])
+    [second] = fetch(tmp_path, [server.base_url + "etag"], max_age=0)
+
+    assert first.source == "network"
+    assert (second.ok, second.text, second.source) == (True, "/etag", "revalidated")
+    assert server.requests["/etag"] == 2
+
+
+def test_category_csv_layout(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(files_info, "CATEGORIES", ["text", "audio"])
+
+    async def run():
+        async with files_info.make_fetcher(str(tmp_path / "cache"), rate=1000.0, burst=100) as fetcher:
+            return await files_info.scrape_file_info_cat(server.base_url, str(tmp_path / "raw"), fetcher)
+
+    csv_filename = asyncio.run(run())
+
+    assert os.path.dirname(csv_filename) == str(tmp_path / "raw")
+    with open(csv_filename, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ["Extension", "Description", "Category", "Popularity"],
+        [".text", "text file", "text", "4.5"],
+        [".text2", "Another text file", "text", "N/A"],
+        [".audio", "audio file", "audio", "4.5"],
+        [".audio2", "Another audio file", "audio", "N/A"],
+    ]
@@ -0,0 +1,66 @@
+import importlib.util
+import math
+import os
+
+import pytest
+
+from neo4j_writer import CONSTRAINTS, QUERIES, Neo4jBatchWriter, RecordingDriver
+
+
+def add_files(writer, n_files):
+    for i in range(n_files):
+        writer.add_file(f"pkg/mod_{i}.py", functions=[f"f{i}_{k}" for k in range(3)],
+                        imports=["os", f"pkg.dep_{i}"], dependencies=[f"call_{k}" for k in range(4)])
+
+
+def test_constraint_statements():
+    driver = RecordingDriver()
+    Neo4jBatchWriter(driver).ensure_constraints()
+    assert driver.statements == [(statement, {}) for statement in CONSTRAINTS]
+    assert driver.transactions == []
+
+
+def test_rows_are_written_in_unwind_batches():
+    driver = RecordingDriver()
+    with Neo4jBatchWriter(driver, batch_size=25) as writer:
+        add_files(writer, 10)  # 10 files x (1 file + 3 functions + 2 imports + 4 dependencies) = 100 rows
+
+    assert len(driver.transactions) == math.ceil(100 / 25)
+    for tx in driver.transactions:
+        kinds = [kind for query, _ in tx for kind, text in QUERIES.items() if query == text]
+        assert len(kinds) == len(tx) == len(set(kinds))  # At most one UNWIND statement per kind
+        assert all(query.lstrip().startswith("UNWIND $rows") for query, _ in tx)
+        assert sum(len(params["rows"]) for _, params in tx) == 25
+
+    assert driver.rows_written("files") == [{"path": f"pkg/mod_{i}.py"} for i in range(10)]
+    assert len(driver.rows_written("functions")) == 30
+    assert len(driver.rows_written("imports")) == 20
+    assert driver.rows_written("dependencies")[:2] == [
+        {"path": "pkg/mod_0.py", "dependency": "call_0"}, {"path": "pkg/mod_0.py", "dependency": "call_1"}]
+
+
+def test_small_input_is_one_transaction_on_close():
+    driver = RecordingDriver()
+    with Neo4jBatchWriter(driver) as writer:
+        add_files(writer, 3)
+        assert driver.transactions == []  # Nothing is sent before the batch fills or the writer closes
+    assert len(driver.transactions) == 1
+    assert len(driver.transactions[0]) == len(QUERIES)
+
+
+def test_repo_parser_uses_batches(tmp_path):
+    pytest.importorskip("neo4j")
+    spec = importlib.util.spec_from_file_location(
+        "parser_cj4", os.path.join(os.path.dirname(__file__), "..", "parser-cj4.py"))
+    parser_cj4 = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(parser_cj4)
+
+    for i in range(5):
+        (tmp_path / f"mod_{i}.py").write_text(f"import os\n\ndef f{i}():\n    os.getcwd()\n")
+    driver = RecordingDriver()
+    repo_parser = parser_cj4.RepoParser(str(tmp_path), None, None, None, batch_size=1000, driver=driver)
+    repo_parser.parse_repository()
+
+    assert driver.statements == [(statement, {}) for statement in CONSTRAINTS]
+    assert len(driver.transactions) == 1
+    assert sorted(row["path"] for row in driver.rows_written("files")) == [f"mod_{i}.py" for i in range(5)]
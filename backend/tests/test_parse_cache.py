@@ -0,0 +1,56 @@
+import pytest
+
+import parser
+from parse_cache import ParseCache, hash_content
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with ParseCache(str(tmp_path / "cache" / "parse_cache.sqlite3")) as cache:
+        yield cache
+
+
+def test_put_then_get(cache):
+    key = ParseCache.make_key("1", hash_content(b"def f(): pass\n"))
+    cache.put_many([(key, {"functions": [["f", "", 1]]})])
+
+    assert cache.contains_many([key, "1:missing"]) == {key}
+    assert cache.get_many([key, "1:missing"]) == {key: {"functions": [["f", "", 1]]}}
+
+
+def test_evicts_least_recently_used_entries(cache):
+    cache.max_bytes = 2 * len('{"n":0}')
+    cache.put_many([("a", {"n": 0})])
+    cache.put_many([("b", {"n": 1})])
+    cache.get_many(["a"])  # `a` is now the most recently used
+
+    cache.put_many([("c", {"n": 2})])
+
+    assert cache.contains_many(["a", "b", "c"]) == {"a", "c"}
+    assert cache.total_bytes() <= cache.max_bytes
+
+
+def test_changed_content_is_parsed_again(tmp_path, monkeypatch):
+    source = tmp_path / "mod.py"
+    source.write_text("def old():\n    pass\n")
+    cache_path = str(tmp_path / "parse_cache.sqlite3")
+    parsed = []
+    extract_facts = parser.extract_facts
+
+    def counting_extract(filepath):
+        parsed.append(filepath)
+        return extract_facts(filepath)
+
+    monkeypatch.setattr(parser, "extract_facts", counting_extract)
+
+    def functions():
+        [(_, functions, _, _)] = parser.iter_parse_paths([str(source)], workers=1, cache_path=cache_path)
+        return functions
+
+    assert functions() == ["old"]
+    assert functions() == ["old"]
+    assert len(parsed) == 1  # The second run was a cache hit
+
+    source.write_text("def new():\n    pass\n")
+    assert functions() == ["new"]
+    assert len(parsed) == 2
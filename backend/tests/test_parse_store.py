@@ -0,0 +1,101 @@
+import os
+import textwrap
+
+import pytest
+
+import parse_store
+import parser
+
+
+def write_sources(repo_path, files):
+    for path, source in files.items():
+        os.makedirs(os.path.dirname(os.path.join(repo_path, path)), exist_ok=True)
+        with open(os.path.join(repo_path, path), "w", encoding="utf-8") as f:
+            f.write(textwrap.dedent(source))
+
+
+def ingest(store, repo_path, filepaths, commit, removed=None):
+    with store.writer("demo", repo_path, commit, parser.PARSER_VERSION, removed=removed, batch_files=1) as writer:
+        for filepath in filepaths:
+            writer.add(filepath, parser.extract_facts(filepath))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = parse_store.ParseStore(str(tmp_path / "parse_store.duckdb"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def repo_path(tmp_path):
+    repo_path = str(tmp_path / "demo")
+    write_sources(repo_path, {
+        "app.py": """
+            import os
+            from pkg import helpers
+
+            def main():
+                helpers.run(os.sep)
+        """,
+        "pkg/helpers.py": """
+            class Runner:
+                def run(self):
+                    pass
+
+            def run(value):
+                return Runner().run()
+        """,
+    })
+    return repo_path
+
+
+def test_round_trip_matches_parse_repository(store, repo_path):
+    parsed = parser.parse_repository(repo_path, workers=1, use_cache=False)
+    ingest(store, repo_path, parsed["files"], commit=None)
+
+    repo = store.get_repo("demo")
+    assert (repo["version"], repo["file_count"], repo["parser_version"]) == (1, 2, parser.PARSER_VERSION)
+    assert store.load_repo_dict("demo") == parsed
+    assert [entry["path"] for entry in store.load_file_entries(repo)] == ["app.py", "pkg/helpers.py"]
+    assert [(row["path"], row["kind"]) for row in store.find_definitions("run")] == [("pkg/helpers.py", "function")] * 2
+    assert [row["path"] for row in store.find_importers("pkg.helpers")] == ["app.py"]
+
+
+def test_patch_replaces_changed_files_and_drops_removed_ones(store, repo_path):
+    app, helpers = os.path.join(repo_path, "app.py"), os.path.join(repo_path, "pkg", "helpers.py")
+    ingest(store, repo_path, [app, helpers], commit="c1")
+
+    write_sources(repo_path, {"app.py": "def main_v2():\n    pass\n", "new.py": "class New:\n    pass\n"})
+    os.remove(helpers)
+    ingest(store, repo_path, [app, os.path.join(repo_path, "new.py")], commit="c2", removed=[helpers])
+
+    repo = store.get_repo("demo")
+    assert (repo["version"], repo["commit_sha"], repo["file_count"]) == (2, "c2", 2)
+    full = store.load_repo_dict("demo")
+    assert full["files"] == [app, os.path.join(repo_path, "new.py")]  # `app.py` keeps its position
+    assert full["functions"][app] == ["main_v2"]
+    assert store.find_definitions("Runner") == []
+
+
+def test_replace_swaps_the_whole_repository(store, repo_path):
+    app = os.path.join(repo_path, "app.py")
+    ingest(store, repo_path, [app, os.path.join(repo_path, "pkg", "helpers.py")], commit="c1")
+    ingest(store, repo_path, [app], commit="c2")
+
+    assert store.get_repo("demo")["version"] == 2
+    assert store.load_repo_dict("demo")["files"] == [app]
+
+
+def test_failed_write_leaves_the_store_untouched(store, repo_path):
+    app = os.path.join(repo_path, "app.py")
+    ingest(store, repo_path, [app], commit="c1")
+
+    with pytest.raises(RuntimeError):
+        with store.writer("demo", repo_path, "c2", parser.PARSER_VERSION) as writer:
+            writer.add(os.path.join(repo_path, "pkg", "helpers.py"), parser.extract_facts(os.path.join(repo_path, "pkg", "helpers.py")))
+            raise RuntimeError("parse failed")
+
+    repo = store.get_repo("demo")
+    assert (repo["version"], repo["commit_sha"]) == (1, "c1")
+    assert store.load_repo_dict("demo")["files"] == [app]
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+import parse_store
+import parsed_views
+
+
+def record(functions=(), classes=(), imports=()):
+    """An `ast_extractor` record with module-level definitions and plain imports."""
+    return {
+        "functions": [(name, "", line) for line, name in enumerate(functions, 1)],
+        "classes": [(name, "", line) for line, name in enumerate(classes, 1)],
+        "imports": [(module, None, None, 0, line) for line, module in enumerate(imports, 1)],
+        "calls": [],
+    }
+
+
+def write(store, repo_path, files, commit="c1"):
+    with store.writer("demo", repo_path, commit, "test") as writer:
+        for path, facts in files.items():
+            writer.add(os.path.join(repo_path, path), facts)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = parse_store.ParseStore(str(tmp_path / "parse_store.duckdb"))
+    yield store
+    store.close()
+
+
+def test_full_matches_the_store_in_parse_order(store, tmp_path):
+    repo_path = str(tmp_path / "demo")
+    write(store, repo_path, {"b.py": record(["run"], imports=["os"]), "a.py": record(classes=["A"])})
+    cache = parsed_views.ParsedDataCache(store)
+    repo = store.get_repo("demo")
+
+    full = cache.full(repo)
+
+    assert full == store.load_repo_dict("demo")
+    assert full["files"] == [os.path.join(repo_path, "b.py"), os.path.join(repo_path, "a.py")]
+    assert [entry["path"] for entry in cache.get(repo).entries] == ["a.py", "b.py"]
+
+
+def test_full_stays_on_the_cached_version(store, tmp_path):
+    repo_path = str(tmp_path / "demo")
+    write(store, repo_path, {"a.py": record(["old"])})
+    cache = parsed_views.ParsedDataCache(store)
+    repo = store.get_repo("demo")
+    cached = cache.get(repo)
+
+    write(store, repo_path, {"a.py": record(["new"])}, commit="c2")  # Re-ingested after the lookup
+
+    full = cache.full(repo)
+    assert (full["commit"], full["functions"][os.path.join(repo_path, "a.py")]) == ("c1", ["old"])
+    assert cache.get(repo) is cached
+    newer = cache.full(store.get_repo("demo"))
+    assert (newer["commit"], newer["functions"][os.path.join(repo_path, "a.py")]) == ("c2", ["new"])
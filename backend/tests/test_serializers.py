@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import serializers
+
+REPO_DATA = {
+    "repo_path": "/repos/demo",
+    "commit": "c1",
+    "parser_version": "4",
+    "files": ["/repos/demo/app.py", "/repos/demo/pkg/helpers.py", "/repos/demo/pkg/ünïcode.py"],
+    "functions": {"/repos/demo/app.py": ["main"], "/repos/demo/pkg/helpers.py": ["run"], "/repos/demo/pkg/ünïcode.py": []},
+    "classes": {"/repos/demo/app.py": [], "/repos/demo/pkg/helpers.py": ["Runner"], "/repos/demo/pkg/ünïcode.py": []},
+    "imports": {"/repos/demo/app.py": ["os", "helpers"], "/repos/demo/pkg/helpers.py": [], "/repos/demo/pkg/ünïcode.py": []},
+}
+
+
+@pytest.mark.parametrize("name", sorted(serializers.SERIALIZERS))
+def test_round_trip(name):
+    serializer = serializers.get_serializer(name)
+
+    assert serializer.loads(serializer.dumps(REPO_DATA)) == REPO_DATA
+
+
+def test_interned_paths_round_trip():
+    interned = serializers.intern_paths(REPO_DATA)
+
+    assert interned["dirs"] == ["/repos/demo", "/repos/demo/pkg"]
+    assert serializers.expand_paths(interned) == REPO_DATA
+
+
+@pytest.mark.parametrize("extension", [".json", ".msgpack"])
+@pytest.mark.parametrize("interned", [False, True])
+def test_save_then_load(tmp_path, extension, interned):
+    if extension == ".msgpack":
+        pytest.importorskip("msgpack")
+    path = os.path.join(tmp_path, f"parsed{extension}")
+
+    serializers.save(REPO_DATA, path, interned=interned)
+
+    assert serializers.load(path) == REPO_DATA
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError, match="Unsupported format"):
+        serializers.get_serializer("yaml")
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, serializers.DEFAULT_JSON),
+    ("text/html;q=0.9, */*;q=0.1", serializers.DEFAULT_JSON),
+    ("application/json;q=0", None),
+    ("text/html", None),
+])
+def test_negotiate(accept, expected):
+    assert serializers.negotiate(accept) is expected
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+import streaming_csv
+from streaming_csv import StreamingCSVWriter
+
+
+def leftovers(directory):
+    return [name for name in os.listdir(directory) if name.endswith(".part")]
+
+
+def test_commit_replaces_the_file_and_keeps_its_mode(tmp_path):
+    path = tmp_path / "out.csv"
+    path.write_text("old\n")
+    os.chmod(path, 0o640)
+
+    with StreamingCSVWriter(path, ["a", "b"], flush_rows=1) as writer:
+        writer.writerows([(1, 2), (3, 4)])
+
+    assert path.read_bytes() == b"a,b\r\n1,2\r\n3,4\r\n"
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    assert leftovers(tmp_path) == []
+
+
+def test_errors_in_the_block_keep_the_previous_file(tmp_path):
+    path = tmp_path / "out.csv"
+    path.write_text("old\n")
+
+    with pytest.raises(RuntimeError):
+        with StreamingCSVWriter(path, ["a"]) as writer:
+            writer.writerows([(1,)])
+            raise RuntimeError("parse failed")
+
+    assert path.read_text() == "old\n"
+    assert leftovers(tmp_path) == []
+
+
+def test_failed_commit_removes_the_partial_file(tmp_path, monkeypatch):
+    def fail(src, dst):
+        raise OSError("rename failed")
+
+    monkeypatch.setattr(streaming_csv.os, "replace", fail)
+
+    with pytest.raises(OSError, match="rename failed"):
+        with StreamingCSVWriter(tmp_path / "out.csv", ["a"]) as writer:
+            writer.writerows([(1,)])
+
+    assert not (tmp_path / "out.csv").exists()
+    assert leftovers(tmp_path) == []
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+from symbol_index import SymbolIndex
+
+SYMBOLS = pd.DataFrame(
+    [
+        ("run", "function", "demo", "pkg/helpers.py", 5),
+        ("Runner", "class", "demo", "pkg/helpers.py", 1),
+        ("run", "function", "other", "tasks.py", 12),
+        ("RUN_ALL", "function", "other", "tasks.py", 20),
+        ("main", "function", "demo", "app.py", 3),
+        ("naïve", "function", "demo", "app.py", 9),
+    ],
+    columns=["name", "kind", "repo_name", "path", "lineno"],
+)
+
+
+@pytest.fixture(params=[False, True], ids=["built", "loaded"])
+def index(request, tmp_path):
+    index = SymbolIndex.build(SYMBOLS, {"demo": 1, "other": 3})
+    if request.param:
+        index.save(str(tmp_path / "symbol_index"))
+        index = SymbolIndex.load(str(tmp_path / "symbol_index"))
+    return index
+
+
+def names(results):
+    return [(result["name"], result["repo_name"]) for result in results]
+
+
+def test_exact_lookup(index):
+    assert index.lookup("run") == [
+        {"name": "run", "kind": "function", "repo_name": "demo", "path": "pkg/helpers.py", "lineno": 5},
+        {"name": "run", "kind": "function", "repo_name": "other", "path": "tasks.py", "lineno": 12},
+    ]
+    assert index.lookup("missing") == []
+
+
+def test_prefix_lookup(index):
+    assert names(index.lookup("Run", mode="prefix")) == [("Runner", "demo")]
+    assert names(index.lookup("run", mode="prefix", case_sensitive=False)) == [
+        ("run", "demo"), ("run", "other"), ("RUN_ALL", "other"), ("Runner", "demo"),
+    ]
+
+
+def test_filters_and_limit(index):
+    assert names(index.lookup("run", repo_name="other")) == [("run", "other")]
+    assert index.lookup("run", repo_name="unknown") == []
+    assert names(index.lookup("run", mode="prefix", case_sensitive=False, limit=3)) == [("run", "demo"), ("run", "other"), ("RUN_ALL", "other")]
+    assert names(index.lookup("NAÏVE", case_sensitive=False)) == [("naïve", "demo")]
+
+
+def test_persistence(index, tmp_path):
+    assert (len(index), index.repo_versions) == (6, {"demo": 1, "other": 3})
+    assert SymbolIndex.load(str(tmp_path / "nothing-saved")) is None
+
+
+def test_unknown_mode(index):
+    with pytest.raises(ValueError, match="Unsupported mode"):
+        index.lookup("run", mode="fuzzy")